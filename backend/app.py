@@ -3,19 +3,38 @@
 EPIAS Backend API - Flask Application
 """
 
-from flask import Flask, request, jsonify, send_file, session, send_from_directory, render_template_string
+from flask import Flask, Response, request, jsonify, send_file, session, send_from_directory, render_template_string
 from flask_cors import CORS
 import os
 import json
+import logging
+import math
+from collections import Counter
 from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
 import threading
 import uuid
-from epias_extractor import EpiasExtractor
+from epias_extractor import MAX_PAGE_SIZE, EpiasExtractor
+from token_manager import get_token_manager
+from rate_limiter import get_rate_limiter
+from resilience import circuit_breaker_snapshot
+from transport import transport_snapshot
+from capability_cache import get_capability_cache
+from data_store import get_data_store
+from single_flight import get_single_flight
+from plant_list_cache import get_plant_list_cache
+from uevcb_index import get_uevcb_index
+from record_buffer import ColumnarRecordBuffer
+from structured_log import get_event_logger
+from log_setup import configure_logging, logging_snapshot
+from metrics import get_metrics
+from cassette import get_cassette
+from phase_timer import PhaseTimings, track
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
+configure_logging()
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
 app.secret_key = os.getenv('SECRET_KEY', 'your-secret-key-change-this')
@@ -31,6 +50,56 @@ CORS(app,
 active_sessions = {}
 active_extractions = {}
 
+# /api/plants?uevcb=1 isteği içinde en fazla bu kadar organizasyonun UEVCB listesi
+# çekilir; kalanlar arka planda indekse yazılır
+UEVCB_PREFETCH_LIMIT = int(os.getenv('EPIAS_UEVCB_PREFETCH_LIMIT', 20))
+_uevcb_warmup_lock = threading.Lock()
+
+def run_tracked(task_id, kind, worker):
+    """İşi faz ölçümüyle çalıştır, bitince tek satırlık özet yaz"""
+    timings = PhaseTimings()
+    try:
+        with track(timings):
+            worker(timings)
+    finally:
+        timings.finish()
+        status = active_extractions.get(task_id, {}).get('status')
+        get_event_logger().emit('extraction_job', level=logging.WARNING if status == 'error' else logging.INFO,
+                                sampled=False, task_id=task_id, kind=kind, status=status,
+                                **timings.summary_fields())
+
+def warm_uevcb_index(extractor, organization_ids):
+    """Eksik UEVCB listelerini arka planda çekip indekse yaz; aynı anda tek ısıtma çalışır
+    
+    Başka bir ısıtma sürüyorsa hiçbir şey yapmaz ve False döner.
+    """
+    if not _uevcb_warmup_lock.acquire(blocking=False):
+        return False
+    
+    def worker():
+        try:
+            extractor.get_uevcb_lists(organization_ids)
+        except Exception as e:
+            extractor.logger.warning(f"⚠️ UEVCB indeksi arka planda doldurulamadı: {e}")
+        finally:
+            _uevcb_warmup_lock.release()
+    
+    thread = threading.Thread(target=worker)
+    thread.daemon = True
+    thread.start()
+    return True
+
+def parse_page_size(value):
+    """İstekteki page_size: None (sunucudan keşfedilir) ya da 1..MAX_PAGE_SIZE aralığına kırpılmış tamsayı
+    
+    Tamsayıya çevrilemezse ValueError fırlatır.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(value)
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
 def create_app():
     """Factory function to create Flask app"""
     
@@ -56,9 +125,11 @@ def home():
                 'POST /api/auth': 'Authentication',
                 'GET /api/plants': 'Power plant list',
                 'POST /api/extract': 'Extract data',
+                'POST /api/extract/batch': 'Extract data for multiple plants',
                 'GET /api/extract/status/<task_id>': 'Extract status',
                 'GET /api/download/<filename>': 'Download file',
-                'GET /api/health': 'Health check'
+                'GET /api/health': 'Health check',
+                'GET /api/metrics': 'Prometheus metrics'
             },
             'frontend': 'Frontend not found - accessing API mode'
         })
@@ -86,9 +157,11 @@ def api_info():
             'POST /api/auth': 'Authentication',
             'GET /api/plants': 'Power plant list',
             'POST /api/extract': 'Extract data',
+            'POST /api/extract/batch': 'Extract data for multiple plants',
             'GET /api/extract/status/<task_id>': 'Extract status',
             'GET /api/download/<filename>': 'Download file',
-            'GET /api/health': 'Health check'
+            'GET /api/health': 'Health check',
+            'GET /api/metrics': 'Prometheus metrics'
         }
     })
 
@@ -99,9 +172,33 @@ def health_check():
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'active_sessions': len(active_sessions),
-        'active_extractions': len(active_extractions)
+        'active_extractions': len(active_extractions),
+        'rate_limiter': get_rate_limiter().snapshot(),
+        'circuit_breakers': circuit_breaker_snapshot(),
+        'http_pool': transport_snapshot(),
+        'endpoint_capabilities': get_capability_cache().snapshot(),
+        'data_cache': get_data_store().snapshot() if get_data_store() else None,
+        'single_flight': get_single_flight().snapshot(),
+        'plant_list_cache': get_plant_list_cache().snapshot(),
+        'uevcb_index': get_uevcb_index().snapshot(),
+        'request_logging': {**get_event_logger().snapshot(), **logging_snapshot()},
+        'cassette': get_cassette().snapshot() if get_cassette() else None
     })
 
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Prometheus text formatında metrikler"""
+    metrics = get_metrics()
+    
+    # Anlık değerler scrape sırasında hesaplanır
+    statuses = Counter(task['status'] for task in list(active_extractions.values()))
+    metrics.jobs.replace(({'status': status}, statuses.get(status, 0)) for status in ('running', 'completed', 'error'))
+    metrics.rate_limiter_waiting.set(math.ceil(max(-get_rate_limiter().snapshot()['tokens'], 0)))
+    metrics.circuit_open.replace(({'endpoint': name}, 1 if state['state'] == 'open' else 0)
+                                 for name, state in circuit_breaker_snapshot().items())
+    
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/auth', methods=['POST'])
 def authenticate():
     """EPIAS Authentication"""
@@ -173,8 +270,34 @@ def get_power_plants():
         active_sessions[session_id]['last_activity'] = datetime.now()
         
         extractor = active_sessions[session_id]['extractor']
-        plants_result = extractor.get_power_plant_list()
-        
+        # ?refresh=1: paylaşılan santral listesi cache'ini atla ve yeniden çek
+        refresh = request.args.get('refresh', '').lower() in ('1', 'true', 'yes')
+        plants_result = extractor.get_power_plant_list(force_refresh=refresh)
+        if refresh:
+            get_uevcb_index().invalidate()
+
+        # ?uevcb=1: her santrale organizasyonunun UEVCB listesi eklenir (toplu, indeksten).
+        # İndekste olmayanlardan en fazla UEVCB_PREFETCH_LIMIT tanesi istek içinde çekilir,
+        # kalanlar arka planda çekilir ve bu cevapta 'uevcbs': None olarak döner.
+        if plants_result['success'] and request.args.get('uevcb', '').lower() in ('1', 'true', 'yes'):
+            plants = plants_result['data']
+            organization_ids = list(dict.fromkeys(
+                str(plant['organizationId']) for plant in plants if plant.get('organizationId') is not None
+            ))
+            uevcb_lists = get_uevcb_index().get_many(organization_ids)
+            missing = [organization_id for organization_id in organization_ids if organization_id not in uevcb_lists]
+            uevcb_lists.update(extractor.get_uevcb_lists(missing[:UEVCB_PREFETCH_LIMIT]))
+            pending = set(missing[UEVCB_PREFETCH_LIMIT:])
+            if pending:
+                warm_uevcb_index(extractor, sorted(pending))
+            # Santral dict'leri paylaşılan cache'e ait, kopyalanarak genişletilir
+            plants_result['data'] = [
+                {**plant, 'uevcbs': None if str(plant.get('organizationId')) in pending
+                 else uevcb_lists.get(str(plant.get('organizationId')), [])}
+                for plant in plants
+            ]
+            plants_result['uevcb_pending'] = len(pending)
+
         return jsonify(plants_result)
         
     except Exception as e:
@@ -216,6 +339,20 @@ def extract_data():
         end_date = data['end_date']
         power_plant_id = data.get('power_plant_id')
         chunk_days = data.get('chunk_days', 15)  # Default chunk size
+        # "auto": chunk boyutu cevap süresine ve sayfa sayısına göre ayarlanır
+        adaptive = chunk_days == 'auto'
+        if adaptive:
+            chunk_days = 7  # Adaptif mod için başlangıç boyutu
+        max_workers = data.get('max_workers', 4)  # Paralel chunk worker sayısı
+        use_cache = data.get('use_cache', True)  # False: yerel cache'i atla, tüm aralığı yeniden çek
+        stream = bool(data.get('stream', False))  # True: kayıtlar bellekte toplanmadan doğrudan Excel'e yazılır
+        try:
+            page_size = parse_page_size(data.get('page_size'))  # Verilmezse sunucudan keşfedilir
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'message': 'page_size tamsayı olmalı'
+            }), 400
         
         # Validate dates
         try:
@@ -236,7 +373,7 @@ def extract_data():
         # Start background extraction
         extractor = active_sessions[session_id]['extractor']
         
-        def extraction_worker():
+        def extraction_worker(timings):
             try:
                 # Update status
                 active_extractions[task_id] = {
@@ -246,45 +383,89 @@ def extract_data():
                     'started_at': datetime.now(),
                     'current_period': None,
                     'data': None,
-                    'error': None
+                    'error': None,
+                    'timings': timings
                 }
                 
-                def progress_callback(progress, current_start, current_end):
+                def progress_callback(progress, current_start, current_end, chunk_days=None):
                     active_extractions[task_id].update({
                         'progress': progress,
                         'message': f'İşleniyor: {current_start} - {current_end}',
                         'current_period': {'start': current_start, 'end': current_end}
                     })
+                    if chunk_days is not None:
+                        active_extractions[task_id]['chunk_days'] = chunk_days
                 
-                # Extract data
-                result = extractor.get_data_for_period(
-                    start_date, 
-                    end_date, 
-                    chunk_days=chunk_days,
-                    power_plant_id=power_plant_id,
-                    progress_callback=progress_callback
-                )
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"epias_data_{timestamp}.xlsx"
                 
-                if result['success']:
-                    # Generate Excel file
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"epias_data_{timestamp}.xlsx"
-                    
+                if stream:
+                    # Kayıtlar EPIAS'tan geldikçe Excel'e yazılır (chunk'lar sırayla çekilir)
+                    stream_stats = {}
+                    records = extractor.iter_injection_quantity(
+                        start_date,
+                        end_date,
+                        power_plant_id=power_plant_id,
+                        chunk_days=chunk_days,
+                        page_size=page_size,
+                        use_cache=use_cache,
+                        stats=stream_stats,
+                        progress_callback=progress_callback
+                    )
                     excel_result = extractor.save_to_excel(
-                        result['data'], 
+                        records,
                         filename=filename,
-                        include_power_plants=True
+                        include_power_plants=True,
+                        streaming=True
                     )
-                    
+                    failed_periods = stream_stats.get('failed_periods', [])
+                    record_count = stream_stats.get('records', 0)
+                    message = f'Toplam {record_count} kayıt alındı'
+                    if failed_periods:
+                        message += f' - {len(failed_periods)} dönem alınamadı'
+                    result = {
+                        # Liste yolundaki gibi: dönemler alınamadı ve hiç kayıt yoksa işlem başarısız
+                        'success': not (failed_periods and record_count == 0),
+                        'message': message,
+                        'count': record_count,
+                        'failed_periods': failed_periods,
+                        'period': {'start_date': start_date, 'end_date': end_date}
+                    }
+                else:
+                    # Extract data
+                    result = extractor.get_data_for_period(
+                        start_date, 
+                        end_date, 
+                        chunk_days=chunk_days,
+                        power_plant_id=power_plant_id,
+                        progress_callback=progress_callback,
+                        max_workers=max_workers,
+                        page_size=page_size,
+                        adaptive=adaptive,
+                        use_cache=use_cache
+                    )
+                    if result['success']:
+                        # Generate Excel file
+                        excel_result = extractor.save_to_excel(
+                            result['data'], 
+                            filename=filename,
+                            include_power_plants=True
+                        )
+                
+                if result['success']:
                     if excel_result['success']:
+                        message = f'Tamamlandı! {result["count"]} kayıt işlendi'
+                        if result['failed_periods']:
+                            message += f' (UYARI: {len(result["failed_periods"])} dönem alınamadı)'
                         active_extractions[task_id].update({
                             'status': 'completed',
                             'progress': 100,
-                            'message': f'Tamamlandı! {result["count"]} kayıt işlendi',
+                            'message': message,
                             'completed_at': datetime.now(),
                             'data': {
                                 'record_count': result['count'],
                                 'period': result['period'],
+                                'failed_periods': result['failed_periods'],
                                 'file_info': {
                                     'filename': excel_result['filename'],
                                     'file_size_mb': excel_result['file_size_mb'],
@@ -313,7 +494,7 @@ def extract_data():
                 })
         
         # Start extraction in background
-        thread = threading.Thread(target=extraction_worker)
+        thread = threading.Thread(target=run_tracked, args=(task_id, 'single', extraction_worker))
         thread.daemon = True
         thread.start()
         
@@ -330,6 +511,177 @@ def extract_data():
             'message': f'Extract error: {str(e)}'
         }), 500
 
+@app.route('/api/extract/batch', methods=['POST'])
+def extract_batch():
+    """Start data extraction for multiple power plants"""
+    try:
+        session_id = session.get('session_id')
+        
+        if not session_id or session_id not in active_sessions:
+            return jsonify({
+                'success': False,
+                'message': 'Authentication gerekli'
+            }), 401
+        
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'Request data gerekli'
+            }), 400
+        
+        for field in ['power_plant_ids', 'start_date', 'end_date']:
+            if field not in data:
+                return jsonify({
+                    'success': False,
+                    'message': f'{field} gerekli'
+                }), 400
+        
+        power_plant_ids = data['power_plant_ids']
+        if not isinstance(power_plant_ids, list) or not power_plant_ids:
+            return jsonify({
+                'success': False,
+                'message': 'power_plant_ids boş olmayan bir liste olmalı'
+            }), 400
+        
+        start_date = data['start_date']
+        end_date = data['end_date']
+        chunk_days = data.get('chunk_days', 15)
+        max_workers = data.get('max_workers', 4)  # Tüm santraller için ortak worker sayısı
+        use_cache = data.get('use_cache', True)
+        try:
+            page_size = parse_page_size(data.get('page_size'))
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'message': 'page_size tamsayı olmalı'
+            }), 400
+        
+        try:
+            datetime.strptime(start_date, '%Y-%m-%d')
+            datetime.strptime(end_date, '%Y-%m-%d')
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'Geçersiz tarih formatı. YYYY-MM-DD kullanın'
+            }), 400
+        
+        active_sessions[session_id]['last_activity'] = datetime.now()
+        
+        task_id = str(uuid.uuid4())
+        extractor = active_sessions[session_id]['extractor']
+        
+        def batch_worker(timings):
+            try:
+                active_extractions[task_id] = {
+                    'status': 'running',
+                    'progress': 0,
+                    'message': f'{len(power_plant_ids)} santral için veri çekme başlatılıyor...',
+                    'started_at': datetime.now(),
+                    'plants': {},
+                    'data': None,
+                    'error': None,
+                    'timings': timings
+                }
+                
+                def progress_callback(progress, plants):
+                    done = sum(1 for plant in plants.values() if plant['status'] in ('completed', 'failed'))
+                    active_extractions[task_id].update({
+                        'progress': progress,
+                        'message': f'İşleniyor: {done}/{len(plants)} santral tamamlandı',
+                        'plants': plants
+                    })
+                
+                result = extractor.get_data_for_plants(
+                    power_plant_ids,
+                    start_date,
+                    end_date,
+                    chunk_days=chunk_days,
+                    max_workers=max_workers,
+                    page_size=page_size,
+                    use_cache=use_cache,
+                    progress_callback=progress_callback
+                )
+                
+                if not result['success']:
+                    active_extractions[task_id].update({
+                        'status': 'error',
+                        'message': f'Veri çekme hatası: {result["message"]}',
+                        'error': result['message']
+                    })
+                    return
+                
+                # Tüm santraller tek sayfada; kayıtlar santral ID'si ile işaretlenir
+                records = ColumnarRecordBuffer()
+                for plant_id, plant_result in result['plants'].items():
+                    records.extend(plant_result.pop('data'), constants={'powerPlantId': plant_id})
+                
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                excel_result = extractor.save_to_excel(
+                    records,
+                    filename=f"epias_batch_{timestamp}.xlsx",
+                    include_power_plants=True
+                )
+                
+                if excel_result['success']:
+                    message = f'Tamamlandı! {result["count"]} kayıt işlendi'
+                    if result['failed_plants']:
+                        message += f' (UYARI: {len(result["failed_plants"])} santral alınamadı)'
+                    active_extractions[task_id].update({
+                        'status': 'completed',
+                        'progress': 100,
+                        'message': message,
+                        'completed_at': datetime.now(),
+                        'data': {
+                            'record_count': result['count'],
+                            'period': result['period'],
+                            'failed_plants': result['failed_plants'],
+                            'plants': {
+                                plant_id: {
+                                    'record_count': plant_result['count'],
+                                    'failed_periods': plant_result['failed_periods']
+                                }
+                                for plant_id, plant_result in result['plants'].items()
+                            },
+                            'file_info': {
+                                'filename': excel_result['filename'],
+                                'file_size_mb': excel_result['file_size_mb'],
+                                'download_url': f'/api/download/{excel_result["filename"]}'
+                            }
+                        }
+                    })
+                else:
+                    active_extractions[task_id].update({
+                        'status': 'error',
+                        'message': f'Excel oluşturma hatası: {excel_result["message"]}',
+                        'error': excel_result['message']
+                    })
+                    
+            except Exception as e:
+                active_extractions[task_id].update({
+                    'status': 'error',
+                    'message': f'İşlem hatası: {str(e)}',
+                    'error': str(e)
+                })
+        
+        thread = threading.Thread(target=run_tracked, args=(task_id, 'batch', batch_worker))
+        thread.daemon = True
+        thread.start()
+        
+        return jsonify({
+            'success': True,
+            'message': f'{len(power_plant_ids)} santral için veri çekme işlemi başlatıldı',
+            'task_id': task_id,
+            'status_url': f'/api/extract/status/{task_id}'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Batch extract error: {str(e)}'
+        }), 500
+
 @app.route('/api/extract/status/<task_id>', methods=['GET'])
 def get_extraction_status(task_id):
     """Get extraction status"""
@@ -347,6 +699,8 @@ def get_extraction_status(task_id):
             task_info['started_at'] = task_info['started_at'].isoformat()
         if 'completed_at' in task_info:
             task_info['completed_at'] = task_info['completed_at'].isoformat()
+        if 'timings' in task_info:
+            task_info['timings'] = task_info['timings'].snapshot()
         
         return jsonify({
             'success': True,
@@ -432,7 +786,7 @@ def logout():
         session_id = session.get('session_id')
         
         if session_id and session_id in active_sessions:
-            del active_sessions[session_id]
+            end_session(session_id)
         
         session.clear()
         
@@ -447,6 +801,16 @@ def logout():
             'message': f'Logout error: {str(e)}'
         }), 500
 
+def end_session(session_id):
+    """Oturumu sil; kullanıcının başka aktif oturumu yoksa paylaşılan TGT'sini de unut"""
+    session_info = active_sessions.pop(session_id, None)
+    if session_info is None:
+        return
+    session_info['extractor'].tgt_token = None
+    username = session_info['username']
+    if not any(info['username'] == username for info in list(active_sessions.values())):
+        get_token_manager().invalidate(username)
+
 # Session cleanup (remove old sessions)
 def cleanup_old_sessions():
     """Clean up old inactive sessions"""
@@ -459,7 +823,7 @@ def cleanup_old_sessions():
             expired_sessions.append(session_id)
     
     for session_id in expired_sessions:
-        del active_sessions[session_id]
+        end_session(session_id)
 
 # Error handlers
 @app.errorhandler(404)
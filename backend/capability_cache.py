@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Santral bazında hangi EPIAS endpoint'inin çalıştığını hatırlayan TTL'li cache
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Çalıştığı görülen endpoint uzun, çalışmadığı görülen daha kısa süre hatırlanır
+DEFAULT_SUCCESS_TTL_SECONDS = 24 * 3600
+DEFAULT_FAILURE_TTL_SECONDS = 6 * 3600
+
+class EndpointCapabilityCache:
+    """(santral, endpoint) -> çalışıyor mu? bilgisi
+
+    Endpoint'ler 'export' (başarı ve hata kaydedilir) ve 'data' (yalnızca başarı;
+    tek bir 4xx santralin desteklenmediğini göstermez). lookup() None dönerse
+    bilinmiyor demektir (miss); çağıran endpoint'i dener ve sonucu record() ile
+    bildirir. Hit/miss sayıları snapshot() ile okunur.
+    """
+
+    def __init__(self, success_ttl: float = DEFAULT_SUCCESS_TTL_SECONDS,
+                 failure_ttl: float = DEFAULT_FAILURE_TTL_SECONDS):
+        self.success_ttl = success_ttl
+        self.failure_ttl = failure_ttl
+        self._entries: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def lookup(self, plant_id: str, endpoint: str) -> Optional[bool]:
+        """Bilinen durum (True/False) ya da bilinmiyorsa/süresi dolduysa None"""
+        key = (str(plant_id), endpoint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() < entry[1]:
+                self._hits += 1
+                return entry[0]
+            self._entries.pop(key, None)
+            self._misses += 1
+            return None
+
+    def record(self, plant_id: str, endpoint: str, works: bool):
+        ttl = self.success_ttl if works else self.failure_ttl
+        with self._lock:
+            self._entries[(str(plant_id), endpoint)] = (works, time.time() + ttl)
+
+    def invalidate(self, plant_id: Optional[str] = None):
+        """Santralin (verilmezse tüm santrallerin) kayıtlarını sil"""
+        with self._lock:
+            if plant_id is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == str(plant_id)]:
+                del self._entries[key]
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            now = time.time()
+            live = [works for works, expires_at in self._entries.values() if now < expires_at]
+            return {
+                'entries': len(live),
+                'working': sum(1 for works in live if works),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else None
+            }
+
+_capability_cache: Optional[EndpointCapabilityCache] = None
+_capability_cache_lock = threading.Lock()
+
+def get_capability_cache() -> EndpointCapabilityCache:
+    """Process genelinde tek cache (EPIAS_CAPABILITY_SUCCESS_TTL_SECONDS / EPIAS_CAPABILITY_FAILURE_TTL_SECONDS)"""
+    global _capability_cache
+    if _capability_cache is None:
+        with _capability_cache_lock:
+            if _capability_cache is None:
+                _capability_cache = EndpointCapabilityCache(
+                    success_ttl=float(os.getenv('EPIAS_CAPABILITY_SUCCESS_TTL_SECONDS', DEFAULT_SUCCESS_TTL_SECONDS)),
+                    failure_ttl=float(os.getenv('EPIAS_CAPABILITY_FAILURE_TTL_SECONDS', DEFAULT_FAILURE_TTL_SECONDS))
+                )
+    return _capability_cache
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Upstream istek/cevap kaydı ve kayıttan oynatma (cassette)
+
+record modunda _send'in yaptığı her HTTP denemesi (cevap ya da bağlantı hatası)
+gzip'li JSONL dosyasına bir satır olarak yazılır; replay modunda aynı istekler ağa
+çıkmadan bu dosyadan cevaplanır. Böylece parse, sayfalama ve export yolları gerçek
+cevap şekil ve boyutlarıyla yerelde profillenebilir, yavaş bir üretim işi tekrar
+oynatılabilir.
+
+İstekler (method, endpoint, sıralı JSON gövdesi) ile eşleştirilir; sunucu adresi
+anahtara girmez. Aynı isteğin birden çok kaydı sırayla verilir, kayıtlar bitince
+sonuncusu tekrarlanır. TGT, kullanıcı adı ve şifre dosyaya yazılmaz.
+
+  EPIAS_CASSETTE=path.jsonl.gz          cassette dosyası (boşsa kapalı)
+  EPIAS_CASSETTE_MODE=record|replay     varsayılan replay
+  EPIAS_CASSETTE_REPLAY_LATENCY=true    replay'de kaydedilen cevap sürelerini bekle
+"""
+
+import atexit
+import base64
+import gzip
+import io
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+RECORD = 'record'
+REPLAY = 'replay'
+# Cevaptan saklanan başlıklar; gövde açılmış (decoded) saklandığından Content-Encoding tutulmaz
+KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Retry-After')
+REDACTED_TICKET = 'TGT-cassette'
+# Kaydedilen bağlantı hataları replay'de aynı türle fırlatılır
+REPLAYABLE_ERRORS = {cls.__name__: cls for cls in (requests.ConnectionError, requests.Timeout,
+                                                   requests.ConnectTimeout, requests.ReadTimeout)}
+
+class CassetteMissError(requests.RequestException):
+    """Replay modunda isteğin kaydı yok"""
+
+def request_key(method: str, endpoint: str, kwargs: Dict) -> str:
+    # Auth isteğinin gövdesi (kimlik bilgileri) anahtara da dosyaya da girmez
+    body = None if endpoint == 'auth' else kwargs.get('json', kwargs.get('data'))
+    return json.dumps([method.upper(), endpoint, body], sort_keys=True, separators=(',', ':'), default=str)
+
+class Cassette:
+    """Thread-safe kayıt / oynatma"""
+
+    def __init__(self, path: str, mode: str = REPLAY, replay_latency: bool = False):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"cassette modu record ya da replay olmalı: {mode}")
+        self.path = path
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._recorded = 0
+        self._replayed = 0
+        self._misses = 0
+
+        if mode == RECORD:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(path, 'wt', encoding='utf-8')
+        else:
+            self._file = None
+            self._entries: Dict[str, List[Dict]] = {}
+            self._positions: Dict[str, int] = {}
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry['key'], []).append(entry)
+
+    def request(self, session: requests.Session, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Tek HTTP denemesi: record'da gönderip kaydeder, replay'de kayıttan cevaplar"""
+        key = request_key(method, endpoint, kwargs)
+        if self.mode == REPLAY:
+            return self._replay(key, url)
+
+        started = time.monotonic()
+        try:
+            response = session.request(method, url, **kwargs)
+        except tuple(REPLAYABLE_ERRORS.values()) as e:
+            self._write({'key': key, 'error': type(e).__name__, 'message': str(e),
+                         'elapsed': round(time.monotonic() - started, 4)})
+            raise
+        # stream=True cevaplarda da gövde burada okunur; iter_content daha sonra bellekten verir
+        body = response.content
+        if endpoint == 'auth' and response.status_code == 201:
+            body = REDACTED_TICKET.encode()
+        entry = {
+            'key': key,
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'elapsed': round(time.monotonic() - started, 4)
+        }
+        try:
+            entry['body'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body_b64'] = base64.b64encode(body).decode('ascii')
+        self._write(entry)
+        return response
+
+    def _write(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._recorded += 1
+
+    def _next_entry(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                self._misses += 1
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self._replayed += 1
+            return entries[min(position, len(entries) - 1)]
+
+    def _replay(self, key: str, url: str) -> requests.Response:
+        entry = self._next_entry(key)
+        if entry is None:
+            raise CassetteMissError(f"cassette'te kayıt yok: {key}")
+        if self.replay_latency:
+            time.sleep(entry.get('elapsed', 0))
+        if 'error' in entry:
+            raise REPLAYABLE_ERRORS.get(entry['error'], requests.ConnectionError)(entry.get('message'))
+
+        body = entry['body'].encode('utf-8') if 'body' in entry else base64.b64decode(entry['body_b64'])
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers.update(entry['headers'])
+        response.headers['Content-Length'] = str(len(body))
+        response.url = url
+        response.encoding = 'utf-8'
+        # Gövde tüketilmiş sayılır: iter_content / json / text doğrudan bu byte'ları kullanır
+        response._content = body
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.raw.seek(0, io.SEEK_END)
+        return response
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {'path': self.path, 'mode': self.mode, 'recorded': self._recorded,
+                    'replayed': self._replayed, 'misses': self._misses}
+
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+_cassette_lock = threading.Lock()
+
+def get_cassette() -> Optional[Cassette]:
+    """Process genelinde cassette (EPIAS_CASSETTE / EPIAS_CASSETTE_MODE); ayarlı değilse None"""
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        with _cassette_lock:
+            if not _cassette_loaded:
+                path = os.getenv('EPIAS_CASSETTE', '').strip()
+                if path:
+                    _cassette = Cassette(
+                        path,
+                        mode=os.getenv('EPIAS_CASSETTE_MODE', REPLAY).strip().lower(),
+                        replay_latency=os.getenv('EPIAS_CASSETTE_REPLAY_LATENCY', 'false').strip().lower()
+                        in ('1', 'true', 'yes', 'on')
+                    )
+                    if _cassette.mode == RECORD:
+                        # Gzip dosyası düzgün kapanmazsa son blok okunamaz
+                        atexit.register(_cassette.close)
+                _cassette_loaded = True
+    return _cassette
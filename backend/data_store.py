@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Enjeksiyon verileri için kalıcı, saat bazlı yerel cache (SQLite)
+
+Kayıtlar (santral, saat) anahtarıyla saklanır. Hangi günlerin eksiksiz indirildiği
+ayrıca 'coverage' tablosunda gün aralıkları olarak tutulur; bir istek geldiğinde
+yalnızca kapsanmayan alt aralıklar EPIAS'tan çekilir. EPIAS son günlerin verisini
+sonradan revize edebildiği için son EPIAS_CACHE_SETTLE_DAYS gün kapsanmış sayılmaz
+(kayıtları saklanır ama her istekte yeniden çekilir).
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# EPIAS tarihleri Türkiye saatiyle (+03:00) gelir
+TR_TIMEZONE = timezone(timedelta(hours=3))
+
+# power_plant_id verilmeyen (tüm santraller) istekler için anahtar
+ALL_PLANTS_KEY = 'all'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+DEFAULT_SETTLE_DAYS = 2
+
+DateRange = Tuple[date, date]
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    plant_key TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (plant_key, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    plant_key TEXT NOT NULL,
+    start_day TEXT NOT NULL,
+    end_day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_plant ON coverage (plant_key, start_day);
+CREATE TABLE IF NOT EXISTS sync_state (
+    plant_key TEXT PRIMARY KEY,
+    last_ts INTEGER NOT NULL,
+    output_path TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+def plant_key_for(power_plant_id: Optional[str]) -> str:
+    return str(power_plant_id) if power_plant_id else ALL_PLANTS_KEY
+
+def day_start_timestamp(day: date) -> int:
+    """Günün Türkiye saatiyle başladığı an (epoch saniye)"""
+    return int(datetime.combine(day, time.min, TR_TIMEZONE).timestamp())
+
+def record_timestamp(record: Dict) -> Optional[int]:
+    """Kaydın 'date' alanını epoch saniyeye çevir (okunamazsa None)"""
+    value = record.get('date')
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=TR_TIMEZONE)
+    return int(parsed.timestamp())
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Çakışan ve uç uca gelen gün aralıklarını birleştir"""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def subtract_ranges(ranges: List[DateRange], removed: List[DateRange]) -> List[DateRange]:
+    """ranges'den removed aralıklarını çıkar (tüm uçlar dahil)"""
+    result: List[DateRange] = []
+    removed = merge_ranges(removed)
+    for start, end in merge_ranges(ranges):
+        cursor = start
+        for removed_start, removed_end in removed:
+            if removed_end < cursor or removed_start > end:
+                continue
+            if removed_start > cursor:
+                result.append((cursor, removed_start - timedelta(days=1)))
+            cursor = max(cursor, removed_end + timedelta(days=1))
+            if cursor > end:
+                break
+        if cursor <= end:
+            result.append((cursor, end))
+    return result
+
+class InjectionDataStore:
+    """Santral + saat anahtarlı SQLite kayıt deposu ve gün bazlı kapsama bilgisi"""
+
+    def __init__(self, path: str, settle_days: int = DEFAULT_SETTLE_DAYS):
+        self.path = path
+        self.settle_days = max(0, settle_days)
+        self._write_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Her işlem kendi bağlantısını açar; thread'ler arasında bağlantı paylaşılmaz
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _covered(self, conn: sqlite3.Connection, plant_key: str, start: date, end: date) -> List[DateRange]:
+        rows = conn.execute(
+            'SELECT start_day, end_day FROM coverage WHERE plant_key = ? AND start_day <= ? AND end_day >= ?',
+            (plant_key, end.isoformat(), start.isoformat())
+        ).fetchall()
+        return [(date.fromisoformat(row[0]), date.fromisoformat(row[1])) for row in rows]
+
+    def missing_ranges(self, plant_key: str, start: date, end: date) -> List[DateRange]:
+        """[start, end] içinde henüz eksiksiz indirilmemiş gün aralıkları"""
+        with closing(self._connect()) as conn:
+            covered = self._covered(conn, plant_key, start, end)
+        return subtract_ranges([(start, end)], covered)
+
+    def settled_until(self) -> date:
+        """Bu günden sonraki veriler henüz kesinleşmemiş sayılır (gün sınırı Türkiye saatine göre)"""
+        return datetime.now(TR_TIMEZONE).date() - timedelta(days=self.settle_days + 1)
+
+    def save(self, plant_key: str, records: Iterable[Dict], fetched_ranges: List[DateRange]) -> int:
+        """Kayıtları yaz ve eksiksiz çekilen aralıkları (kesinleşmiş kısmıyla) kapsanmış işaretle
+
+        Yazılan kayıt sayısını döndürür; tarihi okunamayan kayıtlar saklanmaz (uyarı loglanır).
+        """
+        rows = []
+        skipped = 0
+        for record in records:
+            ts = record_timestamp(record)
+            if ts is None:
+                skipped += 1
+                continue
+            rows.append((plant_key, ts, json.dumps(record, ensure_ascii=False, separators=(',', ':'))))
+        if skipped:
+            logger.warning(f"⚠️ {plant_key}: tarihi okunamayan {skipped} kayıt cache'e yazılmadı")
+
+        settled_until = self.settled_until()
+        new_coverage = [(start, min(end, settled_until)) for start, end in fetched_ranges if start <= settled_until]
+
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.executemany('INSERT OR REPLACE INTO records (plant_key, ts, payload) VALUES (?, ?, ?)', rows)
+            if new_coverage:
+                existing = conn.execute('SELECT start_day, end_day FROM coverage WHERE plant_key = ?',
+                                        (plant_key,)).fetchall()
+                merged = merge_ranges(new_coverage + [(date.fromisoformat(row[0]), date.fromisoformat(row[1]))
+                                                      for row in existing])
+                conn.execute('DELETE FROM coverage WHERE plant_key = ?', (plant_key,))
+                conn.executemany('INSERT INTO coverage (plant_key, start_day, end_day) VALUES (?, ?, ?)',
+                                 [(plant_key, start.isoformat(), end.isoformat()) for start, end in merged])
+        return len(rows)
+
+    def load(self, plant_key: str, start: date, end: date) -> List[Dict]:
+        """[start, end] günlerine ait kayıtları saat sırasıyla döndür"""
+        return list(self.iter_records(plant_key, start, end))
+
+    def iter_records(self, plant_key: str, start: date, end: date) -> Iterator[Dict]:
+        """load() ile aynı kayıtlar; tüm sonucu belleğe almadan tek tek üretir"""
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                'SELECT payload FROM records WHERE plant_key = ? AND ts >= ? AND ts < ? ORDER BY ts',
+                (plant_key, day_start_timestamp(start), day_start_timestamp(end + timedelta(days=1)))
+            )
+            for row in cursor:
+                yield json.loads(row[0])
+
+    def get_sync_state(self, plant_key: str) -> Optional[Dict[str, object]]:
+        """Artımlı senkronizasyonda en son yazılan saat ve çıktı dosyası"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT last_ts, output_path, updated_at FROM sync_state WHERE plant_key = ?',
+                               (plant_key,)).fetchone()
+        if row is None:
+            return None
+        return {'last_ts': row[0], 'output_path': row[1], 'updated_at': row[2]}
+
+    def set_sync_state(self, plant_key: str, last_ts: int, output_path: str):
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.execute('INSERT OR REPLACE INTO sync_state (plant_key, last_ts, output_path, updated_at) VALUES (?, ?, ?, ?)',
+                         (plant_key, last_ts, output_path, datetime.now(TR_TIMEZONE).isoformat(timespec='seconds')))
+
+    def clear(self, plant_key: Optional[str] = None):
+        """Santralin (verilmezse tüm) kayıtlarını ve kapsama bilgisini sil"""
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            if plant_key is None:
+                conn.execute('DELETE FROM records')
+                conn.execute('DELETE FROM coverage')
+            else:
+                conn.execute('DELETE FROM records WHERE plant_key = ?', (plant_key,))
+                conn.execute('DELETE FROM coverage WHERE plant_key = ?', (plant_key,))
+
+    def snapshot(self) -> Dict[str, object]:
+        with closing(self._connect()) as conn:
+            records = conn.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+            plants = conn.execute('SELECT COUNT(DISTINCT plant_key) FROM coverage').fetchone()[0]
+        return {
+            'path': self.path,
+            'records': records,
+            'plants': plants,
+            'size_mb': round(os.path.getsize(self.path) / (1024 * 1024), 2) if os.path.exists(self.path) else 0,
+            'settle_days': self.settle_days
+        }
+
+_store: Optional[InjectionDataStore] = None
+_store_lock = threading.Lock()
+_store_failed = False
+
+def get_data_store() -> Optional[InjectionDataStore]:
+    """Process genelinde tek depo (EPIAS_CACHE_ENABLED / EPIAS_CACHE_DIR / EPIAS_CACHE_SETTLE_DAYS)
+
+    Cache kapalıysa veya açılamıyorsa None döner; çağıran doğrudan EPIAS'a gider.
+    """
+    global _store, _store_failed
+    if _store is None and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                if os.getenv('EPIAS_CACHE_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+                    _store_failed = True
+                    return None
+                cache_dir = os.getenv('EPIAS_CACHE_DIR', DEFAULT_CACHE_DIR)
+                try:
+                    _store = InjectionDataStore(
+                        os.path.join(cache_dir, 'injection.sqlite3'),
+                        settle_days=int(os.getenv('EPIAS_CACHE_SETTLE_DAYS', DEFAULT_SETTLE_DAYS))
+                    )
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"⚠️ Yerel veri cache'i açılamadı ({cache_dir}): {e}")
+                    _store_failed = True
+    return _store
@@ -7,107 +7,347 @@ import requests
 import pandas as pd
 from datetime import datetime, timedelta
 import json
+import copy
+import re
 import time
 import os
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from typing import Iterator, List, Dict, Optional, Tuple
+from rate_limiter import get_rate_limiter
+from resilience import BREAKER_FAILURE_STATUSES, CircuitOpenError, get_circuit_breaker, get_retry_policy
+from token_manager import AuthenticationError, get_token_manager
+from transport import get_http_session
+from capability_cache import get_capability_cache
+from data_store import ALL_PLANTS_KEY, TR_TIMEZONE, day_start_timestamp, get_data_store, plant_key_for, record_timestamp, subtract_ranges
+from sync_output import append_records, truncate_from
+from single_flight import get_single_flight
+from plant_list_cache import get_plant_list_cache
+from uevcb_index import get_uevcb_index
+from json_stream import read_response_json
+from structured_log import get_event_logger
+from metrics import get_metrics
+from phase_timer import count, phase, submit_in_context
+from cassette import REPLAY, Cassette, get_cassette
+from excel_stream import DAILY_SUMMARY_COLUMNS, SUMMARY_ENERGY_SOURCES, build_summary, is_date_column, write_excel_streaming
+from log_setup import configure_logging
+from record_buffer import ColumnarRecordBuffer
+
+# Paralel chunk çekiminde izin verilen en fazla worker sayısı
+MAX_CHUNK_WORKERS = 8
+
+# Chunk pencereleri bu tarihten itibaren sabit ızgaraya hizalanır
+CHUNK_GRID_EPOCH = datetime(2000, 1, 1)
+
+# Sayfalama: kalan sayfaları paralel çeken worker sayısı
+PAGE_WORKERS = 4
+
+# Streaming API: cache'ten okunan kayıtlar bu boyutta gruplar halinde üretilir
+STREAM_BATCH_RECORDS = 5000
+
+# Toplu UEVCB çözümlemede paralel istek sayısı
+UEVCB_WORKERS = 8
+
+# Sayfa boyutu keşfi: büyükten küçüğe denenen adaylar ve reddedilme kodları
+DEFAULT_PAGE_SIZE = 24
+PAGE_SIZE_CANDIDATES = (5000, 2000, 1000, 500, 250, 100, 48, DEFAULT_PAGE_SIZE)
+PAGE_SIZE_REJECTED_STATUSES = (400, 413, 422)
+MAX_PAGE_SIZE = PAGE_SIZE_CANDIDATES[0]
+# 400/422 yalnızca hata gövdesi sayfa boyutundan söz ediyorsa red sayılır (ör. hatalı tarih aralığı sayılmaz)
+PAGE_SIZE_ERROR_PATTERN = re.compile(r'page|size|sayfa|boyut', re.IGNORECASE)
+
+# Adaptif chunk boyutu: sınırlar ve eşikler
+ADAPTIVE_MIN_CHUNK_DAYS = 1
+ADAPTIVE_MAX_CHUNK_DAYS = 90
+ADAPTIVE_FAST_SECONDS = 5.0    # bu süreden hızlı ve tek sayfa ise pencere büyür
+ADAPTIVE_SLOW_SECONDS = 20.0   # bu süreden yavaşsa pencere küçülür
+ADAPTIVE_MAX_PAGES = 4         # bundan fazla sayfa dönerse pencere küçülür
+
+# EPIAS sunucuları; EPIAS_BASE_URL / EPIAS_AUTH_URL ya da constructor ile (ör. yerel stub sunucusuna) yönlendirilebilir
+DEFAULT_BASE_URL = "https://seffaflik.epias.com.tr"
+DEFAULT_AUTH_URL = "https://giris.epias.com.tr"
+
+# Artımlı senkronizasyon: EPIAS'ın revize edebildiği son günler her seferinde yeniden çekilir
+SYNC_REVISION_DAYS = int(os.getenv('EPIAS_SYNC_REVISION_DAYS', 3))
+SYNC_INITIAL_DAYS = 30         # ilk senkronizasyonda since verilmezse geriye gidilecek gün
+SYNC_OUTPUT_DIR = "backend/downloads"
+
+# Excel satırları DataFrame kurulmadan, write_only modda akış halinde yazılır (false: eski DataFrame yolu)
+EXCEL_STREAMING = os.getenv('EPIAS_EXCEL_STREAMING', 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+
+class AdaptiveChunkSizer:
+    """Gözlenen gecikme ve sayfa sayısına göre chunk boyutunu (gün) ayarla"""
+    
+    def __init__(self, initial_days: int, min_days: int = ADAPTIVE_MIN_CHUNK_DAYS,
+                 max_days: int = ADAPTIVE_MAX_CHUNK_DAYS):
+        self.min_days = min_days
+        self.max_days = max_days
+        self.current_days = max(min_days, min(int(initial_days), max_days))
+    
+    def record(self, elapsed: float, pages: int, failed: bool = False, timed_out: bool = False) -> int:
+        """Bir chunk sonucunu kaydet ve sonraki chunk boyutunu döndür"""
+        if failed or timed_out or elapsed > ADAPTIVE_SLOW_SECONDS or pages > ADAPTIVE_MAX_PAGES:
+            self.current_days = max(self.min_days, self.current_days // 2)
+        elif elapsed < ADAPTIVE_FAST_SECONDS and pages <= 1:
+            self.current_days = min(self.max_days, self.current_days * 2)
+        return self.current_days
 
 class EpiasExtractor:
     """EPIAS Elektrik Verisi Çekici - API Class"""
     
-    def __init__(self, username: str, password: str):
+    # Endpoint başına sunucunun kabul ettiği sayfa boyutu (process genelinde paylaşılır)
+    _page_size_cache: Dict[str, int] = {}
+    _page_size_lock = threading.Lock()
+    # Aynı anda gelen ilk istekler keşfi tek tek değil sırayla yapar; sonrakiler bulunan değeri kullanır
+    _page_size_negotiation_lock = threading.Lock()
+    
+    def __init__(self, username: str, password: str, base_url: Optional[str] = None,
+                 auth_url: Optional[str] = None, cassette: Optional[Cassette] = None):
         self.username = username
         self.password = password
         self.tgt_token = None
-        self.session = requests.Session()
+        # Process genelinde paylaşılan pool'lu session; TGT her isteğe ayrıca eklenir
+        self.session = get_http_session()
+        # Verilirse (ya da EPIAS_CASSETTE ayarlıysa) istekler kaydedilir / kayıttan oynatılır
+        self.cassette = cassette if cassette is not None else get_cassette()
+        
+        # API URLs (sunucu kökü verilir, yollar sabittir)
+        auth_root = (auth_url or os.getenv('EPIAS_AUTH_URL') or DEFAULT_AUTH_URL).rstrip('/')
+        base_root = (base_url or os.getenv('EPIAS_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.auth_url = f"{auth_root}/cas/v1/tickets"
+        self.base_url = f"{base_root}/electricity-service/v1/generation"
+        
+        # Logging process başında bir kez kurulur; burada yalnızca kurulu olduğu garanti edilir
+        configure_logging()
+        self.logger = logging.getLogger(__name__)
+    
+    def _throttle(self):
+        """Process genelindeki rate limiter'dan token al (gerekirse bekle)"""
+        with phase('rate_limit_wait'):
+            waited = get_rate_limiter().acquire()
+        if waited > 0:
+            self.logger.debug(f"⏳ Rate limit: {waited:.2f}s beklendi")
+    
+    def _endpoint_name(self, url: str) -> str:
+        """Circuit breaker ve loglar için kısa endpoint adı"""
+        if url.startswith(self.auth_url):
+            return 'auth'
+        if url.startswith(self.base_url):
+            return url[len(self.base_url):].strip('/')
+        return url
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """EPIAS isteklerinin ortak giriş noktası
+        
+        Veri isteklerinde güncel TGT'yi ekler (süresi dolmak üzereyse önce yeniler);
+        401 gelirse token'ı bir kez yenileyip isteği tekrar gönderir.
+        """
+        if url.startswith(self.auth_url) or not self.tgt_token:
+            return self._send(method, url, **kwargs)
         
-        # API URLs
-        self.auth_url = "https://giris.epias.com.tr/cas/v1/tickets"
-        self.base_url = "https://seffaflik.epias.com.tr/electricity-service/v1/generation"
+        used_token = self._apply_token(kwargs)
+        response = self._send(method, url, **kwargs)
         
-        # Headers
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        })
+        if response.status_code == 401:
+            self.logger.warning(f"🔑 {self._endpoint_name(url)}: 401 - TGT yenilenip istek tekrarlanıyor")
+            try:
+                token = get_token_manager().refresh(self.username, self.password, used_token, self._issue_ticket)
+            except AuthenticationError as e:
+                self.logger.error(f"❌ TGT yenilenemedi: {e}")
+                return response
+            self._set_token(token)
+            self._apply_token(kwargs)
+            self._discard(response)
+            response = self._send(method, url, **kwargs)
         
-        # Setup logging
-        self.setup_logging()
+        return response
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """İsteği retry politikası ve circuit breaker ile gönder
         
-    def setup_logging(self):
-        """Logging setup - cloud deployment friendly"""
-        handlers = []
+        Rate limiter'dan token alır, geçici hataları (bağlantı/timeout, 429, 5xx)
+        exponential backoff + jitter ile tekrar dener (Retry-After'a uyar) ve endpoint
+        bazlı circuit breaker açıksa istek göndermeden CircuitOpenError fırlatır.
+        Denemeler tükenirse son cevap döndürülür veya son hata fırlatılır.
+        """
+        endpoint = self._endpoint_name(url)
+        breaker = get_circuit_breaker(endpoint)
+        policy = get_retry_policy()
+        events = get_event_logger()
+        metrics = get_metrics()
+        started = time.monotonic()
         
-        # Always add console handler
-        handlers.append(logging.StreamHandler())
+        for attempt in range(1, policy.max_attempts + 1):
+            try:
+                breaker.before_call()
+            except CircuitOpenError:
+                metrics.upstream_errors.inc(endpoint=endpoint, reason='circuit_open')
+                raise
+            if self.cassette is None or self.cassette.mode != REPLAY:
+                self._throttle()
+            
+            attempt_started = time.monotonic()
+            count('http_requests')
+            try:
+                with phase('auth' if endpoint == 'auth' else 'http_wait'):
+                    response = self._transport(method, endpoint, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.upstream_latency.observe(time.monotonic() - attempt_started, endpoint=endpoint)
+                metrics.upstream_requests.inc(endpoint=endpoint, status=type(e).__name__)
+                breaker.record_failure()
+                if attempt == policy.max_attempts:
+                    metrics.upstream_errors.inc(endpoint=endpoint, reason=type(e).__name__)
+                    events.emit('upstream_request', level=logging.WARNING, method=method, endpoint=endpoint,
+                                error=type(e).__name__, attempts=attempt,
+                                elapsed_ms=round((time.monotonic() - started) * 1000))
+                    raise
+                delay = policy.backoff(attempt)
+                metrics.upstream_retries.inc(endpoint=endpoint)
+                count('retries')
+                self.logger.warning(f"🔁 {endpoint}: {type(e).__name__}, {delay:.1f}s sonra tekrar denenecek ({attempt}/{policy.max_attempts})")
+                with phase('retry_sleep'):
+                    time.sleep(delay)
+                continue
+            except BaseException as e:
+                # Bağlantı/timeout dışı hatalar (InvalidURL, TooManyRedirects, cassette'te kayıt yok...)
+                # tekrar denenmez; half-open deneme hakkı bırakılmazsa devre process boyunca açık kalır
+                breaker.release_trial()
+                if isinstance(e, Exception):
+                    metrics.upstream_errors.inc(endpoint=endpoint, reason=type(e).__name__)
+                raise
+            
+            metrics.upstream_latency.observe(time.monotonic() - attempt_started, endpoint=endpoint)
+            metrics.upstream_requests.inc(endpoint=endpoint, status=response.status_code)
+            if response.status_code in BREAKER_FAILURE_STATUSES:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            
+            if not policy.is_retryable_status(response.status_code) or attempt == policy.max_attempts:
+                if response.status_code >= 400:
+                    metrics.upstream_errors.inc(endpoint=endpoint, reason=response.status_code)
+                # stream=True isteklerde süre başlıklar gelene kadardır; gövde boyutu Content-Length'ten
+                events.emit('upstream_request', method=method, endpoint=endpoint, status=response.status_code,
+                            attempts=attempt, elapsed_ms=round((time.monotonic() - started) * 1000),
+                            bytes=response.headers.get('Content-Length'))
+                return response
+            
+            delay = policy.backoff(attempt, response)
+            metrics.upstream_retries.inc(endpoint=endpoint)
+            count('retries')
+            self.logger.warning(f"🔁 {endpoint}: HTTP {response.status_code}, {delay:.1f}s sonra tekrar denenecek ({attempt}/{policy.max_attempts})")
+            self._discard(response)
+            with phase('retry_sleep'):
+                time.sleep(delay)
         
-        # Try to add file handler if possible (for local development)
+        return response
+    
+    def _transport(self, method: str, endpoint: str, url: str, **kwargs) -> requests.Response:
+        """Tek HTTP denemesi; cassette varsa kaydedilir ya da kayıttan oynatılır"""
+        if self.cassette is None:
+            return self.session.request(method, url, **kwargs)
+        return self.cassette.request(self.session, method, endpoint, url, **kwargs)
+    
+    @staticmethod
+    def _discard(response: requests.Response):
+        """Kullanılmayacak cevabı kapat; stream=True isteklerde bağlantı pool'a geri döner"""
         try:
-            # Create logs directory if it doesn't exist
-            log_dir = 'backend/logs'
-            os.makedirs(log_dir, exist_ok=True)
-            
-            # Add file handler
-            file_handler = logging.FileHandler('backend/logs/epias_api.log', encoding='utf-8')
-            handlers.append(file_handler)
-        except (OSError, PermissionError):
-            # If file logging fails (e.g., in cloud environment), just use console
+            response.content  # küçük hata gövdesini tüket ki keep-alive bağlantı yeniden kullanılabilsin
+        except requests.RequestException:
             pass
+        response.close()
+    
+    def _read_json(self, response: requests.Response):
+        """Cevap gövdesini akış halinde parse et
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=handlers,
-            force=True  # Override any existing logging config
+        Gövde (gzip/deflate ise açılarak) 64 KB'lık parçalarla okunur; tamamı hiçbir
+        zaman tek bir string/bytes olarak bellekte tutulmaz.
+        """
+        try:
+            # Gövde parse edilirken okunduğundan bu faz gövdenin indirilmesini de içerir
+            with phase('json_parse'):
+                data = read_response_json(response)
+        finally:
+            response.close()
+        endpoint = self._endpoint_name(response.url or '')
+        wire_bytes = response.raw.tell()
+        get_metrics().bytes_received.inc(wire_bytes, endpoint=endpoint)
+        count('bytes_received', wire_bytes)
+        self.logger.debug(f"📦 {endpoint}: {wire_bytes} bytes on wire "
+                          f"({response.headers.get('Content-Encoding', 'identity')})")
+        return data
+    
+    def _set_token(self, token: str):
+        """Aktif TGT'yi güncelle"""
+        self.tgt_token = token
+    
+    def _apply_token(self, request_kwargs: Dict) -> str:
+        """Geçerli (gerekirse yenilenmiş) TGT'yi isteğe uygula ve döndür"""
+        token = get_token_manager().get_token(self.username, self.password, self._issue_ticket)
+        self._set_token(token)
+        # Paylaşılan session'a değil isteğe eklenir; çağıranın (thread'ler arasında
+        # paylaşılan) headers dict'i de değiştirilmez
+        request_kwargs['headers'] = {**(request_kwargs.get('headers') or {}), 'TGT': token}
+        return token
+    
+    def _issue_ticket(self) -> str:
+        """CAS'tan yeni TGT al (TokenManager tarafından çağrılır)"""
+        self.logger.info("🔐 EPIAS authentication başlatılıyor...")
+        
+        # Authentication için headers
+        auth_headers = {
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'Accept': 'text/plain'
+        }
+        
+        # Authentication data
+        auth_data = {
+            'username': self.username,
+            'password': self.password
+        }
+        
+        response = self._request(
+            'POST',
+            self.auth_url, 
+            data=auth_data, 
+            headers=auth_headers,
+            timeout=30
         )
-        self.logger = logging.getLogger(__name__)
+        
+        if response.status_code != 201:
+            self.logger.error(f"❌ Authentication başarısız: {response.status_code}")
+            raise AuthenticationError(f'Authentication başarısız: {response.status_code}',
+                                      response.status_code, response.text)
+        
+        self.logger.info("✅ Authentication başarılı!")
+        return response.text.strip()
     
     def authenticate(self) -> Dict[str, any]:
-        """EPIAS'a authenticate ol ve TGT token al"""
+        """EPIAS'a authenticate ol ve TGT token al
+        
+        Aynı kullanıcı için geçerli bir TGT varsa (process genelinde) CAS'a gitmeden
+        yeniden kullanılır.
+        """
         try:
-            self.logger.info("🔐 EPIAS authentication başlatılıyor...")
+            token = get_token_manager().get_token(self.username, self.password, self._issue_ticket)
+            self._set_token(token)
             
-            # Authentication için headers
-            auth_headers = {
-                'Content-Type': 'application/x-www-form-urlencoded',
-                'Accept': 'text/plain'
+            return {
+                'success': True,
+                'message': 'Authentication başarılı',
+                'token_preview': self.tgt_token[:20] + '...' if len(self.tgt_token) > 20 else self.tgt_token
             }
-            
-            # Authentication data
-            auth_data = {
-                'username': self.username,
-                'password': self.password
+        
+        except AuthenticationError as e:
+            return {
+                'success': False,
+                'message': str(e),
+                'error': e.response_text
             }
-            
-            response = requests.post(
-                self.auth_url, 
-                data=auth_data, 
-                headers=auth_headers,
-                timeout=30
-            )
-            
-            if response.status_code == 201:
-                self.tgt_token = response.text.strip()
-                self.logger.info("✅ Authentication başarılı!")
-                
-                # Session headers'ına TGT ekle
-                self.session.headers.update({
-                    'TGT': self.tgt_token
-                })
-                
-                return {
-                    'success': True,
-                    'message': 'Authentication başarılı',
-                    'token_preview': self.tgt_token[:20] + '...' if len(self.tgt_token) > 20 else self.tgt_token
-                }
-            else:
-                self.logger.error(f"❌ Authentication başarısız: {response.status_code}")
-                return {
-                    'success': False,
-                    'message': f'Authentication başarısız: {response.status_code}',
-                    'error': response.text
-                }
                 
         except Exception as e:
             self.logger.error(f"❌ Authentication hatası: {e}")
@@ -116,8 +356,12 @@ class EpiasExtractor:
                 'message': f'Authentication hatası: {str(e)}'
             }
     
-    def get_power_plant_list(self) -> Dict[str, any]:
-        """Santral listesini getir"""
+    def get_power_plant_list(self, force_refresh: bool = False) -> Dict[str, any]:
+        """Santral listesini getir
+        
+        Liste process genelinde paylaşılan cache'ten gelir (EPIAS_PLANT_LIST_TTL_SECONDS);
+        süresi dolunca koşullu istekle yenilenir. force_refresh=True TTL'i beklemez.
+        """
         if not self.tgt_token:
             return {
                 'success': False,
@@ -126,38 +370,15 @@ class EpiasExtractor:
             }
         
         try:
-            self.logger.info("📋 Santral listesi alınıyor...")
-            
-            url = f"{self.base_url}/data/injection-quantity-powerplant-list"
-            
-            response = self.session.get(url, timeout=30)
+            plants, from_cache = get_plant_list_cache().get(self._fetch_power_plant_list, force_refresh)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Response structure'ı kontrol et
-                if isinstance(data, dict) and 'items' in data:
-                    plants = data['items']
-                elif isinstance(data, list):
-                    plants = data
-                else:
-                    plants = []
-                
-                self.logger.info(f"✅ {len(plants)} santral bulundu")
-                
-                return {
-                    'success': True,
-                    'message': f'{len(plants)} santral bulundu',
-                    'data': plants,
-                    'count': len(plants)
-                }
-            else:
-                self.logger.error(f"❌ Santral listesi alınamadı: {response.status_code}")
-                return {
-                    'success': False,
-                    'message': f'Santral listesi alınamadı: {response.status_code}',
-                    'data': []
-                }
+            return {
+                'success': True,
+                'message': f'{len(plants)} santral bulundu',
+                'data': plants,
+                'count': len(plants),
+                'cached': from_cache
+            }
                 
         except Exception as e:
             self.logger.error(f"❌ Santral listesi hatası: {e}")
@@ -167,32 +388,111 @@ class EpiasExtractor:
                 'data': []
             }
     
-    def get_uevcb_list(self, organization_id: str) -> List[Dict]:
-        """Belirli bir santral için UEVCB listesini getir"""
-        if not self.tgt_token:
-            return []
+    def _fetch_power_plant_list(self, validators: Dict[str, str]) -> Optional[Tuple[List[Dict], Dict[str, str]]]:
+        """Santral listesini upstream'den çek (PlantListCache tarafından çağrılır)
         
-        try:
-            self.logger.info(f"🔍 UEVCB listesi alınıyor - Organization ID: {organization_id}")
+        validators (ETag / Last-Modified) verilirse istek koşullu gönderilir; liste
+        değişmediyse (304) None döner.
+        """
+        self.logger.info("📋 Santral listesi alınıyor...")
+        
+        url = f"{self.base_url}/data/injection-quantity-powerplant-list"
+        
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = self._request('GET', url, headers=headers, timeout=30)
+        
+        if response.status_code == 304:
+            self.logger.info("📋 Santral listesi değişmemiş (304), cache kullanılıyor")
+            return None
+        if response.status_code != 200:
+            self.logger.error(f"❌ Santral listesi alınamadı: {response.status_code}")
+            raise RuntimeError(f'Santral listesi alınamadı: {response.status_code}')
+        
+        data = response.json()
+        
+        # Response structure'ı kontrol et
+        if isinstance(data, dict) and 'items' in data:
+            plants = data['items']
+        elif isinstance(data, list):
+            plants = data
+        else:
+            plants = []
+        
+        self.logger.info(f"✅ {len(plants)} santral bulundu")
+        
+        new_validators = {}
+        if response.headers.get('ETag'):
+            new_validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            new_validators['last_modified'] = response.headers['Last-Modified']
+        return plants, new_validators
+    
+    def get_uevcb_list(self, organization_id: str, force_refresh: bool = False) -> List[Dict]:
+        """Belirli bir organizasyon için UEVCB listesini getir
+        
+        Liste önce kalıcı UEVCB indeksinde aranır (EPIAS_UEVCB_TTL_SECONDS); yoksa
+        EPIAS'tan çekilip indekse yazılır.
+        """
+        return self.get_uevcb_lists([organization_id], force_refresh=force_refresh).get(str(organization_id), [])
+    
+    def get_uevcb_lists(self, organization_ids: List[str], max_workers: int = UEVCB_WORKERS,
+                        force_refresh: bool = False) -> Dict[str, List[Dict]]:
+        """Birden çok organizasyonun UEVCB listelerini toplu getir
+        
+        İndekste taze olanlar doğrudan döner; eksikler paralel çekilir ve indekse
+        yazılır. Çekilemeyen organizasyonlar için boş liste döner (indekse yazılmaz).
+        """
+        organization_ids = list(dict.fromkeys(str(organization_id) for organization_id in organization_ids))
+        if not self.tgt_token or not organization_ids:
+            return {organization_id: [] for organization_id in organization_ids}
+        
+        index = get_uevcb_index()
+        found = {} if force_refresh else index.get_many(organization_ids)
+        missing = [organization_id for organization_id in organization_ids if organization_id not in found]
+        
+        if missing:
+            self.logger.info(f"🔍 UEVCB listeleri alınıyor: {len(missing)} organizasyon "
+                             f"({len(found)} tanesi indeksten)")
+            fetched = {}
+            workers = max(1, min(max_workers, len(missing)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {submit_in_context(executor, self._fetch_uevcb_list, organization_id): organization_id
+                           for organization_id in missing}
+                for future in as_completed(futures):
+                    uevcbs = future.result()
+                    if uevcbs is not None:
+                        fetched[futures[future]] = uevcbs
+            index.put_many(fetched)
+            found.update(fetched)
             
+            failed = len(missing) - len(fetched)
+            if failed:
+                self.logger.warning(f"⚠️ {failed} organizasyonun UEVCB listesi alınamadı")
+        
+        return {organization_id: found.get(organization_id, []) for organization_id in organization_ids}
+    
+    def _fetch_uevcb_list(self, organization_id: str) -> Optional[List[Dict]]:
+        """Tek organizasyonun UEVCB listesini EPIAS'tan çek; hata olursa None"""
+        try:
             url = f"{self.base_url}/data/uevcb-list"
             
-            # Request body
             payload = {
                 "organizationId": int(organization_id)
             }
             
-            self.logger.info(f"🌐 UEVCB API isteği: {url}")
-            self.logger.info(f"📦 UEVCB Payload: {payload}")
+            self.logger.debug(f"📦 UEVCB Payload: {payload}")
             
-            response = self.session.post(url, json=payload, timeout=30)
+            response = self._request('POST', url, json=payload, timeout=30)
             
-            self.logger.info(f"📨 UEVCB Response Status: {response.status_code}")
-            self.logger.info(f"📨 UEVCB Response Headers: {dict(response.headers)}")
+            self.logger.debug(f"📨 UEVCB Response Headers: {dict(response.headers)}")
             
             if response.status_code == 200:
                 data = response.json()
-                self.logger.info(f"📊 UEVCB Raw Response: {data}")
                 
                 # Response yapısını kontrol et
                 if isinstance(data, dict) and 'body' in data and 'content' in data['body']:
@@ -204,26 +504,35 @@ class EpiasExtractor:
                 else:
                     uevcbs = []
                 
-                self.logger.info(f"✅ {len(uevcbs)} UEVCB bulundu")
-                if uevcbs:
-                    self.logger.info(f"🔍 İlk UEVCB örneği: {uevcbs[0]}")
+                self.logger.debug(f"✅ Organization {organization_id}: {len(uevcbs)} UEVCB bulundu")
                 return uevcbs
             else:
-                self.logger.error(f"❌ UEVCB listesi alınamadı: {response.status_code}")
-                self.logger.error(f"❌ UEVCB Response Text: {response.text}")
-                return []
+                self.logger.error(f"❌ UEVCB listesi alınamadı (Organization {organization_id}): {response.status_code}")
+                self.logger.debug(f"❌ UEVCB Response Text: {response.text[:500]}")
+                return None
                 
         except Exception as e:
-            self.logger.error(f"❌ UEVCB listesi hatası: {e}")
-            return []
+            self.logger.error(f"❌ UEVCB listesi hatası (Organization {organization_id}): {e}")
+            return None
 
     def get_injection_quantity_data_export(self, start_date: str, end_date: str, power_plant_id: Optional[str] = None) -> List[Dict]:
         """Try the export endpoint which might give individual plant data"""
-        if not self.tgt_token:
+        try:
+            return self._fetch_export(start_date, end_date, power_plant_id) or []
+        except CircuitOpenError as e:
+            self.logger.error(f"❌ Export endpoint hatası: {e}")
             return []
+    
+    def _fetch_export(self, start_date: str, end_date: str, power_plant_id: Optional[str] = None) -> Optional[List[Dict]]:
+        """Export endpoint'ini dene: hata olursa None, dönem boşsa [] döndürür
+        
+        Circuit açıksa CircuitOpenError yukarı iletilir; bu santrale özgü bir hata değildir.
+        """
+        if not self.tgt_token:
+            return None
         
         try:
-            self.logger.info(f"🔄 Trying EXPORT endpoint for individual plant data...")
+            self.logger.debug(f"🔄 Trying EXPORT endpoint for individual plant data...")
             
             url = f"{self.base_url}/export/injection-quantity"
             
@@ -235,26 +544,24 @@ class EpiasExtractor:
             
             if power_plant_id:
                 payload["powerplantId"] = int(power_plant_id)
-                self.logger.info(f"🎯 Export endpoint - powerplantId = {power_plant_id}")
+                self.logger.debug(f"🎯 Export endpoint - powerplantId = {power_plant_id}")
             
             headers = {
                 'Content-Type': 'application/json',
                 'Accept': 'application/json, text/plain, */*',
                 'Origin': 'https://seffaflik.epias.com.tr',
-                'Referer': 'https://seffaflik.epias.com.tr/electricity/electricity-generation/ex-post-generation/injection-quantity',
-                'TGT': self.tgt_token
+                'Referer': 'https://seffaflik.epias.com.tr/electricity/electricity-generation/ex-post-generation/injection-quantity'
             }
             
-            self.logger.info(f"🌐 Export API isteği: {url}")
-            self.logger.info(f"📦 Export Payload: {payload}")
+            self.logger.debug(f"🌐 Export API isteği: {url}")
+            self.logger.debug(f"📦 Export Payload: {payload}")
             
-            response = self.session.post(url, json=payload, headers=headers, timeout=60)
+            response = self._request('POST', url, json=payload, headers=headers, timeout=60, stream=True)
             
-            self.logger.info(f"📨 Export Response Status: {response.status_code}")
+            self.logger.debug(f"📨 Export Response Status: {response.status_code}")
             
             if response.status_code == 200:
-                data = response.json()
-                self.logger.info(f"📊 Export Raw Response: {str(data)[:500]}...")
+                data = self._read_json(response)
                 
                 if isinstance(data, dict) and 'content' in data:
                     items = data['content']
@@ -263,37 +570,157 @@ class EpiasExtractor:
                 else:
                     items = []
                 
-                self.logger.info(f"✅ Export endpoint: {len(items)} kayıt alındı")
+                self.logger.debug(f"✅ Export endpoint: {len(items)} kayıt alındı")
                 if items:
-                    self.logger.info(f"🔍 Export record örneği: {items[0]}")
+                    self.logger.debug(f"🔍 Export record örneği: {items[0]}")
                     
                 return items
             else:
-                self.logger.error(f"❌ Export endpoint failed: {response.status_code}")
-                self.logger.error(f"❌ Export Response: {response.text}")
-                return []
+                self.logger.warning(f"⚠️ Export endpoint failed: {response.status_code}")
+                self.logger.debug(f"❌ Export Response: {response.text[:500]}")
+                return None
                 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             self.logger.error(f"❌ Export endpoint hatası: {e}")
-            return []
+            return None
 
-    def get_injection_quantity_data(self, start_date: str, end_date: str, power_plant_id: Optional[str] = None) -> List[Dict]:
-        """Enjeksiyon miktarı verilerini getir - EPIAS website ile aynı format"""
+    def get_injection_quantity_data(self, start_date: str, end_date: str, power_plant_id: Optional[str] = None,
+                                    page_size: Optional[int] = None, stats: Optional[Dict] = None) -> List[Dict]:
+        """Enjeksiyon miktarı verilerini getir - EPIAS website ile aynı format
+        
+        page_size verilmezse endpoint için sunucunun kabul ettiği en büyük sayfa boyutu
+        kullanılır (ilk istekte bulunur ve process genelinde cache'lenir). stats dict'i
+        verilirse sayfa sayısı ve hata/timeout bilgisi içine yazılır.
+        """
+        stats = stats if stats is not None else {}
+        stats.update({'pages': 0, 'failed': False, 'timed_out': False})
+        
         if not self.tgt_token:
+            stats['failed'] = True
             return []
         
+        # Aynı anda aynı pencere, santral ve sayfa boyutu için gelen istekler tek upstream çekimini paylaşır
+        # (page_size=None olanlar keşfedilen boyutu kullandığından kendi aralarında paylaşır)
+        key = ('injection-quantity', start_date, end_date, str(power_plant_id or ''), page_size)
+        (items, fetch_stats), shared = get_single_flight().do(
+            key, lambda: self._fetch_injection_quantity(start_date, end_date, power_plant_id, page_size)
+        )
+        if shared:
+            self.logger.info(f"🤝 {start_date} - {end_date}: devam eden özdeş istek paylaşıldı ({len(items)} kayıt)")
+        stats.update(fetch_stats)
+        return list(items)
+    
+    def _fetch_injection_quantity(self, start_date: str, end_date: str, power_plant_id: Optional[str],
+                                  page_size: Optional[int]) -> Tuple[List[Dict], Dict]:
+        """get_injection_quantity_data'nın upstream kısmı: (kayıtlar, istatistik) döndürür"""
+        stats = {'pages': 0, 'failed': False, 'timed_out': False}
+        started = time.monotonic()
+        
+        metrics = get_metrics()
+        items = []
+        for page_items in self._iter_injection_pages(start_date, end_date, power_plant_id, page_size, stats):
+            metrics.pages_fetched.inc()
+            metrics.records_fetched.inc(len(page_items))
+            count('pages')
+            count('records', len(page_items))
+            items.extend(page_items)
+        
+        get_event_logger().emit(
+            'injection_quantity', level=logging.WARNING if stats['failed'] else logging.INFO,
+            start=start_date[:10], end=end_date[:10], plant=power_plant_id or ALL_PLANTS_KEY,
+            records=len(items), pages=stats['pages'], elapsed_ms=round((time.monotonic() - started) * 1000),
+            failed=stats['failed'] or None
+        )
+        
+        if items:
+            self._check_plant_identity(items[0], power_plant_id)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self._log_record_diagnostics(items, power_plant_id)
+        
+        return items, stats
+    
+    def _check_plant_identity(self, first_record: Dict, power_plant_id: Optional[str]):
+        """İstenen santral ile dönen kaydın santrali farklıysa uyar"""
+        if not power_plant_id:
+            return
+        for field in ('powerPlantId', 'organizationId'):
+            if field in first_record:
+                if str(first_record.get(field)) != str(power_plant_id):
+                    self.logger.warning(f"⚠️ {field} mismatch! Requested: {power_plant_id}, Got: {first_record.get(field)}")
+                return
+    
+    def _log_record_diagnostics(self, items: List[Dict], power_plant_id: Optional[str]):
+        """Örnek kayıtlar ve enerji kaynağı analizi - yalnızca DEBUG seviyesinde hesaplanır"""
+        first_record = items[0]
+        self.logger.debug(f"🔍 İlk injection record örneği: {first_record}")
+        self.logger.debug(f"🔍 Record keys: {list(first_record.keys())}")
+        
+        # Analyze data structure to understand if this is individual or aggregate data
+        if 'total' in first_record:
+            total_value = first_record.get('total')
+            
+            # Check if this is individual plant data (only one energy type has values) vs aggregate (multiple types)
+            energy_fields = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'biomass', 'geothermal', 'fueloil', 'asphaltite', 'stoneCoal', 'naphtha', 'lng']
+            non_zero_breakdown = {field: first_record[field] for field in energy_fields
+                                  if (first_record.get(field) or 0) > 0}
+            
+            if not non_zero_breakdown:
+                self.logger.debug(f"💤 ZERO PRODUCTION: Plant has no energy production in this time period")
+            elif len(non_zero_breakdown) == 1:
+                self.logger.debug(f"✅ INDIVIDUAL PLANT DATA: Single energy type {non_zero_breakdown}")
+            elif power_plant_id:
+                self.logger.debug(f"⚠️ Requested specific plant {power_plant_id} but got multiple energy types: {list(non_zero_breakdown)}")
+            
+            scope = f"PLANT {power_plant_id}" if power_plant_id else "AGGREGATE DATA"
+            self.logger.debug(f"📊 {scope} ANALYSIS: Total={total_value}, Active sources={len(non_zero_breakdown)}, "
+                              f"Breakdown={non_zero_breakdown}")
+        
+        if 'powerPlantId' not in first_record and 'organizationId' not in first_record:
+            self.logger.debug(f"ℹ️ No plant identifier found in record - this might be aggregate data")
+        
+        # Show more sample records to understand the pattern
+        for record in items[1:3]:
+            self.logger.debug(f"🔍 Record örneği: {record}")
+    
+    def _iter_injection_pages(self, start_date: str, end_date: str, power_plant_id: Optional[str],
+                              page_size: Optional[int], stats: Dict) -> Iterator[List[Dict]]:
+        """Bir pencerenin kayıtlarını sayfa sayfa, sırayla üret
+        
+        Santral verilmişse önce export endpoint'i denenir. Alınamayan sayfalar
+        atlanır ve stats['failed'] işaretlenir; bir sonraki sayfa ancak bu işaretten
+        sonra üretilir, yani tüketici boşluğu ilk sonraki sayfada fark edebilir.
+        """
         try:
-            self.logger.info(f"📊 Enjeksiyon verileri alınıyor: {start_date} - {end_date}")
+            self.logger.debug(f"📊 Enjeksiyon verileri alınıyor: {start_date} - {end_date}")
             
-            # If we have a specific power plant, try export endpoint first
+            # If we have a specific power plant, try export endpoint first - unless it is known not to work
+            # or (export bilinmiyorken) data endpoint'in çalıştığı biliniyorsa
+            capabilities = get_capability_cache()
             if power_plant_id:
-                self.logger.info(f"🔄 Specific plant requested - trying export endpoint first...")
-                export_data = self.get_injection_quantity_data_export(start_date, end_date, power_plant_id)
-                if export_data:
-                    self.logger.info(f"✅ Export endpoint successful, returning {len(export_data)} records")
-                    return export_data
+                export_works = capabilities.lookup(power_plant_id, 'export')
+                if export_works is False:
+                    self.logger.debug(f"🧭 Export endpoint bu santral için çalışmıyor (cache), doğrudan data endpoint kullanılıyor")
+                elif export_works is None and capabilities.lookup(power_plant_id, 'data'):
+                    self.logger.debug(f"🧭 Data endpoint bu santral için çalışıyor (cache), export denenmiyor")
                 else:
-                    self.logger.warning(f"⚠️ Export endpoint failed, falling back to data endpoint...")
+                    self.logger.debug(f"🔄 Specific plant requested - trying export endpoint first...")
+                    try:
+                        export_data = self._fetch_export(start_date, end_date, power_plant_id)
+                    except CircuitOpenError as e:
+                        self.logger.warning(f"⚠️ {e}, falling back to data endpoint...")
+                    else:
+                        if export_data:
+                            capabilities.record(power_plant_id, 'export', True)
+                            self.logger.debug(f"✅ Export endpoint successful, returning {len(export_data)} records")
+                            stats['pages'] = 1
+                            yield export_data
+                            return
+                        if export_data is None:
+                            # Boş dönem endpoint'in çalışmadığını göstermez; yalnızca hata kaydedilir
+                            capabilities.record(power_plant_id, 'export', False)
+                        self.logger.warning(f"⚠️ Export endpoint failed, falling back to data endpoint...")
             
             url = f"{self.base_url}/data/injection-quantity"
             
@@ -303,7 +730,7 @@ class EpiasExtractor:
                 "endDate": end_date,
                 "page": {
                     "number": 1,
-                    "size": 24,
+                    "size": page_size or self._get_cached_page_size(url) or DEFAULT_PAGE_SIZE,
                     "sort": {
                         "direction": "ASC",
                         "field": "date"
@@ -314,168 +741,249 @@ class EpiasExtractor:
             # Eğer power_plant_id varsa, powerplantId olarak ekle (lowercase 'p')
             if power_plant_id:
                 payload["powerplantId"] = int(power_plant_id)
-                self.logger.info(f"🎯 Santral filtreleme: powerplantId = {power_plant_id}")
+                self.logger.debug(f"🎯 Santral filtreleme: powerplantId = {power_plant_id}")
             else:
-                self.logger.info(f"📊 Tüm santraller verisi çekiliyor")
+                self.logger.debug(f"📊 Tüm santraller verisi çekiliyor")
             
-            self.logger.info(f"🌐 Injection API isteği: {url}")
-            self.logger.info(f"📦 Injection Payload: {payload}")
+            self.logger.debug(f"🌐 Injection API isteği: {url}")
+            self.logger.debug(f"📦 Injection Payload: {payload}")
             
             # Headers - EPIAS website benzeri
             headers = {
                 'Content-Type': 'application/json',
                 'Accept': 'application/json, text/plain, */*',
                 'Origin': 'https://seffaflik.epias.com.tr',
-                'Referer': 'https://seffaflik.epias.com.tr/electricity/electricity-generation/ex-post-generation/injection-quantity',
-                'TGT': self.tgt_token
+                'Referer': 'https://seffaflik.epias.com.tr/electricity/electricity-generation/ex-post-generation/injection-quantity'
             }
             
-            response = self.session.post(url, json=payload, headers=headers, timeout=60)
+            if page_size is None and self._get_cached_page_size(url) is None:
+                # İlk istek aynı zamanda sayfa boyutu keşfi; dönen cevap 1. sayfa olarak kullanılır
+                response, data = self._negotiate_page_size(url, payload, headers)
+            else:
+                data = None
+                response = self._request('POST', url, json=payload, headers=headers, timeout=60, stream=True)
+                if page_size is None and self._is_page_size_rejection(response):
+                    # Upstream limitleri değişmiş olabilir: cache'i bırak ve yeniden keşfet
+                    self.logger.warning(f"⚠️ Cached page size {payload['page']['size']} rejected ({response.status_code}), renegotiating...")
+                    self._invalidate_page_size(url, payload['page']['size'])
+                    response, data = self._negotiate_page_size(url, payload, headers)
             
-            self.logger.info(f"📨 Injection Response Status: {response.status_code}")
-            self.logger.info(f"📨 Injection Response Headers: {dict(response.headers)}")
+            self.logger.debug(f"📨 Injection Response Status: {response.status_code}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"📨 Injection Response Headers: {dict(response.headers)}")
             
-            if response.status_code == 200:
-                data = response.json()
-                self.logger.info(f"📊 Injection Raw Response: {str(data)[:500]}...")
+            if response.status_code != 200:
+                self.logger.error(f"❌ Veri alınamadı: {response.status_code}")
+                self.logger.debug(f"❌ Response Text: {response.text[:500]}")
+                stats['failed'] = True
+                return
+            
+            if data is None:
+                data = self._read_json(response)
+            
+            # Response yapısını kontrol et - EPIAS website ile aynı format
+            if isinstance(data, dict) and 'items' in data:
+                items = data['items']
+                if power_plant_id:
+                    capabilities.record(power_plant_id, 'data', True)
                 
-                # Response yapısını kontrol et - EPIAS website ile aynı format
-                if isinstance(data, dict) and 'items' in data:
-                    items = data['items']
-                    
-                    # Handle pagination like real EPIAS website
-                    page_info = data.get('page', {})
-                    total_records = page_info.get('total', len(items))
-                    current_page = page_info.get('number', 1)
-                    page_size = page_info.get('size', len(items))
-                    
-                    self.logger.info(f"📄 PAGINATION: Page {current_page}, Total records: {total_records}, Page size: {page_size}")
-                    
-                    # Show totals summary if available (like your real data)
-                    if 'totals' in data:
-                        totals = data['totals']
-                        total_total = totals.get('totalTotal', 0)
-                        self.logger.info(f"📊 PERIOD TOTALS: Total energy = {total_total} MWh")
-                        
-                        # Show active energy types from totals
-                        energy_total_fields = ['naturalGasTotal', 'damTotal', 'ligniteTotal', 'riverTotal', 'importedCoalTotal', 
-                                             'sunTotal', 'windTotal', 'biomassTotal', 'geothermalTotal', 'fueloilTotal', 
-                                             'asphaltiteTotal', 'stoneCoalTotal', 'naphtaTotal', 'lngTotal']
-                        active_totals = {k.replace('Total', ''): v for k, v in totals.items() if k in energy_total_fields and v > 0}
-                        if active_totals:
-                            self.logger.info(f"⚡ ACTIVE ENERGY TYPES (Period totals): {active_totals}")
-                    
-                    # If there are more pages, collect all data
-                    all_items = items.copy()
-                    if total_records > len(items):
-                        total_pages = (total_records + page_size - 1) // page_size  # Ceiling division
-                        self.logger.info(f"📚 MULTI-PAGE DETECTED: {total_records} total records across {total_pages} pages")
-                        
-                        for page_num in range(2, total_pages + 1):
-                            page_payload = payload.copy()
-                            page_payload["page"]["number"] = page_num
-                            
-                            self.logger.info(f"📄 Fetching page {page_num}/{total_pages}...")
-                            page_response = self.session.post(url, json=page_payload, headers=headers, timeout=60)
-                            
-                            if page_response.status_code == 200:
-                                page_data = page_response.json()
-                                if isinstance(page_data, dict) and 'items' in page_data:
-                                    page_items = page_data['items']
-                                    all_items.extend(page_items)
-                                    self.logger.info(f"📄 Page {page_num}: Added {len(page_items)} records (Total: {len(all_items)})")
-                                else:
-                                    self.logger.warning(f"⚠️ Page {page_num} unexpected format")
-                                    break
-                            else:
-                                self.logger.error(f"❌ Page {page_num} failed: {page_response.status_code}")
-                                break
-                        
-                        self.logger.info(f"✅ PAGINATION COMPLETE: Collected {len(all_items)} total records")
-                    else:
-                        self.logger.info(f"📄 SINGLE PAGE: All {len(items)} records fit on one page")
-                    
-                    items = all_items
-                elif isinstance(data, dict) and 'content' in data:
-                    # Fallback for old format
-                    items = data['content']
-                    self.logger.warning(f"⚠️ Using fallback 'content' format")
-                elif isinstance(data, list):
-                    items = data
-                    self.logger.warning(f"⚠️ Direct list format")
-                else:
-                    items = []
-                    self.logger.warning(f"⚠️ Unknown response format: {type(data)}")
+                # Handle pagination like real EPIAS website
+                page_info = data.get('page', {})
+                total_records = page_info.get('total', len(items))
+                current_page = page_info.get('number', 1)
+                page_size = min(page_info.get('size', payload["page"]["size"]), payload["page"]["size"])
                 
-                self.logger.info(f"✅ {len(items)} kayıt alındı")
-                if items:
-                    self.logger.info(f"🔍 İlk injection record örneği: {items[0]}")
+                self.logger.debug(f"📄 PAGINATION: Page {current_page}, Total records: {total_records}, Page size: {page_size}")
+                
+                # Show totals summary if available (like your real data)
+                if 'totals' in data and self.logger.isEnabledFor(logging.DEBUG):
+                    totals = data['totals']
+                    total_total = totals.get('totalTotal', 0)
+                    self.logger.debug(f"📊 PERIOD TOTALS: Total energy = {total_total} MWh")
                     
-                    # Detailed analysis of data structure
-                    first_record = items[0]
-                    self.logger.info(f"🔍 Record keys: {list(first_record.keys())}")
+                    # Show active energy types from totals
+                    energy_total_fields = ['naturalGasTotal', 'damTotal', 'ligniteTotal', 'riverTotal', 'importedCoalTotal', 
+                                         'sunTotal', 'windTotal', 'biomassTotal', 'geothermalTotal', 'fueloilTotal', 
+                                         'asphaltiteTotal', 'stoneCoalTotal', 'naphtaTotal', 'lngTotal']
+                    active_totals = {k.replace('Total', ''): v for k, v in totals.items() if k in energy_total_fields and v > 0}
+                    if active_totals:
+                        self.logger.debug(f"⚡ ACTIVE ENERGY TYPES (Period totals): {active_totals}")
+                
+                stats['pages'] = 1
+                del data
+                yield items
+                
+                if total_records > len(items):
+                    total_pages = (total_records + page_size - 1) // page_size  # Ceiling division
+                    self.logger.debug(f"📚 MULTI-PAGE DETECTED: {total_records} total records across {total_pages} pages")
+                    stats['pages'] = total_pages
                     
-                    # Analyze data structure to understand if this is individual or aggregate data
-                    if 'total' in first_record:
-                        total_value = first_record.get('total')
-                        self.logger.info(f"📊 DATA ANALYSIS: 'total' field found = {total_value}")
-                        
-                        # Check if this is individual plant data (only one energy type has values) vs aggregate (multiple types)
-                        energy_fields = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'biomass', 'geothermal', 'fueloil', 'asphaltite', 'stoneCoal', 'naphtha', 'lng']
-                        non_zero_fields = [field for field in energy_fields if field in first_record and first_record.get(field, 0) > 0]
-                        
-                        if len(non_zero_fields) == 0:
-                            self.logger.info(f"💤 ZERO PRODUCTION: Plant has no energy production in this time period")
-                        elif len(non_zero_fields) == 1:
-                            energy_type = non_zero_fields[0]
-                            self.logger.info(f"✅ INDIVIDUAL PLANT DATA: Single energy type '{energy_type}' = {first_record.get(energy_type)}")
-                            self.logger.info(f"✅ This appears to be individual power plant data (single energy source)")
+                    # Sayfalar sırasıyla üretilir; başarısız sayfa sonrakileri kesmez
+                    missing_pages = []
+                    collected = len(items)
+                    del items
+                    for page_num, page_items in self._iter_pages_prefetched(url, payload, headers, list(range(2, total_pages + 1))):
+                        if page_items is None:
+                            missing_pages.append(page_num)
+                            stats['failed'] = True
                         else:
-                            self.logger.warning(f"⚠️ MULTIPLE ENERGY TYPES: {non_zero_fields}")
-                            if power_plant_id:
-                                self.logger.warning(f"⚠️ Requested specific plant {power_plant_id} but got multiple energy types")
-                                self.logger.warning(f"⚠️ This might be aggregate data or a multi-source plant")
-                            else:
-                                self.logger.info(f"📊 Expected: Multiple energy types for aggregate Turkey data")
-                        
-                        # Show energy breakdown for clarity
-                        energy_breakdown = {field: first_record.get(field, 0) for field in energy_fields if field in first_record}
-                        non_zero_breakdown = {k: v for k, v in energy_breakdown.items() if v > 0}
-                        self.logger.info(f"⚡ ENERGY BREAKDOWN: {non_zero_breakdown}")
-                        
-                        if power_plant_id:
-                            self.logger.info(f"🎯 PLANT {power_plant_id} ANALYSIS: Total={total_value}, Active sources={len(non_zero_fields)}")
-                        else:
-                            self.logger.info(f"🌍 AGGREGATE DATA ANALYSIS: Total={total_value}, Active sources={len(non_zero_fields)}")
+                            collected += len(page_items)
+                            yield page_items
                     
-                    if 'powerPlantId' in first_record:
-                        plant_id_in_data = first_record.get('powerPlantId')
-                        self.logger.info(f"✅ Individual plant data: powerPlantId = {plant_id_in_data}")
-                        if power_plant_id and str(plant_id_in_data) != str(power_plant_id):
-                            self.logger.warning(f"⚠️ Plant ID mismatch! Requested: {power_plant_id}, Got: {plant_id_in_data}")
-                    elif 'organizationId' in first_record:
-                        org_id_in_data = first_record.get('organizationId')
-                        self.logger.info(f"✅ Individual plant data: organizationId = {org_id_in_data}")
-                        if power_plant_id and str(org_id_in_data) != str(power_plant_id):
-                            self.logger.warning(f"⚠️ Organization ID mismatch! Requested: {power_plant_id}, Got: {org_id_in_data}")
-                    else:
-                        self.logger.warning(f"⚠️ No plant identifier found in record - this might be aggregate data")
-                        
-                    # Show more sample records to understand the pattern
-                    if len(items) > 1:
-                        self.logger.info(f"🔍 İkinci record örneği: {items[1]}")
-                    if len(items) > 2:
-                        self.logger.info(f"🔍 Üçüncü record örneği: {items[2]}")
-                        
-                return items
+                    if missing_pages:
+                        self.logger.error(f"❌ PAGINATION INCOMPLETE: Pages {missing_pages} could not be fetched after retries")
+                    self.logger.debug(f"✅ PAGINATION COMPLETE: Collected {collected} total records")
+                else:
+                    self.logger.debug(f"📄 SINGLE PAGE: All {len(items)} records fit on one page")
+            elif isinstance(data, dict) and 'content' in data:
+                # Fallback for old format
+                self.logger.warning(f"⚠️ Using fallback 'content' format")
+                stats['pages'] = 1
+                yield data['content']
+            elif isinstance(data, list):
+                self.logger.warning(f"⚠️ Direct list format")
+                stats['pages'] = 1
+                yield data
             else:
-                self.logger.error(f"❌ Veri alınamadı: {response.status_code}")
-                self.logger.error(f"❌ Response Text: {response.text}")
-                return []
+                self.logger.warning(f"⚠️ Unknown response format: {type(data)}")
                 
         except Exception as e:
             self.logger.error(f"❌ Veri alma hatası: {e}")
-            return []
+            stats['failed'] = True
+            stats['timed_out'] = isinstance(e, requests.Timeout)
+            stats['circuit_open'] = isinstance(e, CircuitOpenError)
+    
+    def _get_cached_page_size(self, url: str) -> Optional[int]:
+        """Endpoint için daha önce bulunmuş sayfa boyutunu döndür"""
+        with EpiasExtractor._page_size_lock:
+            return EpiasExtractor._page_size_cache.get(url)
+    
+    def _invalidate_page_size(self, url: str, rejected_size: int):
+        """Endpoint için cache'lenmiş sayfa boyutunu sil (başka thread yenisini bulduysa dokunma)"""
+        with EpiasExtractor._page_size_lock:
+            if EpiasExtractor._page_size_cache.get(url) == rejected_size:
+                del EpiasExtractor._page_size_cache[url]
+    
+    def _is_page_size_rejection(self, response: requests.Response) -> bool:
+        """Cevap sayfa boyutunun reddi mi? Evetse gövde tüketilip bağlantı bırakılır
+        
+        413 her zaman red sayılır; 400/422 ise yalnızca gövde sayfa boyutundan
+        bahsediyorsa. Diğer hatalar (ör. geçersiz tarih) aday denemeyi tetiklemez.
+        """
+        if response.status_code not in PAGE_SIZE_REJECTED_STATUSES:
+            return False
+        if response.status_code != 413:
+            try:
+                body = response.text[:1000]
+            except requests.RequestException:
+                body = ''
+            if not PAGE_SIZE_ERROR_PATTERN.search(body):
+                return False
+        self._discard(response)
+        return True
+    
+    def _negotiate_page_size(self, url: str, payload: Dict, headers: Dict) -> Tuple[requests.Response, Optional[Dict]]:
+        """Sunucunun kabul ettiği en büyük sayfa boyutunu bul ve cache'le
+        
+        Adaylar büyükten küçüğe denenir; kabul edilen ilk isteğin cevabı ve (okunmuşsa)
+        parse edilmiş gövdesi 1. sayfa olarak döndürülür, payload'daki sayfa boyutu
+        bulunan değere ayarlanır. Keşif tek seferde bir thread'de yapılır; beklerken
+        başka thread değeri bulduysa keşif yapılmadan o boyutla normal istek gönderilir.
+        """
+        with EpiasExtractor._page_size_negotiation_lock:
+            cached = self._get_cached_page_size(url)
+            if cached is not None:
+                payload["page"]["size"] = cached
+                return self._request('POST', url, json=payload, headers=headers, timeout=60, stream=True), None
+            return self._negotiate_page_size_locked(url, payload, headers)
+    
+    def _negotiate_page_size_locked(self, url: str, payload: Dict, headers: Dict) -> Tuple[requests.Response, Optional[Dict]]:
+        response = None
+        for candidate in PAGE_SIZE_CANDIDATES:
+            payload["page"]["size"] = candidate
+            response = self._request('POST', url, json=payload, headers=headers, timeout=60, stream=True)
+            
+            if self._is_page_size_rejection(response):
+                self.logger.info(f"📏 Page size {candidate} rejected ({response.status_code}), trying smaller...")
+                continue
+            if response.status_code != 200:
+                # Sayfa boyutuyla ilgisiz hata: cache'leme, cevabı olduğu gibi döndür
+                return response, None
+            
+            try:
+                data = self._read_json(response)
+            except (ValueError, requests.RequestException):
+                return response, None
+            
+            accepted = candidate
+            if isinstance(data, dict) and isinstance(data.get('items'), list):
+                page_info = data.get('page') or {}
+                accepted = min(candidate, page_info.get('size', candidate))
+                # Sunucu sessizce kırpıyorsa gerçek sayfa boyutu dönen kayıt sayısıdır
+                total_records = page_info.get('total', len(data['items']))
+                if 0 < len(data['items']) < min(accepted, total_records):
+                    accepted = len(data['items'])
+            
+            payload["page"]["size"] = accepted
+            with EpiasExtractor._page_size_lock:
+                EpiasExtractor._page_size_cache[url] = accepted
+            self.logger.info(f"📏 Page size negotiated for {url}: {accepted}")
+            return response, data
+        
+        # Hiçbir aday kabul edilmedi: varsayılan boyutla normal istek
+        payload["page"]["size"] = DEFAULT_PAGE_SIZE
+        return self._request('POST', url, json=payload, headers=headers, timeout=60, stream=True), None
+    
+    def _fetch_page(self, url: str, payload: Dict, headers: Dict, page_num: int) -> Optional[List[Dict]]:
+        """Tek bir sayfayı çek; geçici hatalar _request içinde sadece bu sayfa için tekrar denenir"""
+        # Paylaşılan payload'ı (ve içindeki 'page' dict'ini) değiştirmemek için derin kopya
+        page_payload = copy.deepcopy(payload)
+        page_payload["page"]["number"] = page_num
+        
+        try:
+            page_response = self._request('POST', url, json=page_payload, headers=headers, timeout=60, stream=True)
+            
+            if page_response.status_code == 200:
+                page_data = self._read_json(page_response)
+                if isinstance(page_data, dict) and 'items' in page_data:
+                    page_items = page_data['items']
+                    self.logger.debug(f"📄 Page {page_num}: {len(page_items)} records")
+                    return page_items
+                self.logger.warning(f"⚠️ Page {page_num} unexpected format")
+            else:
+                self.logger.warning(f"⚠️ Page {page_num} failed: {page_response.status_code}")
+        except (requests.RequestException, CircuitOpenError, ValueError) as e:
+            self.logger.warning(f"⚠️ Page {page_num} hatası: {e}")
+        
+        return None
+    
+    def _iter_pages_prefetched(self, url: str, payload: Dict, headers: Dict,
+                               page_numbers: List[int]) -> Iterator[Tuple[int, Optional[List[Dict]]]]:
+        """Toplam sayfa sayısı bilindikten sonra kalan sayfaları sırayla üret
+        
+        En fazla PAGE_WORKERS sayfa önceden paralel çekilir; bellekte bundan fazla
+        sayfa tutulmaz. Alınamayan sayfa için None üretilir.
+        """
+        if not page_numbers:
+            return
+        
+        self.logger.debug(f"📄 Fetching pages {page_numbers[0]}-{page_numbers[-1]} with {min(PAGE_WORKERS, len(page_numbers))} workers...")
+        
+        remaining = iter(page_numbers)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(page_numbers)))
+        try:
+            for page_num in islice(remaining, PAGE_WORKERS):
+                pending.append((page_num, submit_in_context(executor, self._fetch_page, url, payload, headers, page_num)))
+            while pending:
+                page_num, future = pending.popleft()
+                next_page = next(remaining, None)
+                if next_page is not None:
+                    pending.append((next_page, submit_in_context(executor, self._fetch_page, url, payload, headers, next_page)))
+                yield page_num, future.result()
+        finally:
+            # Tüketici erken bırakırsa henüz başlamamış sayfalar iptal edilir
+            executor.shutdown(wait=True, cancel_futures=True)
     
     def format_date_for_api(self, date_str: str) -> str:
         """Tarihi API formatına çevir (ISO 8601 + timezone)"""
@@ -488,60 +996,383 @@ class EpiasExtractor:
             # Eğer zaten doğru formattaysa, olduğu gibi döndür
             return date_str
     
-    def get_data_for_period(self, start_date: str, end_date: str, chunk_days: int = 30, 
-                           power_plant_id: Optional[str] = None, progress_callback=None) -> Dict[str, any]:
-        """Uzun dönemler için veriyi parçalara bölerek getir"""
-        all_data = []
+    def plan_chunks(self, start_date: str, end_date: str, chunk_days: int) -> List[Tuple[datetime, datetime]]:
+        """Tarih aralığını (başlangıç, bitiş) chunk'larına böl - iki uç da dahil
         
-        try:
-            # String tarihlerini datetime'a çevir
-            current_start = datetime.strptime(start_date, "%Y-%m-%d")
-            final_end = datetime.strptime(end_date, "%Y-%m-%d")
+        Chunk sınırları isteğin başlangıcına göre değil CHUNK_GRID_EPOCH'tan itibaren
+        sabit bir ızgaraya göre belirlenir; böylece kısmen çakışan işler aynı
+        pencereleri ister ve eşzamanlı özdeş istekler birleştirilebilir.
+        """
+        chunks = []
+        current_start = datetime.strptime(start_date, "%Y-%m-%d")
+        final_end = datetime.strptime(end_date, "%Y-%m-%d")
+        span = max(chunk_days, 0) + 1  # bir chunk chunk_days + 1 takvim gününü kapsar
+        
+        while current_start <= final_end:
+            grid_index = (current_start - CHUNK_GRID_EPOCH).days // span
+            current_end = CHUNK_GRID_EPOCH + timedelta(days=(grid_index + 1) * span - 1)
+            if current_end > final_end:
+                current_end = final_end
+            chunks.append((current_start, current_end))
+            current_start = current_end + timedelta(days=1)
+        
+        return chunks
+    
+    def _fetch_chunk_with_stats(self, chunk: Tuple[datetime, datetime], power_plant_id: Optional[str],
+                                page_size: Optional[int] = None) -> Tuple[ColumnarRecordBuffer, Dict]:
+        """Chunk'ı çek, süre ve sayfa istatistiğiyle birlikte döndür
+        
+        Kayıtlar chunk tamamlanır tamamlanmaz sütun bazlı tampona alınır; uzun
+        dönemlerde dict listeleri bellekte birikmez.
+        """
+        chunk_start = self.format_date_for_api(chunk[0].strftime('%Y-%m-%d'))
+        chunk_end = self.format_date_for_api(chunk[1].strftime('%Y-%m-%d'))
+        stats = {}
+        started = time.monotonic()
+        items = self.get_injection_quantity_data(chunk_start, chunk_end, power_plant_id,
+                                                 page_size=page_size, stats=stats)
+        stats['elapsed'] = time.monotonic() - started
+        buffer = ColumnarRecordBuffer(items)
+        if buffer.skipped:
+            self.logger.warning(f"⚠️ {chunk[0]:%Y-%m-%d} - {chunk[1]:%Y-%m-%d}: tarihi okunamayan "
+                                f"{buffer.skipped} kayıt atlandı")
+        return buffer, stats
+    
+    def _fetch_chunks_sequentially(self, chunks: List[Tuple[datetime, datetime]], power_plant_id: Optional[str],
+                                   progress_callback=None,
+                                   page_size: Optional[int] = None) -> Tuple[List[ColumnarRecordBuffer], List[Tuple[datetime, datetime]]]:
+        """Chunk'ları sırayla çek (varsayılan mod)"""
+        chunk_results = []
+        failed_chunks = []
+        total_span = sum((chunk[1] - chunk[0]).days + 1 for chunk in chunks)
+        processed_span = 0
+        
+        for chunk in chunks:
+            # Progress callback
+            progress = (processed_span / total_span) * 100 if total_span > 0 else 0
+            processed_span += (chunk[1] - chunk[0]).days + 1
+            if progress_callback:
+                progress_callback(progress, chunk[0].strftime('%Y-%m-%d'), chunk[1].strftime('%Y-%m-%d'))
             
-            total_days = (final_end - current_start).days
-            processed_days = 0
+            self.logger.info(f"📈 İlerleme: %{progress:.1f} - {chunk[0].strftime('%Y-%m-%d')} - {chunk[1].strftime('%Y-%m-%d')}")
             
-            while current_start < final_end:
-                # Chunk hesapla
-                current_end = current_start + timedelta(days=chunk_days)
-                if current_end > final_end:
-                    current_end = final_end
-                
-                # API formatına çevir
-                chunk_start = self.format_date_for_api(current_start.strftime('%Y-%m-%d'))
-                chunk_end = self.format_date_for_api(current_end.strftime('%Y-%m-%d'))
+            # Veri çek (istek hızı paylaşılan rate limiter ile sınırlanır)
+            items, stats = self._fetch_chunk_with_stats(chunk, power_plant_id, page_size)
+            chunk_results.append(items)
+            if stats['failed']:
+                failed_chunks.append(chunk)
+        
+        return chunk_results, failed_chunks
+    
+    def _fetch_chunks_concurrently(self, chunks: List[Tuple[datetime, datetime]], power_plant_id: Optional[str],
+                                   max_workers: int, progress_callback=None,
+                                   page_size: Optional[int] = None) -> Tuple[List[ColumnarRecordBuffer], List[Tuple[datetime, datetime]]]:
+        """Chunk'ları sınırlı sayıda worker ile paralel çek, sonuçları chunk sırasıyla döndür"""
+        chunk_results: List[ColumnarRecordBuffer] = [ColumnarRecordBuffer() for _ in chunks]
+        failed_indexes = []
+        chunk_spans = [(chunk[1] - chunk[0]).days + 1 for chunk in chunks]
+        total_span = sum(chunk_spans)
+        completed_span = 0
+        
+        self.logger.info(f"⚡ Paralel mod: {len(chunks)} chunk, {max_workers} worker")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                submit_in_context(executor, self._fetch_chunk_with_stats, chunk, power_plant_id, page_size): index
+                for index, chunk in enumerate(chunks)
+            }
+            
+            # Chunk'lar sırasız tamamlanabilir; ilerleme tamamlanan gün sayısına göre hesaplanır
+            for future in as_completed(futures):
+                index = futures[future]
+                chunk_results[index], stats = future.result()
+                if stats['failed']:
+                    failed_indexes.append(index)
+                completed_span += chunk_spans[index]
                 
-                # Progress callback
-                progress = (processed_days / total_days) * 100 if total_days > 0 else 0
+                progress = (completed_span / total_span) * 100 if total_span > 0 else 0
+                chunk_start, chunk_end = chunks[index]
                 if progress_callback:
-                    progress_callback(progress, current_start.strftime('%Y-%m-%d'), current_end.strftime('%Y-%m-%d'))
+                    progress_callback(progress, chunk_start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d'))
                 
-                self.logger.info(f"📈 İlerleme: %{progress:.1f} - {current_start.strftime('%Y-%m-%d')} - {current_end.strftime('%Y-%m-%d')}")
+                self.logger.info(f"📈 İlerleme: %{progress:.1f} - {chunk_start.strftime('%Y-%m-%d')} - {chunk_end.strftime('%Y-%m-%d')} tamamlandı ({len(chunk_results[index])} kayıt)")
+        
+        return chunk_results, [chunks[index] for index in sorted(failed_indexes)]
+    
+    def _fetch_chunks_adaptively(self, ranges: List[Tuple[datetime, datetime]], chunk_days: int,
+                                 power_plant_id: Optional[str], max_workers: int, progress_callback=None,
+                                 page_size: Optional[int] = None) -> Tuple[List[ColumnarRecordBuffer], List[Tuple[datetime, datetime]], List[int]]:
+        """Chunk boyutunu gecikme ve sayfa sayısına göre ayarlayarak veriyi çek
+        
+        ranges sırayla çekilecek (başlangıç, bitiş) gün aralıklarıdır. Hızlı ve tek
+        sayfalık cevaplarda pencere büyür; yavaş, timeout olan veya çok sayfalı
+        cevaplarda küçülür. Başarısız pencere küçülen boyutla tekrar denenir.
+        """
+        sizer = AdaptiveChunkSizer(chunk_days)
+        total_span = max(sum((end - start).days + 1 for start, end in ranges), 1)
+        completed_span = 0
+        
+        results: Dict[datetime, ColumnarRecordBuffer] = {}
+        chunk_sizes: List[int] = []
+        failed_chunks: List[Tuple[datetime, datetime]] = []
+        retry_windows: List[Tuple[datetime, datetime]] = []
+        pending = {}
+        remaining_ranges = list(ranges)
+        
+        def next_window() -> Optional[Tuple[datetime, datetime]]:
+            if retry_windows:
+                return retry_windows.pop(0)
+            if not remaining_ranges:
+                return None
+            range_start, range_end = remaining_ranges[0]
+            window_end = min(range_start + timedelta(days=sizer.current_days), range_end)
+            if window_end < range_end:
+                remaining_ranges[0] = (window_end + timedelta(days=1), range_end)
+            else:
+                remaining_ranges.pop(0)
+            return range_start, window_end
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                while len(pending) < max_workers:
+                    window = next_window()
+                    if window is None:
+                        break
+                    future = submit_in_context(executor, self._fetch_chunk_with_stats, window, power_plant_id, page_size)
+                    pending[future] = window
                 
-                # Veri çek
-                chunk_data = self.get_injection_quantity_data(chunk_start, chunk_end, power_plant_id)
-                all_data.extend(chunk_data)
+                if not pending:
+                    break
                 
-                # Sonraki chunk'a geç
-                current_start = current_end + timedelta(days=1)
-                processed_days = (current_start - datetime.strptime(start_date, "%Y-%m-%d")).days
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    window = pending.pop(future)
+                    items, stats = future.result()
+                    window_days = (window[1] - window[0]).days
+                    new_days = sizer.record(stats['elapsed'], stats['pages'], stats['failed'], stats['timed_out'])
+                    
+                    if stats['failed'] and window_days > sizer.current_days:
+                        # Pencereyi küçülen boyutla parçalara bölüp yeniden dene
+                        self.logger.warning(f"⚠️ Chunk {window[0].strftime('%Y-%m-%d')} - {window[1].strftime('%Y-%m-%d')} failed, retrying with {sizer.current_days} day chunks")
+                        retry_start = window[0]
+                        while retry_start <= window[1]:
+                            retry_end = min(retry_start + timedelta(days=sizer.current_days), window[1])
+                            retry_windows.append((retry_start, retry_end))
+                            retry_start = retry_end + timedelta(days=1)
+                        continue
+                    
+                    results[window[0]] = items
+                    chunk_sizes.append(window_days)
+                    if stats['failed']:
+                        failed_chunks.append(window)
+                    completed_span += window_days + 1
+                    
+                    progress = min(completed_span / total_span * 100, 100)
+                    if progress_callback:
+                        progress_callback(progress, window[0].strftime('%Y-%m-%d'), window[1].strftime('%Y-%m-%d'),
+                                          chunk_days=window_days)
+                    
+                    self.logger.info(f"📈 İlerleme: %{progress:.1f} - {window[0].strftime('%Y-%m-%d')} - {window[1].strftime('%Y-%m-%d')} "
+                                     f"({window_days} gün, {stats['pages']} sayfa, {stats['elapsed']:.1f}s) -> sonraki chunk {new_days} gün")
+        
+        return [results[start] for start in sorted(results)], sorted(failed_chunks), chunk_sizes
+    
+    def iter_injection_quantity(self, start_date: str, end_date: str, power_plant_id: Optional[str] = None,
+                                chunk_days: int = 30, page_size: Optional[int] = None, batches: bool = False,
+                                use_cache: bool = True, stats: Optional[Dict] = None,
+                                progress_callback=None) -> Iterator:
+        """Dönemin kayıtlarını EPIAS'tan geldikçe kronolojik sırayla üret
+        
+        Dönem bellekte toplanmaz; aynı anda en fazla birkaç sayfa tutulur. batches=True
+        ise kayıtlar yerine sayfalar (kayıt listeleri) üretilir. use_cache=True iken
+        yerel cache'te bulunan günler diskten okunur, çekilen sayfalar cache'e yazılır.
+        stats verilirse 'records', 'pages' ve 'failed_periods' güncellenir; alınamayan
+        dönem, ondan sonraki ilk sayfa üretilmeden önce failed_periods'a eklenir.
+        progress_callback(progress, start, end) her chunk bittiğinde çağrılır.
+        """
+        stats = {} if stats is None else stats
+        stats.update({'records': 0, 'pages': 0, 'failed_periods': []})
+        
+        period_start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        period_end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        total_days = (period_end - period_start).days + 1
+        
+        def report(start, end):
+            if progress_callback:
+                progress_callback(((end - period_start).days + 1) / total_days * 100,
+                                  start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+        
+        store = get_data_store() if use_cache else None
+        metrics = get_metrics()
+        plant_key = plant_key_for(power_plant_id)
+        
+        if store is not None:
+            missing = store.missing_ranges(plant_key, period_start, period_end)
+            covered = subtract_ranges([(period_start, period_end)], missing)
+            segments = sorted([(start, end, False) for start, end in missing] +
+                              [(start, end, True) for start, end in covered])
+        else:
+            segments = [(period_start, period_end, False)]
+        
+        for segment_start, segment_end, cached in segments:
+            if cached:
+                records = store.iter_records(plant_key, segment_start, segment_end)
+                while True:
+                    batch = list(islice(records, STREAM_BATCH_RECORDS))
+                    if not batch:
+                        break
+                    stats['records'] += len(batch)
+                    if batches:
+                        yield batch
+                    else:
+                        yield from batch
+                report(segment_start, segment_end)
+                continue
+            
+            for chunk_start, chunk_end in self.plan_chunks(segment_start.isoformat(), segment_end.isoformat(), chunk_days):
+                period = {'start': chunk_start.strftime('%Y-%m-%d'), 'end': chunk_end.strftime('%Y-%m-%d')}
+                chunk_stats = {'pages': 0, 'failed': False, 'timed_out': False}
+                pages = self._iter_injection_pages(self.format_date_for_api(period['start']),
+                                                   self.format_date_for_api(period['end']),
+                                                   power_plant_id, page_size, chunk_stats)
+                for page in pages:
+                    metrics.pages_fetched.inc()
+                    metrics.records_fetched.inc(len(page))
+                    count('pages')
+                    count('records', len(page))
+                    if chunk_stats['failed'] and period not in stats['failed_periods']:
+                        stats['failed_periods'].append(period)
+                    if store is not None:
+                        store.save(plant_key, page, [])
+                    stats['records'] += len(page)
+                    if batches:
+                        yield page
+                    else:
+                        yield from page
                 
-                # API'ye yük bindirmemek için bekle
-                time.sleep(1)
+                stats['pages'] += chunk_stats['pages']
+                if chunk_stats['failed']:
+                    if period not in stats['failed_periods']:
+                        stats['failed_periods'].append(period)
+                    self.logger.error(f"❌ {period['start']} - {period['end']} tam alınamadı")
+                elif store is not None:
+                    store.save(plant_key, [], [(chunk_start.date(), chunk_end.date())])
+                report(chunk_start.date(), chunk_end.date())
+    
+    @staticmethod
+    def _merge_cached_ranges(store, plant_key: str, fetched: ColumnarRecordBuffer,
+                             cached_ranges: List[Tuple]) -> ColumnarRecordBuffer:
+        """Kronolojik çekilen kayıtların arasına cache'teki gün aralıklarını yerleştir"""
+        merged = ColumnarRecordBuffer()
+        timestamps = fetched.timestamps
+        position = 0
+        for range_start, range_end in cached_ranges:
+            split = bisect_left(timestamps, day_start_timestamp(range_start), position)
+            merged.extend(fetched.slice(position, split))
+            merged.extend(store.iter_records(plant_key, range_start, range_end))
+            position = split
+        merged.extend(fetched.slice(position, len(fetched)))
+        merged.skipped += fetched.skipped
+        return merged
+    
+    def get_data_for_period(self, start_date: str, end_date: str, chunk_days: int = 30, 
+                           power_plant_id: Optional[str] = None, progress_callback=None,
+                           max_workers: int = 1, page_size: Optional[int] = None,
+                           adaptive: bool = False, use_cache: bool = True) -> Dict[str, any]:
+        """Uzun dönemler için veriyi parçalara bölerek getir
+        
+        max_workers > 1 ise chunk'lar paralel çekilir (en fazla MAX_CHUNK_WORKERS),
+        sonuçlar yine kronolojik sırada döner. page_size verilirse sayfa boyutu
+        keşfi yapılmaz, tüm istekler bu boyutla gönderilir. adaptive=True ise
+        chunk_days başlangıç boyutudur; pencere cevap süresine ve sayfa sayısına göre
+        büyür/küçülür ve seçilen boyut progress_callback'e chunk_days olarak iletilir.
+        use_cache=True iken yerel veri cache'inde eksiksiz bulunan günler EPIAS'tan
+        tekrar çekilmez; yalnızca eksik alt aralıklar indirilir.
+        """
+        try:
+            # String tarihlerini datetime'a çevir
+            period_start = datetime.strptime(start_date, "%Y-%m-%d")
+            period_end = datetime.strptime(end_date, "%Y-%m-%d")
+            total_days = (period_end - period_start).days
+            
+            store = get_data_store() if use_cache else None
+            plant_key = plant_key_for(power_plant_id)
+            if store is not None:
+                missing = store.missing_ranges(plant_key, period_start.date(), period_end.date())
+                ranges = [(datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()))
+                          for start, end in missing]
+                cached_days = (total_days + 1) - sum((end - start).days + 1 for start, end in ranges)
+                self.logger.info(f"💾 Yerel cache: {cached_days} gün cache'te, {len(ranges)} eksik aralık EPIAS'tan çekilecek")
+            else:
+                ranges = [(period_start, period_end)]
+            
+            chunks = [chunk for range_start, range_end in ranges
+                      for chunk in self.plan_chunks(range_start.strftime('%Y-%m-%d'), range_end.strftime('%Y-%m-%d'), chunk_days)]
+            chunk_sizes = None
+            
+            max_workers = max(1, min(int(max_workers or 1), MAX_CHUNK_WORKERS))
+            if not chunks:
+                chunk_results, failed_chunks = [], []
+            elif adaptive:
+                chunk_results, failed_chunks, chunk_sizes = self._fetch_chunks_adaptively(ranges, chunk_days, power_plant_id,
+                                                                           max_workers, progress_callback, page_size)
+            elif max_workers > 1 and len(chunks) > 1:
+                chunk_results, failed_chunks = self._fetch_chunks_concurrently(chunks, power_plant_id, max_workers,
+                                                                progress_callback, page_size)
+            else:
+                chunk_results, failed_chunks = self._fetch_chunks_sequentially(chunks, power_plant_id,
+                                                                progress_callback, page_size)
+            
+            all_data = ColumnarRecordBuffer()
+            for chunk_data in chunk_results:
+                all_data.extend(chunk_data)
+            chunk_count = len(chunk_results)
+            del chunk_results
+            
+            if store is not None:
+                # Yalnızca başarıyla çekilen aralıklar kapsanmış sayılır
+                fetched_ranges = subtract_ranges([(start.date(), end.date()) for start, end in ranges],
+                                                 [(start.date(), end.date()) for start, end in failed_chunks])
+                store.save(plant_key, all_data, fetched_ranges)
+                # Çekilen kayıtlar olduğu gibi döner; diskten yalnızca zaten kapsanmış günler okunur
+                cached_ranges = subtract_ranges([(period_start.date(), period_end.date())],
+                                                [(start.date(), end.date()) for start, end in ranges])
+                fetched_count = len(all_data)
+                if cached_ranges:
+                    all_data = self._merge_cached_ranges(store, plant_key, all_data, cached_ranges)
+                self.logger.info(f"💾 {fetched_count} kayıt EPIAS'tan, {len(all_data) - fetched_count} kayıt yerel cache'ten")
             
             self.logger.info(f"🎉 Toplam {len(all_data)} kayıt alındı")
             
-            return {
-                'success': True,
-                'message': f'Toplam {len(all_data)} kayıt alındı',
+            # Tekrar denemelere rağmen alınamayan dönemler sessizce atlanmaz
+            failed_periods = [
+                {'start': chunk[0].strftime('%Y-%m-%d'), 'end': chunk[1].strftime('%Y-%m-%d')}
+                for chunk in failed_chunks
+            ]
+            message = f'Toplam {len(all_data)} kayıt alındı'
+            if failed_periods:
+                message += f' - {len(failed_periods)} dönem alınamadı'
+                self.logger.error(f"❌ Alınamayan dönemler: {failed_periods}")
+            
+            result = {
+                'success': not (failed_periods and len(failed_periods) == chunk_count),
+                'message': message,
                 'data': all_data,
                 'count': len(all_data),
+                'failed_periods': failed_periods,
                 'period': {
                     'start_date': start_date,
                     'end_date': end_date,
                     'total_days': total_days
                 }
             }
+            if chunk_sizes is not None:
+                result['chunk_sizes'] = chunk_sizes
+            if store is not None:
+                result['fetched_periods'] = [
+                    {'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')} for start, end in ranges
+                ]
+            return result
             
         except Exception as e:
             self.logger.error(f"❌ Veri çekme hatası: {e}")
@@ -552,15 +1383,255 @@ class EpiasExtractor:
                 'count': 0
             }
     
+    def get_data_for_plants(self, power_plant_ids: List[str], start_date: str, end_date: str,
+                            chunk_days: int = 30, max_workers: int = 4, page_size: Optional[int] = None,
+                            use_cache: bool = True, progress_callback=None) -> Dict[str, any]:
+        """Birden çok santralin verisini tek iş olarak getir
+        
+        Tüm santrallerin (santral, chunk) görevleri tek seferde planlanır ve ortak bir
+        worker havuzunda round-robin sırayla çalıştırılır; büyük bir santral diğerlerini
+        sırasının sonuna itmez. Yerel cache açıksa her santral için yalnızca eksik
+        aralıklar çekilir. progress_callback(progress, plants) genel yüzdeyi ve
+        santral bazında durumu alır.
+        """
+        power_plant_ids = list(dict.fromkeys(str(plant_id) for plant_id in power_plant_ids))
+        try:
+            period_start = datetime.strptime(start_date, "%Y-%m-%d")
+            period_end = datetime.strptime(end_date, "%Y-%m-%d")
+        except ValueError as e:
+            return {'success': False, 'message': f'Geçersiz tarih: {e}', 'plants': {}, 'count': 0}
+        
+        store = get_data_store() if use_cache else None
+        queues: Dict[str, deque] = {}
+        plants: Dict[str, Dict] = {}
+        for plant_id in power_plant_ids:
+            if store is not None:
+                ranges = [(datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()))
+                          for start, end in store.missing_ranges(plant_key_for(plant_id), period_start.date(), period_end.date())]
+            else:
+                ranges = [(period_start, period_end)]
+            chunks = [chunk for range_start, range_end in ranges
+                      for chunk in self.plan_chunks(range_start.strftime('%Y-%m-%d'), range_end.strftime('%Y-%m-%d'), chunk_days)]
+            queues[plant_id] = deque(chunks)
+            plants[plant_id] = {
+                'status': 'pending' if chunks else 'completed',
+                'total_chunks': len(chunks),
+                'completed_chunks': 0,
+                'progress': 0 if chunks else 100,
+                'ranges': ranges,
+                'results': {},
+                'failed_chunks': []
+            }
+        
+        total_chunks = sum(plant['total_chunks'] for plant in plants.values())
+        max_workers = max(1, min(int(max_workers or 1), MAX_CHUNK_WORKERS))
+        self.logger.info(f"🏭 Toplu iş: {len(power_plant_ids)} santral, {total_chunks} chunk, {max_workers} worker")
+        
+        def progress_view() -> Dict[str, Dict]:
+            return {plant_id: {key: plant[key] for key in ('status', 'total_chunks', 'completed_chunks', 'progress')}
+                    for plant_id, plant in plants.items()}
+        
+        rotation = deque(plant_id for plant_id in power_plant_ids if queues[plant_id])
+        
+        def next_task() -> Optional[Tuple[str, Tuple[datetime, datetime]]]:
+            # Round-robin: sırası gelen santralin bir sonraki chunk'ı, santral sıranın sonuna geçer
+            while rotation:
+                plant_id = rotation.popleft()
+                queue = queues[plant_id]
+                if queue:
+                    chunk = queue.popleft()
+                    if queue:
+                        rotation.append(plant_id)
+                    return plant_id, chunk
+            return None
+        
+        completed = 0
+        pending = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                while len(pending) < max_workers:
+                    task = next_task()
+                    if task is None:
+                        break
+                    plant_id, chunk = task
+                    plants[plant_id]['status'] = 'running'
+                    pending[submit_in_context(executor, self._fetch_chunk_with_stats, chunk, plant_id, page_size)] = task
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    plant_id, chunk = pending.pop(future)
+                    plant = plants[plant_id]
+                    try:
+                        items, stats = future.result()
+                        failed = stats['failed']
+                    except Exception as e:
+                        self.logger.error(f"❌ Santral {plant_id} chunk {chunk[0].strftime('%Y-%m-%d')} hatası: {e}")
+                        items, failed = ColumnarRecordBuffer(), True
+                    plant['results'][chunk[0]] = items
+                    if failed:
+                        plant['failed_chunks'].append(chunk)
+                    plant['completed_chunks'] += 1
+                    plant['progress'] = plant['completed_chunks'] / plant['total_chunks'] * 100
+                    if plant['completed_chunks'] == plant['total_chunks']:
+                        plant['status'] = 'failed' if len(plant['failed_chunks']) == plant['total_chunks'] else 'completed'
+                    completed += 1
+                    
+                    progress = completed / total_chunks * 100
+                    self.logger.info(f"📈 İlerleme: %{progress:.1f} - santral {plant_id} {chunk[0].strftime('%Y-%m-%d')} - "
+                                     f"{chunk[1].strftime('%Y-%m-%d')} ({plant['completed_chunks']}/{plant['total_chunks']})")
+                    if progress_callback:
+                        progress_callback(progress, progress_view())
+        
+        results = {}
+        for plant_id, plant in plants.items():
+            data = ColumnarRecordBuffer()
+            for start in sorted(plant['results']):
+                data.extend(plant['results'].pop(start))
+            failed_chunks = sorted(plant['failed_chunks'])
+            if store is not None:
+                plant_key = plant_key_for(plant_id)
+                fetched_ranges = subtract_ranges([(start.date(), end.date()) for start, end in plant['ranges']],
+                                                 [(start.date(), end.date()) for start, end in failed_chunks])
+                store.save(plant_key, data, fetched_ranges)
+                # get_data_for_period gibi: çekilen kayıtlar olduğu gibi döner, diskten yalnızca kapsanmış günler okunur
+                cached_ranges = subtract_ranges([(period_start.date(), period_end.date())],
+                                                [(start.date(), end.date()) for start, end in plant['ranges']])
+                if cached_ranges:
+                    data = self._merge_cached_ranges(store, plant_key, data, cached_ranges)
+            results[plant_id] = {
+                'success': plant['status'] != 'failed',
+                'count': len(data),
+                'data': data,
+                'failed_periods': [{'start': start.strftime('%Y-%m-%d'), 'end': end.strftime('%Y-%m-%d')}
+                                   for start, end in failed_chunks]
+            }
+        
+        total_records = sum(result['count'] for result in results.values())
+        failed_plants = [plant_id for plant_id, result in results.items() if not result['success']]
+        message = f'{len(results)} santral için toplam {total_records} kayıt alındı'
+        if failed_plants:
+            message += f' - {len(failed_plants)} santral alınamadı'
+            self.logger.error(f"❌ Alınamayan santraller: {failed_plants}")
+        self.logger.info(f"🎉 {message}")
+        
+        return {
+            'success': len(failed_plants) < len(results),
+            'message': message,
+            'plants': results,
+            'count': total_records,
+            'failed_plants': failed_plants,
+            'period': {
+                'start_date': start_date,
+                'end_date': end_date,
+                'total_days': (period_end - period_start).days
+            }
+        }
+    
+    def sync_to_now(self, power_plant_id: Optional[str] = None, output_path: Optional[str] = None,
+                    revision_days: Optional[int] = None, since: Optional[str] = None,
+                    chunk_days: int = 30, max_workers: int = 4, progress_callback=None) -> Dict[str, any]:
+        """Artımlı senkronizasyon: son senkronize edilen saatten bugüne kadar olan veriyi ekle
+        
+        Santral için en son yazılan saat yerel cache'te saklanır. Her çalıştırmada o
+        günün revision_days gün gerisinden bugüne kadar çekilir (EPIAS son günleri
+        revize edebilir); çıktı CSV'sinin bu aralığa düşen kuyruğu kesilir ve yeni
+        kayıtlar sona eklenir, dosya baştan üretilmez. İlk çalıştırmada since (yoksa
+        son SYNC_INITIAL_DAYS gün) başlangıç alınır.
+        """
+        store = get_data_store()
+        if store is None:
+            return {
+                'success': False,
+                'message': 'Artımlı senkronizasyon için yerel cache açık olmalı (EPIAS_CACHE_ENABLED)',
+                'appended': 0
+            }
+        
+        plant_key = plant_key_for(power_plant_id)
+        revision_days = SYNC_REVISION_DAYS if revision_days is None else max(0, int(revision_days))
+        output_path = output_path or os.path.join(SYNC_OUTPUT_DIR, f"sync_{plant_key}.csv")
+        today = datetime.now(TR_TIMEZONE).date()
+        
+        state = store.get_sync_state(plant_key)
+        if state and state['output_path'] == output_path and os.path.exists(output_path):
+            last_synced = datetime.fromtimestamp(state['last_ts'], TR_TIMEZONE)
+            fetch_start = last_synced.date() - timedelta(days=revision_days)
+            self.logger.info(f"🔄 Son senkronize saat: {last_synced.isoformat()} - {revision_days} günlük revizyon penceresiyle devam ediliyor")
+        else:
+            if state:
+                self.logger.warning(f"⚠️ Önceki senkronizasyon çıktısı bulunamadı ({state['output_path']}), baştan başlanıyor")
+            fetch_start = datetime.strptime(since, "%Y-%m-%d").date() if since else today - timedelta(days=SYNC_INITIAL_DAYS)
+        fetch_start = min(fetch_start, today)
+        
+        result = self.get_data_for_period(fetch_start.isoformat(), today.isoformat(), chunk_days=chunk_days,
+                                          power_plant_id=power_plant_id, progress_callback=progress_callback,
+                                          max_workers=max_workers, use_cache=False)
+        if not result['success']:
+            return {**result, 'appended': 0, 'output_path': output_path}
+        
+        records = result['data']
+        if result['failed_periods']:
+            # Alınamayan ilk dönemden sonrasını yazma; bir sonraki senkronizasyon oradan devam eder
+            first_failed = min(period['start'] for period in result['failed_periods'])
+            records = [record for record in records if str(record.get('date', '')) < first_failed]
+        
+        timestamps = [ts for ts in (record_timestamp(record) for record in records) if ts is not None]
+        if not timestamps and result['failed_periods']:
+            # Alınamayan dönem fetch_start'tan başlıyorsa hiçbir şey yazılamaz: bu "yeni veri yok" değildir
+            self.logger.error(f"❌ Senkronizasyon ilerleyemedi: {first_failed} itibarıyla veri alınamadı")
+            return {
+                'success': False,
+                'message': f"{first_failed} itibarıyla veri alınamadı ({len(result['failed_periods'])} dönem), hiçbir kayıt eklenmedi",
+                'appended': 0,
+                'output_path': output_path,
+                'failed_periods': result['failed_periods']
+            }
+        if not timestamps:
+            return {
+                'success': True,
+                'message': 'Yeni veri yok',
+                'appended': 0,
+                'output_path': output_path,
+                'failed_periods': result['failed_periods']
+            }
+        
+        replaced = truncate_from(output_path, fetch_start.isoformat())
+        appended = append_records(output_path, records)
+        last_ts = max(timestamps)
+        store.set_sync_state(plant_key, last_ts, output_path)
+        
+        last_synced_hour = datetime.fromtimestamp(last_ts, TR_TIMEZONE).isoformat()
+        self.logger.info(f"✅ Senkronizasyon: {appended} kayıt eklendi ({replaced} revize satır yenilendi), son saat {last_synced_hour}")
+        return {
+            'success': True,
+            'message': f'{appended} kayıt eklendi ({replaced} satır revize edildi)',
+            'appended': appended,
+            'replaced': replaced,
+            'output_path': output_path,
+            'last_synced_hour': last_synced_hour,
+            'period': {'start_date': fetch_start.isoformat(), 'end_date': today.isoformat()},
+            'failed_periods': result['failed_periods']
+        }
+    
     def save_to_excel(self, data: List[Dict], filename: Optional[str] = None, 
-                     include_power_plants: bool = True) -> Dict[str, any]:
-        """Verileri Excel'e kaydet"""
+                     include_power_plants: bool = True, streaming: Optional[bool] = None) -> Dict[str, any]:
+        """Verileri Excel'e kaydet
+        
+        streaming (varsayılan EPIAS_EXCEL_STREAMING, açık) satırları openpyxl write_only
+        moduyla üretildikçe yazar ve özetleri artımlı hesaplar; bellek satır sayısından
+        bağımsızdır. Kapalıyken tüm veri önce DataFrame'e çevrilir. data bir kayıt
+        generator'ı da olabilir (yalnızca streaming modda).
+        """
         if not data:
             return {
                 'success': False,
                 'message': 'Kaydedilecek veri yok',
                 'filepath': None
             }
+        if streaming is None:
+            streaming = EXCEL_STREAMING
         
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -571,48 +1642,21 @@ class EpiasExtractor:
         os.makedirs(output_dir, exist_ok=True)
         filepath = os.path.join(output_dir, filename)
         
+        started = time.monotonic()
         try:
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Ana veri
-                df = pd.DataFrame(data)
-                
-                # Tarih sütunlarını düzelt
-                date_columns = [col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()]
-                for col in date_columns:
-                    try:
-                        df[col] = pd.to_datetime(df[col])
-                        if df[col].dt.tz is not None:
-                            df[col] = df[col].dt.tz_localize(None)
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ {col} sütunu datetime'a çevrilemedi: {e}")
-                        pass
-                
-                df.to_excel(writer, sheet_name='Injection_Data', index=False)
-                
-                # Santral listesi
-                if include_power_plants:
-                    try:
-                        plants_response = self.get_power_plant_list()
-                        if plants_response['success'] and plants_response['data']:
-                            df_plants = pd.DataFrame(plants_response['data'])
-                            df_plants.to_excel(writer, sheet_name='Power_Plants', index=False)
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Santral listesi kaydedilemedi: {e}")
-                
-                # Özet
-                summary_data = self._create_summary(df)
-                df_summary = pd.DataFrame(summary_data)
-                df_summary.to_excel(writer, sheet_name='Özet', index=False)
-                
-                # Günlük özet
-                if 'date' in df.columns and 'total' in df.columns:
-                    try:
-                        daily_summary = df.groupby('date')['total'].agg(['sum', 'mean', 'count']).reset_index()
-                        daily_summary.columns = ['Tarih', 'Günlük_Toplam_MWh', 'Ortalama_Saatlik_MWh', 'Saat_Sayısı']
-                        daily_summary.to_excel(writer, sheet_name='Günlük_Özet', index=False)
-                    except Exception as e:
-                        self.logger.warning(f"⚠️ Günlük özet oluşturulamadı: {e}")
+            if streaming:
+                power_plants = self._power_plants_for_excel() if include_power_plants else None
+                record_count = write_excel_streaming(filepath, data, self.username, power_plants)
+                if not record_count:
+                    return {
+                        'success': False,
+                        'message': 'Kaydedilecek veri yok',
+                        'filepath': None
+                    }
+            else:
+                record_count = self._write_excel_dataframe(filepath, data, include_power_plants)
             
+            get_metrics().excel_duration.observe(time.monotonic() - started)
             file_size = os.path.getsize(filepath) / 1024 / 1024  # MB
             self.logger.info(f"🎉 Excel dosyası kaydedildi: {filepath} ({file_size:.2f} MB)")
             
@@ -622,7 +1666,7 @@ class EpiasExtractor:
                 'filepath': filepath,
                 'filename': filename,
                 'file_size_mb': round(file_size, 2),
-                'record_count': len(data)
+                'record_count': record_count
             }
             
         except Exception as e:
@@ -633,31 +1677,69 @@ class EpiasExtractor:
                 'filepath': None
             }
     
+    def _power_plants_for_excel(self) -> Optional[List[Dict]]:
+        """Excel'deki Power_Plants sayfası için santral listesi (alınamazsa None)"""
+        try:
+            plants_response = self.get_power_plant_list()
+            if plants_response['success'] and plants_response['data']:
+                return plants_response['data']
+        except Exception as e:
+            self.logger.warning(f"⚠️ Santral listesi kaydedilemedi: {e}")
+        return None
+    
+    def _write_excel_dataframe(self, filepath: str, data: List[Dict], include_power_plants: bool) -> int:
+        """Tüm veriyi DataFrame'e çevirip pd.ExcelWriter ile yaz (streaming olmayan mod)"""
+        # Dosya writer kapanırken yazılır; iç fazlar dışında kalan süre 'excel_write'
+        with phase('excel_write'), pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            # Ana veri
+            with phase('dataframe_build'):
+                df = data.to_dataframe() if isinstance(data, ColumnarRecordBuffer) else pd.DataFrame(data)
+            
+            # Tarih sütunlarını düzelt
+            date_columns = [col for col in df.columns if is_date_column(col)]
+            for col in date_columns:
+                try:
+                    with phase('date_conversion'):
+                        df[col] = pd.to_datetime(df[col])
+                        if df[col].dt.tz is not None:
+                            df[col] = df[col].dt.tz_localize(None)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ {col} sütunu datetime'a çevrilemedi: {e}")
+                    pass
+            
+            df.to_excel(writer, sheet_name='Injection_Data', index=False)
+            
+            # Santral listesi
+            if include_power_plants:
+                power_plants = self._power_plants_for_excel()
+                if power_plants:
+                    pd.DataFrame(power_plants).to_excel(writer, sheet_name='Power_Plants', index=False)
+            
+            # Özet
+            with phase('summaries'):
+                summary_data = self._create_summary(df)
+                df_summary = pd.DataFrame(summary_data)
+            df_summary.to_excel(writer, sheet_name='Özet', index=False)
+            
+            # Günlük özet (gün bazında; saatlik tarih sütunu takvim gününe indirgenir)
+            if 'date' in df.columns and 'total' in df.columns:
+                try:
+                    with phase('summaries'):
+                        daily_summary = df.groupby(df['date'].dt.date)['total'].agg(['sum', 'mean', 'count']).reset_index()
+                    daily_summary.columns = DAILY_SUMMARY_COLUMNS
+                    daily_summary.to_excel(writer, sheet_name='Günlük_Özet', index=False)
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Günlük özet oluşturulamadı: {e}")
+        
+        return len(df)
+    
     def _create_summary(self, df: pd.DataFrame) -> List[Dict]:
         """Özet istatistik oluştur"""
-        summary_data = [
-            {"Metrik": "Toplam Kayıt", "Değer": len(df)},
-            {"Metrik": "Tarih Aralığı", "Değer": f"İlk: {df['date'].min()} - Son: {df['date'].max()}" if 'date' in df.columns else "Bilinmiyor"},
-            {"Metrik": "Dosya Oluşturma", "Değer": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
-            {"Metrik": "Kullanıcı", "Değer": self.username}
-        ]
-        
-        # Numerik sütunlar için istatistik
+        has_date = 'date' in df.columns
+        total = None
         if 'total' in df.columns:
-            summary_data.extend([
-                {"Metrik": "Toplam Üretim (MWh)", "Değer": f"{df['total'].sum():,.2f}"},
-                {"Metrik": "Ortalama Saatlik Üretim (MWh)", "Değer": f"{df['total'].mean():,.2f}"},
-                {"Metrik": "Maksimum Saatlik Üretim (MWh)", "Değer": f"{df['total'].max():,.2f}"},
-                {"Metrik": "Minimum Saatlik Üretim (MWh)", "Değer": f"{df['total'].min():,.2f}"}
-            ])
-        
-        # Enerji kaynakları toplamları
-        energy_sources = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'geothermal']
-        for source in energy_sources:
-            if source in df.columns:
-                total_source = df[source].sum()
-                if total_source > 0:
-                    summary_data.append({
-                        "Metrik": f"{source.title()} Toplam (MWh)", 
-                        "Değer": f"{total_source:,.2f}"
-                    }) 
\ No newline at end of file
+            total = {'sum': df['total'].sum(), 'mean': df['total'].mean(),
+                     'max': df['total'].max(), 'min': df['total'].min()}
+        source_totals = {source: df[source].sum() for source in SUMMARY_ENERGY_SOURCES if source in df.columns}
+        return build_summary(len(df), df['date'].min() if has_date else None, df['date'].max() if has_date else None,
+                             total, source_totals, self.username)
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Sabit bellekli (streaming) Excel yazımı
+
+openpyxl write_only modunda satırlar üretildikçe geçici dosyaya yazılır; hücre
+nesneleri bellekte birikmez ve DataFrame kurulmaz. Özet ve günlük özet sayfaları
+satırlar yazılırken artımlı olarak hesaplanır, yani veri bir kez okunur. Çıktı
+save_to_excel'in DataFrame yolundaki sayfalarla aynıdır.
+"""
+
+import logging
+import math
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from phase_timer import phase
+from record_buffer import ColumnarRecordBuffer
+
+EXCEL_MAX_ROWS = 1048576       # başlık dahil sayfa başına satır sınırı
+ROW_BATCH_SIZE = 5000
+# Özet sayfasında toplamı gösterilen kaynaklar
+SUMMARY_ENERGY_SOURCES = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'geothermal']
+DAILY_SUMMARY_COLUMNS = ['Tarih', 'Günlük_Toplam_MWh', 'Ortalama_Saatlik_MWh', 'Saat_Sayısı']
+
+logger = logging.getLogger(__name__)
+
+def is_date_column(name: str) -> bool:
+    lowered = name.lower()
+    return 'date' in lowered or 'time' in lowered
+
+def build_summary(count: int, first, last, total: Optional[Dict[str, float]],
+                  source_totals: Dict[str, float], username: str) -> List[Dict]:
+    """Özet sayfası satırları (DataFrame ve streaming yolu ortak)
+
+    total: 'sum', 'mean', 'max', 'min' ('total' sütunu yoksa None);
+    source_totals: kaynak -> toplam (yalnızca bulunan sütunlar).
+    """
+    summary_data = [
+        {"Metrik": "Toplam Kayıt", "Değer": count},
+        {"Metrik": "Tarih Aralığı", "Değer": f"İlk: {first} - Son: {last}" if first is not None else "Bilinmiyor"},
+        {"Metrik": "Dosya Oluşturma", "Değer": datetime.now().strftime("%Y-%m-%d %H:%M:%S")},
+        {"Metrik": "Kullanıcı", "Değer": username}
+    ]
+    if total is not None:
+        summary_data.extend([
+            {"Metrik": "Toplam Üretim (MWh)", "Değer": f"{total['sum']:,.2f}"},
+            {"Metrik": "Ortalama Saatlik Üretim (MWh)", "Değer": f"{total['mean']:,.2f}"},
+            {"Metrik": "Maksimum Saatlik Üretim (MWh)", "Değer": f"{total['max']:,.2f}"},
+            {"Metrik": "Minimum Saatlik Üretim (MWh)", "Değer": f"{total['min']:,.2f}"}
+        ])
+    for source in SUMMARY_ENERGY_SOURCES:
+        if source_totals.get(source, 0) > 0:
+            summary_data.append({"Metrik": f"{source.title()} Toplam (MWh)", "Değer": f"{source_totals[source]:,.2f}"})
+    return summary_data
+
+def _is_value(value) -> bool:
+    # pandas'taki gibi None ve NaN istatistiklere girmez
+    return value is not None and not (isinstance(value, float) and math.isnan(value))
+
+class SummaryAccumulator:
+    """Özet ve günlük özet istatistiklerini satırlar yazılırken biriktirir"""
+
+    def __init__(self, fields: List[str]):
+        self.fields = fields
+        self.count = 0
+        self.first = None
+        self.last = None
+        self._date_index = fields.index('date') if 'date' in fields else None
+        self._total_index = fields.index('total') if 'total' in fields else None
+        self._sources = [(source, fields.index(source)) for source in SUMMARY_ENERGY_SOURCES if source in fields]
+        self._total = {'sum': 0.0, 'count': 0, 'max': -math.inf, 'min': math.inf}
+        self._source_totals = {source: 0.0 for source, _ in self._sources}
+        # gün -> [toplam, değer sayısı]; bellek kayıt değil gün sayısıyla büyür
+        self._daily: Dict[object, List] = {}
+
+    def add(self, rows: List[tuple]):
+        self.count += len(rows)
+        date_index, total_index = self._date_index, self._total_index
+        total = self._total
+        for row in rows:
+            date = row[date_index] if date_index is not None else None
+            if isinstance(date, datetime):
+                if self.first is None or date < self.first:
+                    self.first = date
+                if self.last is None or date > self.last:
+                    self.last = date
+            if total_index is not None:
+                value = row[total_index]
+                key = date.date() if isinstance(date, datetime) else date
+                day = self._daily.get(key) if key is not None else None
+                if day is None and key is not None:
+                    day = self._daily[key] = [0.0, 0]
+                if _is_value(value):
+                    total['sum'] += value
+                    total['count'] += 1
+                    total['max'] = max(total['max'], value)
+                    total['min'] = min(total['min'], value)
+                    if day is not None:
+                        day[0] += value
+                        day[1] += 1
+            for source, index in self._sources:
+                value = row[index]
+                if _is_value(value):
+                    self._source_totals[source] += value
+
+    def summary_rows(self, username: str) -> List[Dict]:
+        total = None
+        if self._total_index is not None:
+            counted = self._total['count']
+            total = {'sum': self._total['sum'],
+                     'mean': self._total['sum'] / counted if counted else math.nan,
+                     'max': self._total['max'] if counted else math.nan,
+                     'min': self._total['min'] if counted else math.nan}
+        return build_summary(self.count, self.first, self.last, total, self._source_totals, username)
+
+    def daily_rows(self) -> Optional[List[tuple]]:
+        """Günlük özet satırları; 'date' ve 'total' sütunları yoksa None"""
+        if self._date_index is None or self._total_index is None:
+            return None
+        return [(day, day_sum, day_sum / counted if counted else None, counted)
+                for day, (day_sum, counted) in sorted(self._daily.items(), key=lambda item: str(item[0]))]
+
+def _convert_date(value):
+    """'2024-01-01T00:00:00+03:00' -> yerel saatle tz'siz datetime (okunamazsa olduğu gibi)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+def iter_row_batches(data: Iterable[Dict], batch_size: int = ROW_BATCH_SIZE) -> Iterator[Tuple[List[str], List[tuple]]]:
+    """Kayıtları (alanlar, tuple satırları) batch'leri halinde üret
+
+    Tampon verilirse satırlar sütunlardan doğrudan kurulur. Dict kayıtlarda alanlar
+    ilk batch'ten belirlenir; sonradan görülen yeni alanlar yazılamaz (uyarı verilir).
+    """
+    if isinstance(data, ColumnarRecordBuffer):
+        fields = data.fields
+        for rows in data.iter_rows(batch_size):
+            yield fields, rows
+        return
+
+    records = iter(data)
+    fields: Optional[List[str]] = None
+    known = set()
+    date_fields: List[int] = []
+    warned = False
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        if fields is None:
+            fields = list(dict.fromkeys(key for record in batch for key in record))
+            known = set(fields)
+            date_fields = [index for index, name in enumerate(fields) if is_date_column(name)]
+        rows = []
+        for record in batch:
+            row = [record.get(name) for name in fields]
+            for index in date_fields:
+                row[index] = _convert_date(row[index])
+            rows.append(tuple(row))
+            if not warned and not known.issuperset(record):
+                logger.warning(f"⚠️ Excel: ilk kayıtlarda olmayan alanlar yazılmadı: {sorted(set(record) - known)}")
+                warned = True
+        yield fields, rows
+
+def _header(worksheet, names: List[str]) -> List[WriteOnlyCell]:
+    """pandas'ın başlık biçimi: kalın, ince kenarlıklı, ortalanmış"""
+    side = Side(style='thin')
+    cells = []
+    for name in names:
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=side, right=side, top=side, bottom=side)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        cells.append(cell)
+    return cells
+
+def _write_sheet(workbook: Workbook, title: str, header: List[str], rows: Iterable):
+    worksheet = workbook.create_sheet(title)
+    worksheet.append(_header(worksheet, header))
+    for row in rows:
+        worksheet.append(row)
+
+def _discard(workbook: Workbook):
+    """Kaydedilmeyen write_only çalışma kitabının sayfa geçici dosyalarını kapat ve sil"""
+    for worksheet in workbook.worksheets:
+        writer = getattr(worksheet, '_writer', None)
+        if writer is None:
+            continue
+        try:
+            if not worksheet.closed:
+                worksheet.close()
+            if os.path.exists(writer.out):  # save() kaydettiği sayfaların dosyasını zaten siler
+                writer.cleanup()
+        except Exception as e:
+            logger.warning(f"⚠️ Excel geçici dosyası silinemedi: {e}")
+
+def write_excel_streaming(filepath: str, data: Iterable[Dict], username: str,
+                          power_plants: Optional[List[Dict]] = None) -> int:
+    """Kayıtları ve özet sayfalarını sabit bellekle yaz; yazılan kayıt sayısını döndür
+
+    Sayfalar DataFrame yoluyla aynıdır: Injection_Data, Power_Plants (verilirse),
+    Özet ve Günlük_Özet. Kayıt yoksa dosya oluşturulmaz ve 0 döner. Hata olursa
+    (ör. satır sınırı aşıldı) geçici dosyalar ve yarım kalan çıktı silinir.
+    """
+    workbook = Workbook(write_only=True)
+    saving = False
+    try:
+        written = _write_workbook(workbook, data, username, power_plants)
+        if written:
+            saving = True
+            with phase('excel_write'):
+                workbook.save(filepath)
+        else:
+            _discard(workbook)
+        return written
+    except BaseException:
+        _discard(workbook)
+        if saving and os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+
+def _write_workbook(workbook: Workbook, data: Iterable[Dict], username: str,
+                    power_plants: Optional[List[Dict]]) -> int:
+    data_sheet = workbook.create_sheet('Injection_Data')
+    summary = None
+    written = 0
+
+    batches = iter_row_batches(data)
+    while True:
+        with phase('row_build'):
+            batch = next(batches, None)
+        if batch is None:
+            break
+        fields, rows = batch
+        if summary is None:
+            summary = SummaryAccumulator(fields)
+            data_sheet.append(_header(data_sheet, fields))
+        # Batch sayfaya eklenmeden önce kontrol edilir (başlık satırı dahil)
+        if written + len(rows) >= EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel sayfası en fazla {EXCEL_MAX_ROWS - 1} kayıt alabilir "
+                             f"({written + len(rows)}+ kayıt)")
+        written += len(rows)
+        with phase('summaries'):
+            summary.add(rows)
+        with phase('excel_write'):
+            for row in rows:
+                data_sheet.append(row)
+
+    if summary is None:
+        return 0
+
+    with phase('excel_write'):
+        if power_plants:
+            columns = list(dict.fromkeys(key for plant in power_plants for key in plant))
+            _write_sheet(workbook, 'Power_Plants', columns,
+                         ([plant.get(column) for column in columns] for plant in power_plants))
+
+        summary_rows = summary.summary_rows(username)
+        _write_sheet(workbook, 'Özet', ['Metrik', 'Değer'], ([row['Metrik'], row['Değer']] for row in summary_rows))
+
+        daily_rows = summary.daily_rows()
+        if daily_rows is not None:
+            _write_sheet(workbook, 'Günlük_Özet', DAILY_SUMMARY_COLUMNS, daily_rows)
+    return written
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Büyük EPIAS cevapları için artımlı (streaming) JSON okuyucu
+
+Cevabın tamamı önce metne çevrilip sonra parse edilmez; gövde parça parça okunur
+ve 'items' gibi büyük diziler eleman eleman çözülür. Bellekte aynı anda en fazla
+bir okuma parçası ve çözülmüş kayıtlar bulunur.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+# Eleman eleman okunacak dizi anahtarları (EPIAS: data -> 'items', export -> 'content')
+DEFAULT_ARRAY_KEYS = ('items', 'content')
+
+READ_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_NUMBER_CONTINUATION = '.eE+-0123456789'
+
+class _StreamReader:
+    """Byte parçalarından artımlı olarak JSON değerleri çözen yardımcı"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        # json.loads tek çağrıda anahtar string'lerini paylaştırır; eleman eleman
+        # çözerken bunu memo ile biz yaparız (yoksa her kayıt kendi anahtar kopyalarını tutar)
+        memo: Dict[str, str] = {}
+        self._decode = json.JSONDecoder(
+            object_pairs_hook=lambda pairs: {memo.setdefault(key, key): value for key, value in pairs}
+        ).raw_decode
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Bir parça daha oku; veri kalmadıysa False"""
+        if self._eof:
+            return False
+        # Tüketilmiş kısmı at, buffer yalnızca okunmamış veriyi tutsun
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += self._decoder.decode(chunk)
+                return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """Boşlukları atla ve sıradaki karakteri döndür ('' = veri bitti)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON stream: '{char}' bekleniyordu, '{found or 'EOF'}' bulundu")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Sıradaki tam JSON değerini çöz"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Buffer sonunda (ya da '3.' gibi yarım) biten sayı/literal devam ediyor olabilir
+            if (end == len(self._buffer) or self._buffer[end] in _NUMBER_CONTINUATION) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+def iter_json_events(chunks: Iterable[bytes], array_keys: Tuple[str, ...] = DEFAULT_ARRAY_KEYS) -> Iterator[Tuple[str, Optional[str], Any]]:
+    """JSON gövdesini olaylara ayır
+
+    İlk olay ('start', None, 'object' | 'array') olur. Üst seviye nesnede
+    `array_keys` içindeki diziler için her eleman ('item', anahtar, eleman),
+    diğer alanlar için ('member', anahtar, değer) üretilir. Üst seviye dizi ise
+    her eleman ('item', None, eleman) olarak gelir.
+    """
+    reader = _StreamReader(chunks)
+    first = reader.peek()
+
+    if first == '[':
+        yield 'start', None, 'array'
+        yield from (('item', None, item) for item in _iter_array(reader))
+        return
+    if first != '{':
+        yield 'member', None, reader.value()
+        return
+
+    yield 'start', None, 'object'
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.expect('}')
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key in array_keys and reader.peek() == '[':
+            empty = True
+            for item in _iter_array(reader):
+                empty = False
+                yield 'item', key, item
+            if empty:
+                yield 'member', key, []
+        else:
+            yield 'member', key, reader.value()
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect('}')
+        return
+
+def _iter_array(reader: _StreamReader) -> Iterator[Any]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == ',':
+            reader.expect(',')
+            continue
+        reader.expect(']')
+        return
+
+def read_json(chunks: Iterable[bytes], array_keys: Tuple[str, ...] = DEFAULT_ARRAY_KEYS,
+              on_item: Optional[Callable[[str, Any], None]] = None) -> Any:
+    """json.loads eşdeğeri, ama gövde parça parça okunur
+
+    on_item verilirse dizi elemanları listeye eklenmek yerine bu fonksiyona
+    iletilir (dönen dict'te ilgili anahtar boş liste olur).
+    """
+    result: Any = None
+
+    for kind, key, value in iter_json_events(chunks, array_keys):
+        if kind == 'start':
+            result = [] if value == 'array' else {}
+        elif kind == 'member' and key is None:
+            return value
+        elif key is None:
+            if on_item:
+                on_item(None, value)
+            else:
+                result.append(value)
+        elif kind == 'item':
+            items = result.setdefault(key, [])
+            if on_item:
+                on_item(key, value)
+            else:
+                items.append(value)
+        else:
+            result[key] = value
+
+    return result
+
+def read_response_json(response, array_keys: Tuple[str, ...] = DEFAULT_ARRAY_KEYS,
+                       on_item: Optional[Callable[[str, Any], None]] = None) -> Any:
+    """requests.Response gövdesini (gzip/deflate açılmış olarak) artımlı parse et"""
+    return read_json(response.iter_content(chunk_size=READ_CHUNK_SIZE), array_keys, on_item)
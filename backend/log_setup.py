@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Process başına bir kez yapılan logging kurulumu (QueueHandler + QueueListener)
+
+İstek thread'leri kayıtları formatlamadan bir kuyruğa bırakır; mesajın
+formatlanması ve konsola / log dosyasına yazılması arka plandaki listener
+thread'inde yapılır, böylece ne formatlama ne de dosya I/O'su isteği bekletir.
+Seviye LOG_LEVEL ile belirlenir (varsayılan INFO, geçersiz değerde uyarıyla
+INFO); dosya yolu EPIAS_LOG_FILE ile değiştirilebilir (varsayılan
+backend/logs/epias_api.log, çalışma dizinine göre).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_LOG_FILE = 'backend/logs/epias_api.log'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Kaydı olduğu gibi kuyruğa bırakır; msg/args listener thread'inde birleştirilir
+
+    Standart QueueHandler.prepare() kaydı çağıran thread'de formatlar (tembel
+    LogEvent mesajları da orada string'e çevrilirdi). Kuyruk aynı process içinde
+    kaldığı için kaydın pickle edilebilir olması gerekmez.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def _resolve_level(value: str) -> Optional[int]:
+    """'DEBUG' / 'warning' / '20' gibi bir değeri seviyeye çevir; geçersizse None"""
+    value = value.strip().upper()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value)
+    return level if isinstance(level, int) else None
+
+def configure_logging() -> logging.handlers.QueueListener:
+    """Root logger'ı kuyruk üzerinden yazacak şekilde kur; sonraki çağrılar hiçbir şey yapmaz"""
+    global _listener
+    if _listener is not None:
+        return _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        formatter = logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler()]
+
+        # Dosyaya yazılamıyorsa (ör. salt okunur cloud ortamı) yalnızca konsol kullanılır
+        log_file = os.getenv('EPIAS_LOG_FILE', '').strip() or DEFAULT_LOG_FILE
+        try:
+            os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+        except (OSError, PermissionError):
+            pass
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(DeferredQueueHandler(log_queue))
+        level_name = os.getenv('LOG_LEVEL', 'INFO')
+        level = _resolve_level(level_name)
+        root.setLevel(logging.INFO if level is None else level)
+
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # Çıkışta kuyrukta kalan kayıtlar yazılır ve dosya kapatılır
+        atexit.register(listener.stop)
+        _listener = listener
+        if level is None:
+            logging.getLogger(__name__).warning(f"⚠️ Geçersiz LOG_LEVEL={level_name!r}, INFO kullanılıyor")
+    return _listener
+
+def logging_snapshot() -> Dict[str, object]:
+    """Logging kurulumunun durumu (kurulu mu, root seviyesi, listener handler'ları)"""
+    return {
+        'configured': _listener is not None,
+        'level': logging.getLevelName(logging.getLogger().level),
+        'handlers': [type(handler).__name__ for handler in _listener.handlers] if _listener else []
+    }
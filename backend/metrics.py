@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Prometheus text formatında process içi metrikler (counter / gauge / histogram)
+
+Harici bağımlılık yoktur; /api/metrics endpoint'i get_metrics().render() çıktısını
+döner. Metrikler process geneline aittir, gunicorn gibi çok process'li kurulumlarda
+her worker kendi değerlerini raporlar.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Upstream cevap süresi (saniye) ve Excel üretim süresi için histogram sınırları
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+EXCEL_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: label'lar {self.labelnames} olmalı, {tuple(labels)} verildi")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError('counter yalnızca artabilir')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+class Gauge(_Metric):
+    """Artıp azalabilen anlık değer"""
+
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def replace(self, values: Iterable[Tuple[Dict[str, object], float]]):
+        """Tüm label kombinasyonlarını verilenlerle değiştir (scrape anında hesaplanan değerler için)"""
+        new_values = {self._key(labels): float(value) for labels, value in values}
+        with self._lock:
+            self._values = new_values
+
+class Histogram(_Metric):
+    """Kümülatif bucket'lı dağılım (Prometheus histogram)"""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+class MetricsRegistry:
+    """İsimle kayıtlı metrikler ve Prometheus text exposition (0.0.4) çıktısı"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+class EpiasMetrics:
+    """Uygulamanın kullandığı metrikler"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.upstream_latency = r.histogram(
+            'epias_upstream_request_duration_seconds',
+            'EPIAS isteğinin cevap başlıkları gelene kadar geçen süre (deneme başına)', ('endpoint',))
+        self.upstream_requests = r.counter(
+            'epias_upstream_requests_total', 'EPIAS istek denemeleri (HTTP status ya da hata türüne göre)',
+            ('endpoint', 'status'))
+        self.upstream_retries = r.counter(
+            'epias_upstream_retries_total', 'Geçici hata sonrası yapılan tekrar denemeler', ('endpoint',))
+        self.upstream_errors = r.counter(
+            'epias_upstream_errors_total', 'Son denemesi de başarısız olan istekler ve açık circuit reddi',
+            ('endpoint', 'reason'))
+        self.bytes_received = r.counter(
+            'epias_upstream_bytes_received_total', 'Okunan cevap gövdeleri (sıkıştırılmış, kablodaki byte)',
+            ('endpoint',))
+        self.pages_fetched = r.counter('epias_pages_fetched_total', 'Alınan veri sayfaları')
+        self.records_fetched = r.counter('epias_records_fetched_total', 'EPIAS\'tan alınan kayıtlar')
+        self.jobs = r.gauge('epias_jobs', 'Flask veri çekme işleri (duruma göre)', ('status',))
+        self.rate_limiter_waiting = r.gauge(
+            'epias_rate_limiter_queue_depth', 'Rate limiter token\'ı bekleyen upstream istekleri')
+        self.excel_duration = r.histogram(
+            'epias_excel_generation_seconds', 'Excel dosyası üretim süresi', buckets=EXCEL_BUCKETS)
+        self.circuit_open = r.gauge(
+            'epias_circuit_open', 'Endpoint circuit breaker durumu (1 = açık)', ('endpoint',))
+
+    def render(self) -> str:
+        return self.registry.render()
+
+_metrics: Optional[EpiasMetrics] = None
+_metrics_lock = threading.Lock()
+
+def get_metrics() -> EpiasMetrics:
+    """Process genelinde tek metrik seti"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = EpiasMetrics()
+    return _metrics
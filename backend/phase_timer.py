@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+İş (task) başına faz süreleri ve sayaçlar
+
+Bir iş track(timings) içinde çalıştırılır; kod içindeki phase('http_wait') gibi
+bloklar süreyi o işin PhaseTimings nesnesine yazar. Aktif iş contextvars ile
+taşındığı için extractor'a parametre geçirmek gerekmez; iş yoksa phase() ve
+count() hiçbir şey yapmaz.
+
+Fazlar birbirini dışlar: iç içe bir faz başlayınca dıştaki durur, yani Excel
+yazımı sırasındaki santral listesi isteği 'excel_write' değil 'http_wait' olarak
+sayılır. Thread pool'lara gönderilen işler submit_in_context ile gönderilmelidir;
+paralel thread'lerin süreleri toplandığından fazların toplamı duvar saatini
+geçebilir.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+_current: contextvars.ContextVar = contextvars.ContextVar('phase_timings', default=None)
+# [faz adı, sayılmaya başlandığı an]; iç içe fazda dıştaki duraklatılıp sonra yeniden başlatılır
+_active: contextvars.ContextVar = contextvars.ContextVar('active_phase', default=None)
+
+class PhaseTimings:
+    """Bir işin faz süreleri (saniye, çağrı sayısı) ve sayaçları; thread-safe"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._phases: Dict[str, list] = {}
+        self._counters: Dict[str, int] = {}
+        self._started = time.monotonic()
+        self._finished: Optional[float] = None
+
+    def add(self, phase: str, seconds: float, calls: int = 1):
+        with self._lock:
+            entry = self._phases.setdefault(phase, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def finish(self):
+        """Duvar saati süresini dondur"""
+        if self._finished is None:
+            self._finished = time.monotonic()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            phases = {name: {'seconds': round(seconds, 3), 'count': calls}
+                      for name, (seconds, calls) in sorted(self._phases.items(), key=lambda item: -item[1][0])}
+            counters = dict(self._counters)
+        return {
+            'wall_seconds': round((self._finished or time.monotonic()) - self._started, 3),
+            'phases': phases,
+            'counters': counters
+        }
+
+    def summary_fields(self) -> Dict[str, object]:
+        """Tek satırlık özet log için düz alanlar (fazlar ms olarak)"""
+        snapshot = self.snapshot()
+        fields = {'wall_ms': round(snapshot['wall_seconds'] * 1000)}
+        fields.update({f"{name}_ms": round(phase['seconds'] * 1000) for name, phase in snapshot['phases'].items()})
+        fields.update(snapshot['counters'])
+        return fields
+
+@contextmanager
+def track(timings: PhaseTimings):
+    """Blok içindeki (ve submit_in_context ile gönderilen) işlerin sürelerini timings'e yaz"""
+    token = _current.set(timings)
+    active_token = _active.set(None)
+    try:
+        yield timings
+    finally:
+        _active.reset(active_token)
+        _current.reset(token)
+
+@contextmanager
+def phase(name: str):
+    """Bloğun süresini aktif işin `name` fazına ekle"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.monotonic()
+    outer = _active.get()
+    if outer is not None:
+        timings.add(outer[0], started - outer[1], calls=0)
+    current = [name, started]
+    token = _active.set(current)
+    try:
+        yield
+    finally:
+        ended = time.monotonic()
+        timings.add(name, ended - current[1])
+        _active.reset(token)
+        if outer is not None:
+            outer[1] = ended
+
+def count(name: str, amount: int = 1):
+    """Aktif işin sayacını artır"""
+    timings = _current.get()
+    if timings is not None:
+        timings.count(name, amount)
+
+def _run_detached(fn, args, kwargs):
+    # Worker thread çağıranın aktif fazını paylaşmaz, yalnızca işini devralır
+    _active.set(None)
+    return fn(*args, **kwargs)
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """executor.submit, ama fn çağıranın işi (track) altında çalışır"""
+    return executor.submit(contextvars.copy_context().run, _run_detached, fn, args, kwargs)
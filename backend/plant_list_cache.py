@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Process genelinde paylaşılan santral listesi cache'i (TTL + koşullu yeniden doğrulama)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_PLANT_LIST_TTL_SECONDS = 3600
+
+logger = logging.getLogger(__name__)
+
+# fetch(validators) -> None (304: değişmedi) ya da (santraller, yeni validators)
+PlantListFetcher = Callable[[Dict[str, str]], Optional[Tuple[List[Dict], Dict[str, str]]]]
+
+class PlantListCache:
+    """Santral listesi için tek girişli cache
+
+    TTL dolduğunda liste ETag / Last-Modified ile koşullu olarak yeniden istenir;
+    sunucu 304 dönerse mevcut liste bir TTL daha kullanılır. Yenileme hata verirse
+    eski liste (varsa) sunulmaya devam eder. Aynı anda en fazla bir yenileme yapılır.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PLANT_LIST_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._plants: Optional[List[Dict]] = None
+        self._validators: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at: Optional[float] = None
+        # Sayaçlar ayrı kilitle korunur; hızlı yol (hit) yenileme kilidini beklemez
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'fetches': 0, 'revalidated': 0, 'stale_served': 0}
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, fetch: PlantListFetcher, force_refresh: bool = False) -> Tuple[List[Dict], bool]:
+        """Santral listesini ve cache'ten gelip gelmediğini döndür
+
+        force_refresh=True ise TTL beklenmeden koşulsuz yeniden çekilir. Liste
+        alınamazsa ve eldeki liste de yoksa fetch'in hatası yukarı iletilir.
+        """
+        plants = self._plants
+        if not force_refresh and plants is not None and time.time() < self._expires_at:
+            self._count('hits')
+            return list(plants), True
+
+        with self._lock:
+            if not force_refresh and self._plants is not None and time.time() < self._expires_at:
+                self._count('hits')
+                return list(self._plants), True
+
+            validators = {} if force_refresh or self._plants is None else dict(self._validators)
+            try:
+                fetched = fetch(validators)
+            except Exception as e:
+                if self._plants is None:
+                    raise
+                self._count('stale_served')
+                logger.warning(f"⚠️ Santral listesi yenilenemedi, cache'teki liste kullanılıyor: {e}")
+                return list(self._plants), True
+
+            if fetched is None:
+                self._count('revalidated')
+                from_cache = True
+            else:
+                self._plants, self._validators = fetched
+                self._fetched_at = time.time()
+                self._count('fetches')
+                from_cache = False
+            self._expires_at = time.time() + self.ttl
+            return list(self._plants), from_cache
+
+    def invalidate(self):
+        """Listeyi unut; bir sonraki istek upstream'e gider"""
+        with self._lock:
+            self._plants = None
+            self._validators = {}
+            self._expires_at = 0.0
+
+    def snapshot(self) -> Dict[str, object]:
+        plants, fetched_at = self._plants, self._fetched_at
+        with self._stats_lock:
+            stats = dict(self._stats)
+        return {
+            'cached': plants is not None,
+            'count': len(plants) if plants is not None else 0,
+            'age_seconds': round(time.time() - fetched_at) if fetched_at else None,
+            'ttl_seconds': self.ttl,
+            **stats
+        }
+
+_plant_list_cache: Optional[PlantListCache] = None
+_plant_list_cache_lock = threading.Lock()
+
+def get_plant_list_cache() -> PlantListCache:
+    """Process genelinde tek santral listesi cache'i (EPIAS_PLANT_LIST_TTL_SECONDS)"""
+    global _plant_list_cache
+    if _plant_list_cache is None:
+        with _plant_list_cache_lock:
+            if _plant_list_cache is None:
+                _plant_list_cache = PlantListCache(
+                    ttl=float(os.getenv('EPIAS_PLANT_LIST_TTL_SECONDS', DEFAULT_PLANT_LIST_TTL_SECONDS))
+                )
+    return _plant_list_cache
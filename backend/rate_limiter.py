@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+EPIAS istekleri için process genelinde paylaşılan token-bucket rate limiter
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Varsayılan limitler (env ile değiştirilebilir)
+DEFAULT_RATE_PER_SECOND = 5.0
+DEFAULT_BURST = 10
+
+class TokenBucket:
+    """Thread-safe token bucket - saniyede `rate` token dolar, en fazla `burst` token birikir"""
+
+    def __init__(self, rate: float, burst: int):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate: float, burst: int):
+        """Limitleri değiştir; bucket dolu olarak başlar"""
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate > 0 ve burst >= 1 olmalı")
+        with self._lock:
+            self.rate = float(rate)
+            self.capacity = float(burst)
+            self._tokens = self.capacity
+            self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Token al; gerekirse bekle. Beklenen süreyi (saniye) döndürür
+
+        Token yoksa rezervasyon yapılır (seviye eksiye düşer) ve kilit dışında
+        beklenir; böylece bekleyenler geliş sırasına göre sırayla geçer.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        return wait_seconds
+
+    def snapshot(self) -> Dict[str, float]:
+        """Anlık doluluk bilgisi (health endpoint için)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            tokens = self._tokens
+        return {
+            'tokens': round(tokens, 2),
+            'capacity': self.capacity,
+            'rate_per_second': self.rate,
+            'fill_ratio': round(max(tokens, 0) / self.capacity, 3)
+        }
+
+_limiter: Optional[TokenBucket] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> TokenBucket:
+    """Process genelinde tek rate limiter'ı döndür (EPIAS_RATE_LIMIT_RPS / EPIAS_RATE_LIMIT_BURST)"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = TokenBucket(
+                    float(os.getenv('EPIAS_RATE_LIMIT_RPS', DEFAULT_RATE_PER_SECOND)),
+                    int(os.getenv('EPIAS_RATE_LIMIT_BURST', DEFAULT_BURST))
+                )
+    return _limiter
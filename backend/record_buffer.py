@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Saatlik enjeksiyon kayıtları için sütun bazlı (columnar) tampon
+
+Her kayıt için ayrı bir dict tutmak yerine saat damgası array('q') (epoch saniye),
+sayısal alanlar da alan başına bir array('d') (tamsayı alanlar array('q')) olarak
+saklanır; kayıt başına bellek birkaç kat azalır. to_dataframe() sayısal sütunları
+kopyalamadan pandas'a verir. Sayısal olmayan alanlar (ör. metin) alan başına düz
+bir listede tutulur.
+"""
+
+import math
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data_store import TR_TIMEZONE, record_timestamp
+
+_NAN = float('nan')
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _column_values(column: Union[array, List]) -> List:
+    """Sütunun Python değerleri (float sütunlarda NaN -> None)"""
+    if isinstance(column, array) and column.typecode == 'd':
+        return [None if value != value else value for value in column.tolist()]
+    return list(column)
+
+class ColumnarRecordBuffer:
+    """'date' alanlı kayıtları sütunlar halinde biriktiren, liste gibi okunabilen tampon
+
+    len(), iterasyon ve indeksleme kayıtları yeniden dict olarak üretir; 'date'
+    Türkiye saatiyle ISO formatında döner, eksik/None sayısal değerler None olur.
+    Yalnızca int içeren alanlar int64 tutulur ve int döner; aynı alanda float da
+    görülürse sütun float64'e geçer ve int'ler float döner (pandas'taki gibi, 5 ->
+    5.0). int sütunda eksik/None değer görülürse sütun nesne listesine çevrilir.
+    Tarihi okunamayan kayıtlar saklanmaz, sayısı skipped alanında tutulur; tamponu
+    dolduran taraf bunu loglamalıdır.
+
+    to_dataframe() ile üretilen DataFrame tamponun belleğini paylaşır; o DataFrame
+    yaşadığı sürece tampona yeni kayıt eklenemez (BufferError).
+    """
+
+    def __init__(self, records: Optional[Iterable[Dict]] = None):
+        self._timestamps = array('q')
+        self._columns: Dict[str, Union[array, List]] = {}
+        self.skipped = 0
+        if records is not None:
+            self.extend(records)
+
+    def _new_column(self, value, length: int) -> Union[array, List]:
+        if _is_int(value) and not length:
+            return array('q')
+        if value is None or (_is_number(value) and not _is_int(value)):
+            return array('d', [_NAN]) * length
+        # Önceki kayıtlarda eksik olan int ya da sayısal olmayan alan
+        return [None] * length
+
+    def _to_objects(self, key: str) -> List:
+        column = self._columns[key]
+        if isinstance(column, array):
+            column = self._columns[key] = _column_values(column)
+        return column
+
+    def _to_floats(self, key: str) -> array:
+        column = self._columns[key]
+        if column.typecode == 'q':
+            column = self._columns[key] = array('d', column)
+        return column
+
+    def _pad(self, length: int):
+        for key, column in self._columns.items():
+            missing = length - len(column)
+            if missing > 0:
+                if isinstance(column, array) and column.typecode == 'd':
+                    column.extend(array('d', [_NAN]) * missing)
+                else:
+                    self._to_objects(key).extend([None] * missing)
+
+    def _truncate(self, length: int):
+        """Yarım kalan eklemeyi geri al (view'a verilmiş sütunlar zaten büyümemiştir)"""
+        del self._timestamps[length:]
+        for column in self._columns.values():
+            if len(column) > length:
+                del column[length:]
+
+    def append(self, record: Dict):
+        ts = record_timestamp(record)
+        if ts is None:
+            self.skipped += 1
+            return
+        index = len(self._timestamps)
+        try:
+            self._append(index, ts, record)
+        except BufferError:
+            self._truncate(index)
+            raise
+
+    def _append(self, index: int, ts: int, record: Dict):
+        self._timestamps.append(ts)
+
+        written = 0
+        for key, value in record.items():
+            if key == 'date':
+                continue
+            column = self._columns.get(key)
+            if column is None:
+                column = self._columns[key] = self._new_column(value, index)
+            if isinstance(column, array):
+                if column.typecode == 'q':
+                    if _is_int(value):
+                        column.append(value)
+                        written += 1
+                        continue
+                    if _is_number(value):
+                        # int sütuna float geldi: sütun float64'e geçer
+                        column = self._to_floats(key)
+                if column.typecode == 'd':
+                    if value is None:
+                        column.append(_NAN)
+                        written += 1
+                        continue
+                    if _is_number(value):
+                        column.append(value)
+                        written += 1
+                        continue
+                # Sütun tipine uymayan değer geldi: sütun listeye çevrilir
+                column = self._to_objects(key)
+            column.append(value)
+            written += 1
+
+        # Kayıtta bulunmayan alanlar boş değerle doldurulur
+        if written != len(self._columns):
+            self._pad(index + 1)
+
+    def extend(self, records: Iterable[Dict], constants: Optional[Dict] = None):
+        """Kayıtları ekle; constants verilirse her kayda bu sabit alanlar da yazılır
+
+        Kayıtta aynı alan varsa kayıttaki değer geçerlidir. Tampon eklenirken sabit
+        alanlar sütun olarak tek seferde doldurulur, kayıt başına dict üretilmez.
+        """
+        if isinstance(records, ColumnarRecordBuffer):
+            self._extend_columns(records, constants or {})
+            return
+        for record in records:
+            self.append({**constants, **record} if constants else record)
+
+    def _extend_columns(self, other: 'ColumnarRecordBuffer', constants: Dict):
+        length = len(self._timestamps)
+        try:
+            for key, value in constants.items():
+                if key not in other._columns:
+                    self._extend_constant(key, value, length, len(other))
+            self._extend_arrays(length, other)
+        except BufferError:
+            self._truncate(length)
+            raise
+        self.skipped += other.skipped
+
+    def _extend_constant(self, key: str, value, length: int, count: int):
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = self._new_column(value, length)
+        if isinstance(column, array):
+            if column.typecode == 'q' and _is_int(value):
+                column.extend(array('q', [value]) * count)
+                return
+            if value is None or _is_number(value):
+                if column.typecode == 'd' or value is not None:
+                    column = self._to_floats(key)
+                    column.extend(array('d', [_NAN if value is None else value]) * count)
+                    return
+            column = self._to_objects(key)
+        column.extend([value] * count)
+
+    def _extend_arrays(self, length: int, other: 'ColumnarRecordBuffer'):
+        self._timestamps.extend(other._timestamps)
+        for key, column in other._columns.items():
+            own = self._columns.get(key)
+            if own is None:
+                if isinstance(column, array) and (column.typecode == 'd' or not length):
+                    own = self._columns[key] = array(column.typecode, [_NAN] * length if column.typecode == 'd' else [])
+                else:
+                    own = self._columns[key] = [None] * length
+            if isinstance(own, array) and isinstance(column, array):
+                if own.typecode == 'q' and column.typecode == 'd':
+                    own = self._to_floats(key)
+                own.extend(column if own.typecode == column.typecode else array('d', column))
+            else:
+                self._to_objects(key).extend(_column_values(column))
+        self._pad(len(self._timestamps))
+
+    def slice(self, start: int, stop: int) -> 'ColumnarRecordBuffer':
+        """[start, stop) aralığındaki kayıtlardan yeni tampon (sütunlar kopyalanır, dict üretilmez)"""
+        part = ColumnarRecordBuffer()
+        part._timestamps = self._timestamps[start:stop]
+        part._columns = {key: column[start:stop] for key, column in self._columns.items()}
+        return part
+
+    @property
+    def fields(self) -> List[str]:
+        return ['date', *self._columns]
+
+    @property
+    def timestamps(self) -> array:
+        """Kayıtların epoch saniye cinsinden saat damgaları"""
+        return self._timestamps
+
+    def record(self, index: int) -> Dict:
+        record = {'date': datetime.fromtimestamp(self._timestamps[index], TR_TIMEZONE).isoformat()}
+        for key, column in self._columns.items():
+            value = column[index]
+            record[key] = None if isinstance(value, float) and math.isnan(value) else value
+        return record
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self._timestamps)):
+            yield self.record(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.record(i) for i in range(*index.indices(len(self._timestamps)))]
+        if index < 0:
+            index += len(self._timestamps)
+        if not 0 <= index < len(self._timestamps):
+            raise IndexError('record index out of range')
+        return self.record(index)
+
+    def iter_rows(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """Kayıtları fields sırasıyla tuple listeleri halinde, batch batch üret
+
+        'date' Türkiye saatiyle tz'siz datetime, eksik sayısal değerler None olur.
+        Her batch kopyadır; tampon belleğe view verilmediği için üretim sürerken de
+        büyüyebilir.
+        """
+        for start in range(0, len(self._timestamps), batch_size):
+            stop = start + batch_size
+            seconds = np.array(self._timestamps[start:stop], dtype=np.int64)
+            dates = (pd.to_datetime(seconds, unit='s', utc=True).tz_convert(TR_TIMEZONE)
+                     .tz_localize(None).to_pydatetime())
+            columns = [dates]
+            for column in self._columns.values():
+                columns.append(_column_values(column[start:stop]))
+            yield list(zip(*columns))
+
+    def __repr__(self) -> str:
+        return f"ColumnarRecordBuffer({len(self)} kayıt, {len(self._columns)} alan)"
+
+    def nbytes(self) -> int:
+        """Sütun dizilerinin yaklaşık bellek kullanımı (liste sütunlarındaki nesneler hariç)"""
+        total = self._timestamps.itemsize * len(self._timestamps)
+        for column in self._columns.values():
+            total += column.itemsize * len(column) if isinstance(column, array) else 8 * len(column)
+        return total
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """DataFrame'e çevir; 'date' Türkiye saatiyle tz-aware, sayısal sütunlar kopyalanmaz"""
+        dates = pd.Series(np.frombuffer(self._timestamps, dtype=np.int64).view('datetime64[s]'))
+        data = {'date': dates.dt.tz_localize('UTC').dt.tz_convert(TR_TIMEZONE)}
+        for key, column in self._columns.items():
+            if isinstance(column, array):
+                data[key] = np.frombuffer(column, dtype=np.int64 if column.typecode == 'q' else np.float64)
+            else:
+                data[key] = column
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+EPIAS istekleri için retry politikası (exponential backoff + jitter) ve endpoint bazlı circuit breaker
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+# Bu HTTP kodları geçici kabul edilir ve tekrar denenir
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# Circuit breaker'ı sayan kodlar (429 "yavaşla" demektir, servis çökmüş sayılmaz)
+BREAKER_FAILURE_STATUSES = (500, 502, 503, 504)
+
+# Retry-After başlığına en fazla bu kadar uyulur (saniye)
+RETRY_AFTER_CAP = 120.0
+
+class CircuitOpenError(Exception):
+    """Endpoint için circuit açık - istek gönderilmeden hızlıca başarısız olunur"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for '{endpoint}', retry in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+class RetryPolicy:
+    """Exponential backoff + full jitter; Retry-After başlığını dikkate alır"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in RETRYABLE_STATUSES
+
+    def backoff(self, attempt: int, response=None) -> float:
+        """attempt. denemeden sonra beklenecek süre (saniye)"""
+        retry_after = self._parse_retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _parse_retry_after(response) -> Optional[float]:
+        if response is None:
+            return None
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return max(0.0, min(seconds, RETRY_AFTER_CAP))
+
+class CircuitBreaker:
+    """Ardışık hatalarda açılan, reset_timeout sonrası tek deneme isteğine izin veren devre kesici"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def before_call(self):
+        """İstekten önce çağrılır; devre açıksa CircuitOpenError fırlatır"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self._state == self.OPEN and elapsed >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                # Tek bir deneme isteğine izin ver
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release_trial(self):
+        """Sonucu sağlık bilgisi taşımayan çağrıdan sonra (ör. istek hiç gönderilemedi)
+        
+        Durum değişmez; half-open ise deneme hakkı bir sonraki çağrıya bırakılır.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {'state': self._state, 'consecutive_failures': self._failures}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_retry_policy: Optional[RetryPolicy] = None
+
+def get_retry_policy() -> RetryPolicy:
+    """Process genelinde retry politikası (EPIAS_RETRY_* env değişkenleri)"""
+    global _retry_policy
+    if _retry_policy is None:
+        _retry_policy = RetryPolicy(
+            max_attempts=int(os.getenv('EPIAS_RETRY_MAX_ATTEMPTS', 4)),
+            base_delay=float(os.getenv('EPIAS_RETRY_BASE_DELAY', 0.5)),
+            max_delay=float(os.getenv('EPIAS_RETRY_MAX_DELAY', 30))
+        )
+    return _retry_policy
+
+def get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    """Endpoint için paylaşılan circuit breaker (EPIAS_CIRCUIT_* env değişkenleri)"""
+    with _breakers_lock:
+        breaker = _breakers.get(endpoint)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                endpoint,
+                failure_threshold=int(os.getenv('EPIAS_CIRCUIT_FAILURE_THRESHOLD', 5)),
+                reset_timeout=float(os.getenv('EPIAS_CIRCUIT_RESET_SECONDS', 30))
+            )
+            _breakers[endpoint] = breaker
+        return breaker
+
+def circuit_breaker_snapshot() -> Dict[str, Dict[str, object]]:
+    """Tüm endpoint'lerin devre durumları"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
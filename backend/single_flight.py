@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Aynı anda yapılan özdeş upstream isteklerini tek isteğe indiren single-flight yardımcı
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Anahtar başına en fazla bir çalışan çağrı
+
+    Aynı anahtarla gelen ilk çağrı (leader) fonksiyonu çalıştırır; o sürerken
+    gelenler bekler ve aynı sonucu (ya da aynı hatayı) alır. Çağrı bittiğinde
+    anahtar silinir, yani sonuç cache'lenmez.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """fn()'in sonucunu ve sonucun başka bir çağrıyla paylaşılıp paylaşılmadığını döndür"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {'in_flight': len(self._calls), 'executed': self._executed, 'coalesced': self._coalesced}
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight() -> SingleFlight:
+    """Process genelinde paylaşılan SingleFlight"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
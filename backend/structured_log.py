@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+İstek sıcak yolu için örneklenmiş, yapılandırılmış olay logları
+
+Her upstream isteği ve her veri penceresi için tek satırlık, alanları belli bir olay
+yazılır. Mesaj ancak bir handler gerçekten yazdığında metne çevrilir; seviye kapalıysa
+ya da olay örneklemeye takılırsa hiçbir formatlama yapılmaz.
+
+  EPIAS_LOG_FORMAT=text|json   text: "olay alan=değer ...", json: tek satır JSON
+  EPIAS_LOG_SAMPLE_RATE=0..1   INFO/DEBUG olaylarından yazılacak oran (WARNING ve üstü hep yazılır)
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+from typing import Dict, Optional
+
+DEFAULT_SAMPLE_RATE = 1.0
+EVENT_LOGGER_NAME = 'epias.events'
+
+class LogEvent:
+    """Tembel formatlanan olay mesajı"""
+
+    __slots__ = ('name', 'fields', 'as_json')
+
+    def __init__(self, name: str, fields: Dict[str, object], as_json: bool):
+        self.name = name
+        self.fields = fields
+        self.as_json = as_json
+
+    def __str__(self) -> str:
+        fields = {key: value for key, value in self.fields.items() if value is not None}
+        if self.as_json:
+            return json.dumps({'event': self.name, **fields}, ensure_ascii=False, default=str, separators=(',', ':'))
+        return ' '.join([self.name] + [f"{key}={value}" for key, value in fields.items()])
+
+class EventLogger:
+    """Olayları örnekleyerek 'epias.events' logger'ına yazar"""
+
+    def __init__(self, sample_rate: float = DEFAULT_SAMPLE_RATE, as_json: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.as_json = as_json
+        self.logger = logger or logging.getLogger(EVENT_LOGGER_NAME)
+
+    def emit(self, name: str, level: int = logging.INFO, sampled: bool = True, **fields):
+        """Olayı yaz; sampled=False olanlar (ör. iş özetleri) örneklemeye takılmaz"""
+        if not self.logger.isEnabledFor(level):
+            return
+        if sampled and level < logging.WARNING and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                return
+            # Okuyan toplamları örnekleme oranına göre ölçekleyebilsin
+            fields['sample_rate'] = self.sample_rate
+        self.logger.log(level, LogEvent(name, fields, self.as_json))
+
+    def snapshot(self) -> Dict[str, object]:
+        return {'format': 'json' if self.as_json else 'text', 'sample_rate': self.sample_rate}
+
+_event_logger: Optional[EventLogger] = None
+_event_logger_lock = threading.Lock()
+
+def get_event_logger() -> EventLogger:
+    """Process genelinde tek olay logger'ı (EPIAS_LOG_FORMAT / EPIAS_LOG_SAMPLE_RATE)"""
+    global _event_logger
+    if _event_logger is None:
+        with _event_logger_lock:
+            if _event_logger is None:
+                _event_logger = EventLogger(
+                    sample_rate=float(os.getenv('EPIAS_LOG_SAMPLE_RATE', DEFAULT_SAMPLE_RATE)),
+                    as_json=os.getenv('EPIAS_LOG_FORMAT', 'text').strip().lower() == 'json'
+                )
+    return _event_logger
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Artımlı senkronizasyon çıktısı: kronolojik, sonuna eklenen CSV veri seti
+
+Her senkronizasyonda dosya baştan yazılmaz. Revizyon penceresinin başından itibaren
+kuyruk kesilir ve yeni çekilen kayıtlar sona eklenir; daha eski satırlara dokunulmaz.
+"""
+
+import csv
+import io
+import os
+from typing import Dict, List
+
+# Kuyruk taraması için sondan geriye okunan blok boyutu
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+def truncate_from(path: str, cutoff: str) -> int:
+    """'date' değeri cutoff'a eşit veya büyük olan satırları dosyanın sonundan sil
+
+    Satırlar tarihe göre sıralı ve tarih ilk sütun olduğundan dosya sondan geriye
+    taranır; yalnızca kesilecek kuyruk okunur. Silinen satır sayısını döndürür.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        position = region_end = size
+        pending = b''
+        removed = 0
+        keep_until = 0
+
+        while position > 0:
+            read_size = min(_TAIL_BLOCK_SIZE, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + pending).split(b'\n')
+            # Bloğun ilk satırı yarım olabilir; bir önceki blokla birlikte işlenir
+            pending = lines.pop(0) if position > 0 else b''
+
+            line_end = region_end
+            found = False
+            for line in reversed(lines):
+                line_start = line_end - len(line)
+                if line.strip():
+                    value = line.split(b',', 1)[0].strip(b'"').decode('utf-8')
+                    if value == 'date' or value < cutoff:
+                        keep_until = min(line_end + 1, size)
+                        found = True
+                        break
+                    removed += 1
+                line_end = line_start - 1
+            if found:
+                break
+            region_end = position + len(pending)
+
+        f.truncate(keep_until)
+    return removed
+
+def append_records(path: str, records: List[Dict]) -> int:
+    """Kayıtları CSV'nin sonuna ekle; dosya yoksa başlık satırıyla oluştur
+
+    Sütunlar ilk yazımda belirlenir ('date' ilk sütundur); sonradan gelen yeni
+    alanlar yok sayılır.
+    """
+    if not records:
+        return 0
+
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
+    if exists:
+        with open(path, newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f))
+    else:
+        fieldnames = ['date']
+        for record in records:
+            fieldnames.extend(key for key in record if key not in fieldnames)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction='ignore', lineterminator='\n')
+    if not exists:
+        writer.writeheader()
+    writer.writerows(records)
+
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        f.write(buffer.getvalue())
+    return len(records)
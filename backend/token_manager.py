@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+EPIAS TGT (CAS ticket) yaşam döngüsü - kullanıcı bazında paylaşılan, süresi dolmadan yenilenen token'lar
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# EPIAS TGT'leri yaklaşık 2 saat geçerli; bitmeden bu kadar önce yenilenir
+DEFAULT_TGT_TTL_SECONDS = 7200
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+
+class AuthenticationError(Exception):
+    """CAS ticket alınamadı"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response_text: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response_text = response_text
+
+class _TicketEntry:
+    __slots__ = ('token', 'credential_digest', 'obtained_at', 'expires_at')
+
+    def __init__(self, token: str, credential_digest: str, ttl: float):
+        self.token = token
+        self.credential_digest = credential_digest
+        self.obtained_at = time.time()
+        self.expires_at = self.obtained_at + ttl
+
+class TokenManager:
+    """Thread-safe TGT yöneticisi
+
+    Token'lar kullanıcı adına göre saklanır ve yalnızca aynı şifreyle gelen
+    isteklere verilir. Her kullanıcı için tek kilit vardır; böylece aynı anda
+    en fazla bir yenileme (CAS isteği) yapılır, diğerleri onun sonucunu kullanır.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TGT_TTL_SECONDS, refresh_margin: float = DEFAULT_REFRESH_MARGIN_SECONDS):
+        self.ttl = ttl
+        self.refresh_margin = refresh_margin
+        self._entries: Dict[str, _TicketEntry] = {}
+        self._user_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(username: str, password: str) -> str:
+        return hashlib.sha256(f"{username}\0{password}".encode('utf-8')).hexdigest()
+
+    def _user_lock(self, username: str) -> threading.Lock:
+        with self._lock:
+            lock = self._user_locks.get(username)
+            if lock is None:
+                lock = self._user_locks[username] = threading.Lock()
+            return lock
+
+    def _usable(self, entry: Optional[_TicketEntry], digest: str) -> bool:
+        return (entry is not None and entry.credential_digest == digest
+                and time.time() < entry.expires_at - self.refresh_margin)
+
+    def get_token(self, username: str, password: str, issue: Callable[[], str]) -> str:
+        """Geçerli TGT'yi döndür; yoksa veya bitmek üzereyse issue() ile yenisini al"""
+        digest = self._digest(username, password)
+        entry = self._entries.get(username)
+        if self._usable(entry, digest):
+            return entry.token
+
+        with self._user_lock(username):
+            entry = self._entries.get(username)
+            if self._usable(entry, digest):
+                return entry.token
+            return self._issue(username, digest, issue)
+
+    def refresh(self, username: str, password: str, stale_token: Optional[str], issue: Callable[[], str]) -> str:
+        """Reddedilen (401) token'ı yenile
+
+        Başka bir thread bu arada token'ı zaten yenilediyse yeni CAS isteği yapılmaz.
+        """
+        digest = self._digest(username, password)
+        with self._user_lock(username):
+            entry = self._entries.get(username)
+            if entry is not None and entry.token != stale_token and self._usable(entry, digest):
+                return entry.token
+            return self._issue(username, digest, issue)
+
+    def _issue(self, username: str, digest: str, issue: Callable[[], str]) -> str:
+        token = issue()
+        self._entries[username] = _TicketEntry(token, digest, self.ttl)
+        return token
+
+    def invalidate(self, username: str):
+        """Kullanıcının token'ını unut (ör. logout)"""
+        with self._user_lock(username):
+            self._entries.pop(username, None)
+
+_token_manager: Optional[TokenManager] = None
+_token_manager_lock = threading.Lock()
+
+def get_token_manager() -> TokenManager:
+    """Process genelinde tek TokenManager (EPIAS_TGT_TTL_SECONDS / EPIAS_TGT_REFRESH_MARGIN_SECONDS)"""
+    global _token_manager
+    if _token_manager is None:
+        with _token_manager_lock:
+            if _token_manager is None:
+                _token_manager = TokenManager(
+                    ttl=float(os.getenv('EPIAS_TGT_TTL_SECONDS', DEFAULT_TGT_TTL_SECONDS)),
+                    refresh_margin=float(os.getenv('EPIAS_TGT_REFRESH_MARGIN_SECONDS', DEFAULT_REFRESH_MARGIN_SECONDS))
+                )
+    return _token_manager
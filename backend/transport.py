@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tüm EpiasExtractor instance'larının paylaştığı, connection pool'lu HTTP transport
+"""
+
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Varsayılanlar (env ile değiştirilebilir)
+DEFAULT_POOL_HOSTS = 4      # cache'lenen host pool sayısı (CAS + şeffaflık + yedek)
+DEFAULT_POOL_SIZE = 32      # host başına en fazla açık bağlantı
+DEFAULT_POOL_BLOCK = True   # limit dolunca yeni bağlantı açmak yerine bekle
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Content-Type': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',  # büyük JSON cevapları sıkıştırılmış gelsin (açma işini urllib3 yapar)
+    'Connection': 'keep-alive'
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_pool_config: Dict[str, object] = {}
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def get_http_session() -> requests.Session:
+    """Process genelinde paylaşılan requests.Session
+
+    Keep-alive bağlantılar kullanıcılar ve işler arasında yeniden kullanılır, TLS
+    el sıkışması her login'de tekrarlanmaz. Pool host başına EPIAS_HTTP_POOL_SIZE
+    bağlantıyla sınırlıdır; EPIAS_HTTP_POOL_BLOCK açıkken limit dolunca istekler
+    bağlantı boşalmasını bekler. Kullanıcıya özel başlıklar (TGT gibi) session'a
+    değil her isteğe eklenmelidir; cookie'ler de kullanıcılar arasında karışmasın
+    diye saklanmaz.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_hosts = int(os.getenv('EPIAS_HTTP_POOL_HOSTS', DEFAULT_POOL_HOSTS))
+                pool_size = int(os.getenv('EPIAS_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+                pool_block = _env_flag('EPIAS_HTTP_POOL_BLOCK', DEFAULT_POOL_BLOCK)
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size,
+                                      pool_block=pool_block, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+                _pool_config.update({'pool_hosts': pool_hosts, 'pool_size_per_host': pool_size,
+                                     'pool_block': pool_block})
+                _session = session
+    return _session
+
+def transport_snapshot() -> Dict[str, object]:
+    """Transport konfigürasyonu (health endpoint için)"""
+    return dict(_pool_config)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Organizasyon -> UEVCB listesi indeksi (bellek + SQLite, TTL'li)
+
+UEVCB listeleri nadiren değişir; bir kez çekilen liste EPIAS_UEVCB_TTL_SECONDS
+boyunca process yeniden başlasa bile diskten sunulur.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional
+
+from data_store import DEFAULT_CACHE_DIR
+
+DEFAULT_UEVCB_TTL_SECONDS = 24 * 3600
+
+logger = logging.getLogger(__name__)
+
+class UevcbIndex:
+    """organizationId -> UEVCB listesi; okumalar bellekten, yazmalar ayrıca diske"""
+
+    def __init__(self, path: Optional[str], ttl: float = DEFAULT_UEVCB_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, tuple] = {}  # organization_id -> (uevcbs, fetched_at)
+        if path:
+            self._load()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _load(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS uevcb (organization_id TEXT PRIMARY KEY, '
+                         'payload TEXT NOT NULL, fetched_at REAL NOT NULL)')
+            rows = conn.execute('SELECT organization_id, payload, fetched_at FROM uevcb WHERE fetched_at >= ?',
+                                (time.time() - self.ttl,)).fetchall()
+        self._entries = {row[0]: (json.loads(row[1]), row[2]) for row in rows}
+
+    def get(self, organization_id: str) -> Optional[List[Dict]]:
+        """Taze liste ya da (yoksa / süresi dolduysa) None"""
+        entry = self._entries.get(str(organization_id))
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            return None
+        return list(entry[0])
+
+    def get_many(self, organization_ids: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Taze olanları döndür; eksikler sonuçta yer almaz"""
+        found = {}
+        for organization_id in organization_ids:
+            uevcbs = self.get(organization_id)
+            if uevcbs is not None:
+                found[str(organization_id)] = uevcbs
+        return found
+
+    def put_many(self, lists: Dict[str, List[Dict]]):
+        if not lists:
+            return
+        fetched_at = time.time()
+        with self._lock:
+            for organization_id, uevcbs in lists.items():
+                self._entries[str(organization_id)] = (list(uevcbs), fetched_at)
+            if not self.path:
+                return
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.executemany('INSERT OR REPLACE INTO uevcb (organization_id, payload, fetched_at) VALUES (?, ?, ?)',
+                                     [(str(organization_id), json.dumps(uevcbs, ensure_ascii=False), fetched_at)
+                                      for organization_id, uevcbs in lists.items()])
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ UEVCB indeksi diske yazılamadı: {e}")
+
+    def invalidate(self, organization_id: Optional[str] = None):
+        with self._lock:
+            if organization_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(organization_id), None)
+            if not self.path:
+                return
+            try:
+                with closing(self._connect()) as conn, conn:
+                    if organization_id is None:
+                        conn.execute('DELETE FROM uevcb')
+                    else:
+                        conn.execute('DELETE FROM uevcb WHERE organization_id = ?', (str(organization_id),))
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ UEVCB indeksi diskte temizlenemedi: {e}")
+
+    def snapshot(self) -> Dict[str, object]:
+        now = time.time()
+        return {
+            'organizations': sum(1 for _, fetched_at in self._entries.values() if now - fetched_at < self.ttl),
+            'ttl_seconds': self.ttl,
+            'persistent': bool(self.path)
+        }
+
+_uevcb_index: Optional[UevcbIndex] = None
+_uevcb_index_lock = threading.Lock()
+
+def get_uevcb_index() -> UevcbIndex:
+    """Process genelinde tek indeks (EPIAS_UEVCB_TTL_SECONDS, dosya EPIAS_CACHE_DIR altında)
+
+    Yerel cache kapalıysa (EPIAS_CACHE_ENABLED=false) ya da dosya açılamazsa indeks
+    yalnızca bellekte tutulur.
+    """
+    global _uevcb_index
+    if _uevcb_index is None:
+        with _uevcb_index_lock:
+            if _uevcb_index is None:
+                ttl = float(os.getenv('EPIAS_UEVCB_TTL_SECONDS', DEFAULT_UEVCB_TTL_SECONDS))
+                path = None
+                if os.getenv('EPIAS_CACHE_ENABLED', 'true').strip().lower() in ('1', 'true', 'yes', 'on'):
+                    path = os.path.join(os.getenv('EPIAS_CACHE_DIR', DEFAULT_CACHE_DIR), 'uevcb.sqlite3')
+                try:
+                    _uevcb_index = UevcbIndex(path, ttl)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"⚠️ UEVCB indeksi açılamadı ({path}), yalnızca bellekte tutulacak: {e}")
+                    _uevcb_index = UevcbIndex(None, ttl)
+    return _uevcb_index
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Uçtan uca throughput benchmark'ı: get_data_for_period + save_to_excel (yerel stub'a karşı)
+
+benchmarks/epias_stub.py ayrı bir process'te başlatılır (sunucunun JSON üretimi
+ölçülen process'in GIL'ini paylaşmasın) ve extractor base_url / auth_url ile ona
+yönlendirilir. Her kayıt sayısı için dönem uzunluğu ve stub'ın saat başına satır
+sayısı kayıt sayısına yaklaşacak şekilde seçilir; ardından:
+
+  extract: get_data_for_period (cache kapalı, rate limiter gevşek)
+  excel  : save_to_excel
+
+süresi, saniyedeki kayıt ve process'in tepe RSS'i yazdırılır. --json ile sonuçlar CI'da
+regresyon takibi için dosyaya yazılır.
+
+Kullanım:
+    python benchmarks/bench_end_to_end.py [--sizes 1000,100000,1000000] [--latency 0.0]
+                                          [--chunk-days 30] [--workers 4] [--json results.json]
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+
+# Extractor modülleri import edilmeden önce: yerel cache kapalı, rate limiter ölçümü bozmasın
+os.environ.setdefault('EPIAS_CACHE_ENABLED', 'false')
+os.environ.setdefault('EPIAS_RATE_LIMIT_RPS', '10000')
+os.environ.setdefault('EPIAS_RATE_LIMIT_BURST', '10000')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+from epias_extractor import EpiasExtractor  # noqa: E402
+
+BENCH_START = date(2020, 1, 1)
+MAX_PERIOD_DAYS = 365
+
+def start_stub(args):
+    """Stub'ı ayrı process'te başlat; (process, base_url) döndürür"""
+    command = [sys.executable, str(Path(__file__).resolve().parent / 'epias_stub.py'), '--port', '0',
+               '--latency', str(args.latency), '--max-page-size', str(args.max_page_size),
+               '--error-rate', str(args.error_rate)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    url = process.stdout.readline().strip()
+    if not url.startswith('http'):
+        process.kill()
+        raise RuntimeError('stub sunucusu başlatılamadı')
+    return process, url
+
+def configure_stub(url: str, **changes):
+    import requests
+    response = requests.post(f"{url}/_stub/config", json=changes, timeout=10)
+    response.raise_for_status()
+
+def plan_period(records: int):
+    """Kayıt sayısına yaklaşan (bitiş tarihi, saat başına satır) çifti"""
+    days = max(1, min(MAX_PERIOD_DAYS, math.ceil(records / 24)))
+    rows_per_hour = math.ceil(records / (days * 24))
+    return BENCH_START + timedelta(days=days - 1), rows_per_hour
+
+def peak_rss_mb() -> float:
+    # Linux'ta KB, macOS'ta byte
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def run_size(extractor: EpiasExtractor, url: str, records: int, args) -> dict:
+    end, rows_per_hour = plan_period(records)
+    configure_stub(url, rows_per_hour=rows_per_hour)
+
+    started = time.perf_counter()
+    result = extractor.get_data_for_period(BENCH_START.isoformat(), end.isoformat(), chunk_days=args.chunk_days,
+                                           max_workers=args.workers, use_cache=False)
+    extract_seconds = time.perf_counter() - started
+    if not result['success'] or result['failed_periods']:
+        raise RuntimeError(f"veri çekme başarısız: {result['message']} {result.get('failed_periods')}")
+    extract_rss = peak_rss_mb()
+
+    row = {'target_records': records, 'records': result['count'], 'extract_seconds': round(extract_seconds, 3),
+           'extract_records_per_second': round(result['count'] / extract_seconds), 'extract_peak_rss_mb': round(extract_rss, 1)}
+
+    if not args.skip_excel:
+        filename = f"bench_end_to_end_{records}.xlsx"
+        started = time.perf_counter()
+        excel = extractor.save_to_excel(result['data'], filename=filename)
+        excel_seconds = time.perf_counter() - started
+        if not excel['success']:
+            raise RuntimeError(f"Excel yazılamadı: {excel['message']}")
+        os.remove(excel['filepath'])
+        row.update({'excel_seconds': round(excel_seconds, 3),
+                    'excel_records_per_second': round(result['count'] / excel_seconds),
+                    'excel_file_mb': excel['file_size_mb'], 'excel_peak_rss_mb': round(peak_rss_mb(), 1)})
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,100000,1000000', help='virgülle ayrılmış kayıt sayıları')
+    parser.add_argument('--latency', type=float, default=0.0, help='stub gecikmesi (saniye, istek başına)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='stub 503 oranı')
+    parser.add_argument('--max-page-size', type=int, default=5000)
+    parser.add_argument('--chunk-days', type=int, default=30)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--skip-excel', action='store_true', help='yalnızca veri çekmeyi ölç')
+    parser.add_argument('--json', help='sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    stub, url = start_stub(args)
+    try:
+        extractor = EpiasExtractor('bench', 'bench', base_url=url, auth_url=url)
+        if not extractor.authenticate()['success']:
+            raise RuntimeError('stub authentication başarısız')
+
+        results = []
+        print(f"🧪 Stub: {url} (gecikme {args.latency}s, hata oranı {args.error_rate})")
+        # Tepe RSS process boyunca monoton olduğundan küçükten büyüğe gidilir
+        for size in sorted(int(value) for value in args.sizes.split(',')):
+            row = run_size(extractor, url, size, args)
+            results.append(row)
+            line = (f"{row['records']:>9} kayıt  extract {row['extract_seconds']:>8.2f}s "
+                    f"({row['extract_records_per_second']:>8}/s)")
+            if 'excel_seconds' in row:
+                line += (f"  excel {row['excel_seconds']:>8.2f}s ({row['excel_records_per_second']:>7}/s, "
+                         f"{row['excel_file_mb']} MB)")
+            print(line + f"  tepe RSS {peak_rss_mb():.0f} MB")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'args': vars(args), 'results': results}, f, indent=2)
+        print(f"📄 Sonuçlar: {args.json}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Excel yazım benchmark'ı: DataFrame yolu ile streaming (write_only) yolunun karşılaştırması
+
+Her (mod, kayıt sayısı) çifti ayrı bir process'te çalışır; böylece tepe RSS bir
+önceki ölçümden etkilenmez. Kayıtlar stub'ın sentetik verisinden ColumnarRecordBuffer'a
+doldurulur (extract sonrası save_to_excel'in gördüğü şekil), ardından save_to_excel
+yalnızca yazım süresi ve yazım sırasında RSS'in ne kadar arttığı ölçülür.
+
+  dataframe: EPIAS_EXCEL_STREAMING=false yolu (DataFrame + pd.ExcelWriter)
+  streaming: openpyxl write_only, özetler artımlı
+
+--verify ile iki modun dosyaları pd.read_excel ile sayfa sayfa karşılaştırılır
+(Özet'teki 'Dosya Oluşturma' satırı hariç).
+
+Kullanım:
+    python benchmarks/bench_excel_writer.py [--sizes 10000,100000,500000] [--verify] [--json results.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'backend'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault('EPIAS_CACHE_ENABLED', 'false')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+MODES = ('dataframe', 'streaming')
+ROWS_PER_HOUR = 4
+
+def peak_rss_mb() -> float:
+    # Linux'ta KB, macOS'ta byte
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+def build_buffer(records: int):
+    """İstenen sayıda sentetik kaydı sayfa sayfa tampona doldur"""
+    from datetime import date, timedelta
+
+    from epias_stub import make_records
+    from record_buffer import ColumnarRecordBuffer
+
+    start = date(2020, 1, 1)
+    days = -(-records // (24 * ROWS_PER_HOUR))
+    end = start + timedelta(days=days - 1)
+    buffer = ColumnarRecordBuffer()
+    for offset in range(0, records, 5000):
+        page, _ = make_records(start.isoformat(), end.isoformat(), ROWS_PER_HOUR, offset, min(5000, records - offset))
+        buffer.extend(page)
+    return buffer
+
+def worker(mode: str, records: int, filename: str):
+    """Tek ölçüm (alt process); sonucu stdout'a JSON olarak yazar"""
+    from epias_extractor import EpiasExtractor
+
+    buffer = build_buffer(records)
+    extractor = EpiasExtractor('bench', 'bench')
+    before = peak_rss_mb()
+    started = time.perf_counter()
+    result = extractor.save_to_excel(buffer, filename=filename, include_power_plants=False,
+                                     streaming=mode == 'streaming')
+    seconds = time.perf_counter() - started
+    if not result['success']:
+        raise SystemExit(f"Excel yazılamadı: {result['message']}")
+    print(json.dumps({'mode': mode, 'records': result['record_count'], 'seconds': round(seconds, 3),
+                      'records_per_second': round(result['record_count'] / seconds),
+                      'file_mb': result['file_size_mb'], 'filepath': result['filepath'],
+                      'peak_rss_mb': round(peak_rss_mb(), 1),
+                      'write_rss_delta_mb': round(peak_rss_mb() - before, 1)}))
+
+def run(mode: str, records: int) -> dict:
+    filename = f"bench_excel_{mode}_{records}.xlsx"
+    output = subprocess.run([sys.executable, __file__, '--worker', mode, str(records), filename],
+                            check=True, stdout=subprocess.PIPE, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def verify(dataframe_path: str, streaming_path: str):
+    """İki dosyanın sayfalarını karşılaştır; fark varsa AssertionError"""
+    import pandas as pd
+
+    expected = pd.read_excel(dataframe_path, sheet_name=None)
+    actual = pd.read_excel(streaming_path, sheet_name=None)
+    assert list(expected) == list(actual), f"sayfalar farklı: {list(expected)} != {list(actual)}"
+    for name, frame in expected.items():
+        other = actual[name]
+        if name == 'Özet':
+            frame = frame[frame['Metrik'] != 'Dosya Oluşturma'].reset_index(drop=True)
+            other = other[other['Metrik'] != 'Dosya Oluşturma'].reset_index(drop=True)
+        pd.testing.assert_frame_equal(frame, other, check_dtype=False, obj=name)
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == '--worker':
+        worker(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000,500000', help='virgülle ayrılmış kayıt sayıları')
+    parser.add_argument('--modes', default=','.join(MODES), help='virgülle ayrılmış modlar')
+    parser.add_argument('--verify', action='store_true', help='iki modun çıktısını karşılaştır')
+    parser.add_argument('--json', help='sonuçların yazılacağı JSON dosyası')
+    args = parser.parse_args()
+
+    modes = [mode for mode in args.modes.split(',') if mode]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"bilinmeyen mod: {sorted(unknown)}")
+
+    results = []
+    for size in sorted(int(value) for value in args.sizes.split(',')):
+        paths = {}
+        for mode in modes:
+            row = run(mode, size)
+            paths[mode] = row.pop('filepath')
+            results.append(row)
+            print(f"{mode:>9} {row['records']:>9} kayıt  {row['seconds']:>8.2f}s ({row['records_per_second']:>7}/s, "
+                  f"{row['file_mb']} MB)  yazım RSS +{row['write_rss_delta_mb']:.0f} MB  tepe RSS {row['peak_rss_mb']:.0f} MB")
+        try:
+            if args.verify and len(paths) == len(MODES):
+                verify(paths['dataframe'], paths['streaming'])
+                print(f"✅ {size} kayıt: çıktılar aynı")
+        finally:
+            for path in paths.values():
+                os.remove(path)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'args': vars(args), 'results': results}, f, indent=2)
+        print(f"📄 Sonuçlar: {args.json}")
+
+if __name__ == '__main__':
+    main()
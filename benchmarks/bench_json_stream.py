@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Sıkıştırılmış transfer + streaming JSON parse benchmark'ı
+
+Yerel bir HTTP sunucusu tüm santrallerin bir saatlik dökümüne benzeyen sentetik
+bir EPIAS sayfası döner. İki yol karşılaştırılır:
+
+  before: Accept-Encoding: identity + response.json()
+  after : Accept-Encoding: gzip, deflate + json_stream.read_response_json()
+
+Her yol için kablodan geçen byte, ortalama indirme+parse süresi ve tracemalloc ile
+ölçülen tepe bellek (ve bunun parse edilmiş sonuç dışında kalan kısmı) yazdırılır.
+Localhost'ta bant genişliği sınırsız olduğundan gerçek ağı taklit etmek için
+--bandwidth-mbps ile sunucu yazma hızı sınırlanabilir.
+
+Kullanım:
+    python benchmarks/bench_json_stream.py [--items 20000] [--repeat 5] [--bandwidth-mbps 50]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from json_stream import read_response_json  # noqa: E402
+
+ENERGY_FIELDS = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'biomass',
+                 'geothermal', 'fueloil', 'asphaltite', 'stoneCoal', 'naphtha', 'lng']
+
+def build_page(item_count: int) -> bytes:
+    """/data/injection-quantity cevabı formatında sentetik sayfa"""
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    items = []
+    for i in range(item_count):
+        record = {'date': (start + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S+03:00')}
+        for field in ENERGY_FIELDS:
+            record[field] = round(rng.uniform(0, 500), 2) if rng.random() < 0.6 else 0.0
+        record['total'] = round(sum(record[field] for field in ENERGY_FIELDS), 2)
+        items.append(record)
+    totals = {f"{field}Total": round(sum(item[field] for item in items), 2) for field in ENERGY_FIELDS}
+    page = {'items': items, 'page': {'number': 1, 'size': item_count, 'total': item_count}, 'totals': totals}
+    return json.dumps(page).encode('utf-8')
+
+def start_server(body: bytes, bandwidth_mbps: float = 0):
+    compressed = gzip.compress(body, compresslevel=6)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+            payload = compressed if use_gzip else body
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if use_gzip:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            if not bandwidth_mbps:
+                self.wfile.write(payload)
+                return
+            slice_size = 64 * 1024
+            for offset in range(0, len(payload), slice_size):
+                part = payload[offset:offset + slice_size]
+                self.wfile.write(part)
+                time.sleep(len(part) * 8 / (bandwidth_mbps * 1_000_000))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/data/injection-quantity"
+
+def fetch_before(session: requests.Session, url: str):
+    response = session.post(url, json={}, headers={'Accept-Encoding': 'identity'})
+    data = response.json()
+    return data, response.raw.tell()
+
+def fetch_after(session: requests.Session, url: str):
+    response = session.post(url, json={}, headers={'Accept-Encoding': 'gzip, deflate'}, stream=True)
+    try:
+        data = read_response_json(response)
+    finally:
+        response.close()
+    return data, response.raw.tell()
+
+def measure(name: str, fetch, session: requests.Session, url: str, repeat: int):
+    fetch(session, url)  # ısınma (bağlantı kurulumu)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data, wire_bytes = fetch(session, url)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    data, wire_bytes = fetch(session, url)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<8} wire={wire_bytes / 1024:>9.1f} KB  "
+          f"time={sum(timings) / len(timings) * 1000:>8.1f} ms (min {min(timings) * 1000:.1f})  "
+          f"peak={peak / 1024 / 1024:>7.2f} MB (parse overhead {(peak - retained) / 1024 / 1024:.2f} MB)  "
+          f"items={len(data['items'])}")
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=20000, help='sayfadaki kayıt sayısı')
+    parser.add_argument('--repeat', type=int, default=5, help='ölçüm tekrarı')
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help='sunucu yazma hızı sınırı (0 = sınırsız)')
+    args = parser.parse_args()
+
+    body = build_page(args.items)
+    server, url = start_server(body, args.bandwidth_mbps)
+    bandwidth = f"{args.bandwidth_mbps:g} Mbps" if args.bandwidth_mbps else "sınırsız"
+    print(f"📦 Sentetik sayfa: {args.items} kayıt, {len(body) / 1024:.1f} KB JSON, bant genişliği: {bandwidth}")
+
+    session = requests.Session()
+    try:
+        before = measure('before', fetch_before, session, url, args.repeat)
+        after = measure('after', fetch_after, session, url, args.repeat)
+        assert before == after, "streaming parse sonucu json() ile aynı olmalı"
+        print("✅ Sonuçlar birebir aynı")
+    finally:
+        session.close()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Kayıt biriktirme bellek benchmark'ı: dict listesi vs ColumnarRecordBuffer
+
+Sentetik saatlik kayıtlar (chunk chunk, json.loads ile üretilmiş gibi) iki şekilde
+biriktirilir ve DataFrame'e çevrilir:
+
+  before: list.extend(chunk) + pd.DataFrame(list)
+  after : ColumnarRecordBuffer.extend(chunk) + buffer.to_dataframe()
+
+Her yol için biriktirme sonrası tutulan bellek ve DataFrame dahil tepe bellek
+tracemalloc ile ölçülür.
+
+Kullanım:
+    python benchmarks/bench_record_buffer.py [--hours 26280] [--chunk-hours 720]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from record_buffer import ColumnarRecordBuffer  # noqa: E402
+
+ENERGY_FIELDS = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'biomass',
+                 'geothermal', 'fueloil', 'asphaltite', 'stoneCoal', 'naphtha', 'lng']
+
+def iter_chunks(hours: int, chunk_hours: int):
+    """Her chunk ayrı bir JSON cevabından parse edilmiş gibi yeni dict'ler üretir"""
+    rng = random.Random(42)
+    start = datetime(2015, 1, 1)
+    for offset in range(0, hours, chunk_hours):
+        items = []
+        for i in range(offset, min(offset + chunk_hours, hours)):
+            record = {'date': (start + timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%S+03:00')}
+            for field in ENERGY_FIELDS:
+                record[field] = round(rng.uniform(0, 500), 2) if rng.random() < 0.6 else 0.0
+            record['total'] = round(sum(record[field] for field in ENERGY_FIELDS), 2)
+            items.append(record)
+        yield json.loads(json.dumps(items))
+
+def measure(name: str, accumulate, to_frame, hours: int, chunk_hours: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = accumulate(iter_chunks(hours, chunk_hours))
+    accumulated, _ = tracemalloc.get_traced_memory()
+    df = to_frame(records)
+    _, peak = tracemalloc.get_traced_memory()
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    print(f"{name:<8} kayıtlar={accumulated / 1024 / 1024:>8.1f} MB ({accumulated / len(records):>6.0f} B/kayıt)  "
+          f"DataFrame dahil tepe={peak / 1024 / 1024:>8.1f} MB  süre={elapsed:.2f}s  satır={len(df)}")
+    return df
+
+def accumulate_list(chunks):
+    records = []
+    for chunk in chunks:
+        records.extend(chunk)
+    return records
+
+def accumulate_buffer(chunks):
+    records = ColumnarRecordBuffer()
+    for chunk in chunks:
+        records.extend(chunk)
+    return records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=int, default=26280, help='toplam saatlik kayıt sayısı (varsayılan 3 yıl)')
+    parser.add_argument('--chunk-hours', type=int, default=720, help='chunk başına kayıt sayısı')
+    args = parser.parse_args()
+
+    print(f"📦 {args.hours} kayıt, {len(ENERGY_FIELDS) + 2} alan, chunk başına {args.chunk_hours} kayıt")
+    before = measure('before', accumulate_list, pd.DataFrame, args.hours, args.chunk_hours)
+    after = measure('after', accumulate_buffer, ColumnarRecordBuffer.to_dataframe, args.hours, args.chunk_hours)
+
+    pd.testing.assert_frame_equal(before[ENERGY_FIELDS + ['total']], after[ENERGY_FIELDS + ['total']])
+    print("✅ Sayısal sütunlar birebir aynı")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Yerel EPIAS stub sunucusu (benchmark ve yük testi için)
+
+Extractor'ın kullandığı uçları taklit eder:
+
+  POST /cas/v1/tickets                                                   -> 201 + TGT (text)
+  GET  /electricity-service/v1/generation/data/injection-quantity-powerplant-list  (ETag / 304)
+  POST /electricity-service/v1/generation/data/uevcb-list
+  POST /electricity-service/v1/generation/data/injection-quantity        -> sayfalı cevap
+  POST /electricity-service/v1/generation/export/injection-quantity      -> tüm dönem tek cevapta
+
+Kayıtlar deterministik sentetik saatlik verilerdir; --rows-per-hour ile saat başına
+birden çok satır üretilerek kısa dönemlerde büyük cevaplar elde edilir. Gecikme,
+sayfa boyutu sınırı ve hata enjeksiyonu (rastgele 503) ayarlanabilir. Çalışırken
+ayarlar değiştirilebilir ve sayaçlar okunabilir:
+
+  POST /_stub/config   {"latency": 0.2, "error_rate": 0.05, ...}  -> güncel ayarlar
+  GET  /_stub/stats                                             -> istek/hata sayaçları
+
+Extractor'ı yönlendirmek için:
+    EPIAS_BASE_URL=http://127.0.0.1:8089 EPIAS_AUTH_URL=http://127.0.0.1:8089
+
+Kullanım:
+    python benchmarks/epias_stub.py [--port 8089] [--latency 0.05] [--max-page-size 5000]
+                                    [--error-rate 0.0] [--export-status 200] [--rows-per-hour 1]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GENERATION_PATH = '/electricity-service/v1/generation'
+ENERGY_FIELDS = ['naturalGas', 'dam', 'lignite', 'river', 'importedCoal', 'sun', 'wind', 'biomass',
+                 'geothermal', 'fueloil', 'asphaltite', 'stoneCoal', 'naphtha', 'lng']
+
+DEFAULT_CONFIG = {
+    'latency': 0.0,          # her veri isteğine eklenen gecikme (saniye)
+    'latency_jitter': 0.0,   # gecikmeye eklenen rastgele 0..jitter saniye
+    'max_page_size': 5000,   # bundan büyük sayfa istekleri 400 döner
+    'error_rate': 0.0,       # veri/export isteklerinden 503 dönecek oran (0-1)
+    'export_status': 200,    # 200 dışı bir değer export endpoint'ini devre dışı bırakır
+    'rows_per_hour': 1,      # saat başına üretilecek kayıt
+    'plants': 50,            # santral listesindeki santral sayısı
+    'seed': 42
+}
+
+def _parse_date(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=None)
+
+class StubState:
+    """Ayarlar ve sayaçlar (handler thread'leri arasında paylaşılır)"""
+
+    def __init__(self, **config):
+        self.lock = threading.Lock()
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.random = random.Random(self.config['seed'])
+        self.stats = {'requests': {}, 'injected_errors': 0, 'rejected_page_sizes': 0,
+                      'records_served': 0, 'bytes_sent': 0}
+        self.tickets = 0
+
+    def update(self, changes: dict) -> dict:
+        with self.lock:
+            unknown = set(changes) - set(DEFAULT_CONFIG)
+            if unknown:
+                raise ValueError(f"bilinmeyen ayar: {sorted(unknown)}")
+            self.config.update(changes)
+            if 'seed' in changes:
+                self.random = random.Random(changes['seed'])
+            return dict(self.config)
+
+    def count(self, key: str, amount: int = 1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def count_request(self, path: str):
+        with self.lock:
+            self.stats['requests'][path] = self.stats['requests'].get(path, 0) + 1
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.random.random() < self.config['error_rate']
+
+    def delay(self) -> float:
+        with self.lock:
+            return self.config['latency'] + self.random.random() * self.config['latency_jitter']
+
+def make_records(start_date: str, end_date: str, rows_per_hour: int, offset: int, limit: int):
+    """Dönemin [offset, offset+limit) aralığındaki kayıtları üret (toplam kayıt sayısıyla)"""
+    start = _parse_date(start_date).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = _parse_date(end_date).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    hours = max(int((end - start).total_seconds() // 3600), 0)
+    total = hours * rows_per_hour
+
+    records = []
+    for index in range(offset, min(offset + limit, total)):
+        hour, row = divmod(index, rows_per_hour)
+        # Ucuz ve deterministik değerler: saat ve satırdan türetilir
+        record = {'date': (start + timedelta(hours=hour)).strftime('%Y-%m-%dT%H:%M:%S+03:00')}
+        value_total = 0.0
+        for position, field in enumerate(ENERGY_FIELDS):
+            value = float((hour * 7 + row * 13 + position * 31) % 500) if (hour + row + position) % 3 else 0.0
+            record[field] = value
+            value_total += value
+        record['total'] = value_total
+        records.append(record)
+    return records, total
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body, content_type: str = 'application/json', headers: dict = None):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if len(body) > 1024 and 'gzip' in (self.headers.get('Accept-Encoding') or ''):
+            body = gzip.compress(body, compresslevel=1)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count('bytes_sent', len(body))
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+    def do_GET(self):
+        state = self.state
+        state.count_request(self.path)
+        if self.path == '/_stub/stats':
+            with state.lock:
+                self._send(200, {**state.stats, 'requests': dict(state.stats['requests'])})
+            return
+        if self.path == f'{GENERATION_PATH}/data/injection-quantity-powerplant-list':
+            if not self.headers.get('TGT'):
+                self._send(401, {'error': 'TGT gerekli'})
+                return
+            if self.headers.get('If-None-Match') == '"plants-v1"':
+                self._send(304, b'', headers={'ETag': '"plants-v1"'})
+                return
+            plants = [{'id': 1000 + i, 'name': f'STUB SANTRAL {i}', 'eic': f'40W{i:013d}', 'organizationId': 500 + i}
+                      for i in range(state.config['plants'])]
+            self._send(200, {'items': plants}, headers={'ETag': '"plants-v1"'})
+            return
+        self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        state = self.state
+        raw = self._read_body()
+        state.count_request(self.path)
+
+        if self.path == '/_stub/config':
+            try:
+                self._send(200, state.update(json.loads(raw or b'{}')))
+            except ValueError as e:
+                self._send(400, {'error': str(e)})
+            return
+        if self.path == '/cas/v1/tickets':
+            with state.lock:
+                state.tickets += 1
+                ticket = f'TGT-{state.tickets}-stub'
+            self._send(201, ticket.encode(), 'text/plain')
+            return
+        if not self.path.startswith(GENERATION_PATH):
+            self._send(404, {'error': 'not found'})
+            return
+        if not self.headers.get('TGT'):
+            self._send(401, {'error': 'TGT gerekli'})
+            return
+
+        body = json.loads(raw or b'{}')
+        endpoint = self.path[len(GENERATION_PATH):]
+        if endpoint == '/data/uevcb-list':
+            organization_id = int(body.get('organizationId', 0))
+            self._send(200, {'items': [{'id': organization_id * 10 + i, 'name': f'UEVCB {organization_id}-{i}'}
+                                       for i in range(3)]})
+            return
+        if endpoint not in ('/data/injection-quantity', '/export/injection-quantity'):
+            self._send(404, {'error': 'not found'})
+            return
+
+        time.sleep(state.delay())
+        if state.should_fail():
+            state.count('injected_errors')
+            self._send(503, {'error': 'stub: enjekte edilmiş hata'})
+            return
+
+        config = state.config
+        if endpoint == '/export/injection-quantity':
+            if config['export_status'] != 200:
+                self._send(config['export_status'], {'error': 'export kapalı'})
+                return
+            records, _ = make_records(body['startDate'], body['endDate'], config['rows_per_hour'], 0, sys.maxsize)
+            state.count('records_served', len(records))
+            self._send(200, {'content': records})
+            return
+
+        page = body.get('page') or {}
+        size = int(page.get('size', 24))
+        number = int(page.get('number', 1))
+        if size > config['max_page_size']:
+            state.count('rejected_page_sizes')
+            self._send(400, {'error': f'sayfa boyutu en fazla {config["max_page_size"]}'})
+            return
+        records, total = make_records(body['startDate'], body['endDate'], config['rows_per_hour'],
+                                      (number - 1) * size, size)
+        state.count('records_served', len(records))
+        self._send(200, {'items': records, 'page': {'number': number, 'size': size, 'total': total},
+                         'totals': {'totalTotal': sum(record['total'] for record in records)}})
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, **config):
+    """Stub'ı arka plan thread'inde başlat; (server, base_url) döndürür"""
+    handler = type('BoundStubHandler', (StubHandler,), {'state': StubState(**config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089, help='0 verilirse boş bir port seçilir')
+    parser.add_argument('--latency', type=float, default=DEFAULT_CONFIG['latency'])
+    parser.add_argument('--latency-jitter', type=float, default=DEFAULT_CONFIG['latency_jitter'])
+    parser.add_argument('--max-page-size', type=int, default=DEFAULT_CONFIG['max_page_size'])
+    parser.add_argument('--error-rate', type=float, default=DEFAULT_CONFIG['error_rate'])
+    parser.add_argument('--export-status', type=int, default=DEFAULT_CONFIG['export_status'])
+    parser.add_argument('--rows-per-hour', type=int, default=DEFAULT_CONFIG['rows_per_hour'])
+    parser.add_argument('--plants', type=int, default=DEFAULT_CONFIG['plants'])
+    args = parser.parse_args()
+
+    server, url = start_stub_server(
+        args.host, args.port, latency=args.latency, latency_jitter=args.latency_jitter,
+        max_page_size=args.max_page_size, error_rate=args.error_rate, export_status=args.export_status,
+        rows_per_hour=args.rows_per_hour, plants=args.plants
+    )
+    # İlk satır adres; benchmark script'i portu buradan okur
+    print(url, flush=True)
+    print(f"🧪 EPIAS stub hazır: EPIAS_BASE_URL={url} EPIAS_AUTH_URL={url}", file=sys.stderr, flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ EPIAS Elektrik Verisi Çekici - Ana Başlangıç Scripti
 import os
 import sys
 import argparse
+import getpass
 from pathlib import Path
 
 def setup_environment():
@@ -139,6 +140,79 @@ def run_docker():
         print("❌ Docker not available. Please install Docker or use Python mode.")
         sys.exit(1)
 
+def login(args):
+    """Authenticated extractor for CLI modes (EPIAS_USERNAME / EPIAS_PASSWORD or prompt)"""
+    setup_environment()
+    
+    from dotenv import load_dotenv
+    load_dotenv()
+    from epias_extractor import EpiasExtractor
+    
+    username = args.username or os.getenv('EPIAS_USERNAME')
+    if not username:
+        print("❌ EPIAS kullanıcı adı gerekli (--username veya EPIAS_USERNAME)")
+        sys.exit(1)
+    password = os.getenv('EPIAS_PASSWORD') or getpass.getpass('EPIAS şifresi: ')
+    
+    extractor = EpiasExtractor(username, password)
+    auth_result = extractor.authenticate()
+    if not auth_result['success']:
+        print(f"❌ {auth_result['message']}")
+        sys.exit(1)
+    return extractor
+
+def run_sync(args):
+    """Run incremental sync (only new and recently revised hours are fetched)"""
+    print("🔄 Starting incremental EPIAS sync...")
+    extractor = login(args)
+    
+    result = extractor.sync_to_now(
+        power_plant_id=args.plant,
+        output_path=args.output,
+        revision_days=args.revision_days,
+        since=args.since
+    )
+    
+    if not result['success']:
+        print(f"❌ {result['message']}")
+        if result.get('failed_periods'):
+            print(f"⚠️ Failed periods (retried on next sync): {result['failed_periods']}")
+        sys.exit(1)
+    
+    print(f"✅ {result['message']}")
+    print(f"📄 Output: {result['output_path']}")
+    if result.get('last_synced_hour'):
+        print(f"🕒 Last synced hour: {result['last_synced_hour']}")
+    if result.get('failed_periods'):
+        # Kısmi ilerleme yazıldı ama çıktı eksik: cron / CI bunu hata olarak görmeli
+        print(f"⚠️ Failed periods (retried on next sync): {result['failed_periods']}")
+        sys.exit(1)
+
+def run_export(args):
+    """Stream a period straight into a CSV file without holding it in memory"""
+    if not args.start or not args.end:
+        print("❌ export modu için --start ve --end gerekli (YYYY-MM-DD)")
+        sys.exit(1)
+    print("📤 Starting streaming EPIAS export...")
+    extractor = login(args)
+    from sync_output import append_records
+    
+    output = args.output or os.path.join('backend', 'downloads', f"export_{args.plant or 'all'}_{args.start}_{args.end}.csv")
+    if os.path.exists(output):
+        os.remove(output)
+    
+    stats = {}
+    for batch in extractor.iter_injection_quantity(args.start, args.end, power_plant_id=args.plant,
+                                                   batches=True, stats=stats):
+        append_records(output, batch)
+        print(f"   {stats['records']} kayıt yazıldı", end='\r')
+    
+    print(f"✅ {stats['records']} kayıt yazıldı")
+    print(f"📄 Output: {output}")
+    if stats['failed_periods']:
+        print(f"⚠️ Failed periods: {stats['failed_periods']}")
+        sys.exit(1)
+
 def check_dependencies():
     """Check if required dependencies are installed"""
     required_packages = [
@@ -173,8 +247,8 @@ def main():
     parser = argparse.ArgumentParser(description='EPIAS Elektrik Verisi Çekici')
     parser.add_argument(
         'mode', 
-        choices=['dev', 'prod', 'docker'], 
-        help='Run mode: dev (development), prod (production), docker'
+        choices=['dev', 'prod', 'docker', 'sync', 'export'], 
+        help='Run mode: dev (development), prod (production), docker, sync (incremental data sync), export (stream a period to CSV)'
     )
     parser.add_argument(
         '--port', 
@@ -188,6 +262,15 @@ def main():
         help='Skip dependency check'
     )
     
+    sync_group = parser.add_argument_group('sync / export mode')
+    sync_group.add_argument('--plant', help='Power plant id (default: all plants)')
+    sync_group.add_argument('--start', help='Export start date YYYY-MM-DD')
+    sync_group.add_argument('--end', help='Export end date YYYY-MM-DD')
+    sync_group.add_argument('--since', help='First sync start date YYYY-MM-DD (default: last 30 days)')
+    sync_group.add_argument('--revision-days', type=int, help='Trailing days re-fetched on every sync (default: 3)')
+    sync_group.add_argument('--output', help='Output CSV (default: backend/downloads/sync_<plant>.csv or export_<plant>_<start>_<end>.csv)')
+    sync_group.add_argument('--username', help='EPIAS username (default: EPIAS_USERNAME, password from EPIAS_PASSWORD)')
+    
     args = parser.parse_args()
     
     # Set port environment variable
@@ -207,6 +290,10 @@ def main():
         run_production()
     elif args.mode == 'docker':
         run_docker()
+    elif args.mode == 'sync':
+        run_sync(args)
+    elif args.mode == 'export':
+        run_export(args)
 
 if __name__ == '__main__':
     try:
@@ -30,6 +30,8 @@ backend_import_error = None
 
 try:
     from backend.epias_extractor import EpiasExtractor
+    from plant_list_cache import get_plant_list_cache
+    from record_buffer import ColumnarRecordBuffer
     backend_import_success = True
 except ImportError as e:
     backend_import_error = e
@@ -43,6 +45,8 @@ if 'extraction_progress' not in st.session_state:
     st.session_state.extraction_progress = {}
 if 'last_result' not in st.session_state:
     st.session_state.last_result = None
+if 'last_export' not in st.session_state:
+    st.session_state.last_export = None
 if 'connection_status' not in st.session_state:
     st.session_state.connection_status = "disconnected"
 
@@ -200,9 +204,12 @@ else:
     st.stop()
 
 # Helper Functions - Connection-safe
-@st.cache_data(ttl=300)  # 5 dakika cache
 def get_cached_power_plants():
-    """Cache'lenmiş santral listesi - connection-safe"""
+    """Cache'lenmiş santral listesi - connection-safe
+    
+    Liste backend'in process genelindeki cache'inden gelir (Flask ve Excel çıktısı
+    ile ortak), bu yüzden Streamlit tarafında ayrıca cache'lenmez.
+    """
     if not st.session_state.authenticated or not st.session_state.extractor:
         return None  # Return None to distinguish from empty list
     
@@ -226,7 +233,7 @@ def safe_extraction_with_resume(extractor, start_date, end_date, power_plant_id=
     if extraction_key not in st.session_state.extraction_progress:
         st.session_state.extraction_progress[extraction_key] = {
             'completed_chunks': [],
-            'all_data': [],
+            'all_data': ColumnarRecordBuffer(),
             'start_date': start_date,
             'end_date': end_date,
             'power_plant_id': power_plant_id,
@@ -235,16 +242,9 @@ def safe_extraction_with_resume(extractor, start_date, end_date, power_plant_id=
             'completed': False
         }
     progress_info = st.session_state.extraction_progress[extraction_key]
-    current_start = datetime.strptime(start_date, "%Y-%m-%d")
-    final_end = datetime.strptime(end_date, "%Y-%m-%d")
-    all_chunks = []
-    temp_start = current_start
-    while temp_start < final_end:
-        temp_end = temp_start + timedelta(days=chunk_days)
-        if temp_end > final_end:
-            temp_end = final_end
-        all_chunks.append((temp_start.strftime('%Y-%m-%d'), temp_end.strftime('%Y-%m-%d')))
-        temp_start = temp_end
+    # Backend ile aynı (ızgaraya hizalı) pencereler: eşzamanlı özdeş istekler tek upstream çekimini paylaşır
+    all_chunks = [(chunk_start.strftime('%Y-%m-%d'), chunk_end.strftime('%Y-%m-%d'))
+                  for chunk_start, chunk_end in extractor.plan_chunks(start_date, end_date, chunk_days)]
     progress_info['total_chunks'] = len(all_chunks)
     progress_bar = st.progress(0)
     status_text = st.empty()
@@ -257,22 +257,31 @@ def safe_extraction_with_resume(extractor, start_date, end_date, power_plant_id=
             if not check_connection():
                 st.error("❌ Bağlantı kesildi! Lütfen yeniden giriş yapın.")
                 return None
+            chunk_stats = {}
             chunk_data = extractor.get_injection_quantity_data(
                 extractor.format_date_for_api(chunk_start),
                 extractor.format_date_for_api(chunk_end),
-                power_plant_id
+                power_plant_id,
+                stats=chunk_stats
             )
-            # Always mark chunk as completed, even if empty
+            if chunk_stats.get('failed'):
+                # Tekrar denemelere rağmen alınamadı: chunk tamamlanmış sayılmaz, "Devam Et" ile yeniden denenir
+                st.error(f"❌ {chunk_start} - {chunk_end}: Veri alınamadı, daha sonra tekrar denenecek")
+                continue
+            # Mark chunk as completed, even if empty
             progress_info['completed_chunks'].append(chunk_key)
             if chunk_data:
+                skipped_before = progress_info['all_data'].skipped
                 progress_info['all_data'].extend(chunk_data)
                 st.success(f"✅ {chunk_start} - {chunk_end}: {len(chunk_data)} kayıt")
+                skipped = progress_info['all_data'].skipped - skipped_before
+                if skipped:
+                    st.warning(f"⚠️ {chunk_start} - {chunk_end}: tarihi okunamayan {skipped} kayıt atlandı")
             else:
                 st.warning(f"⚠️ {chunk_start} - {chunk_end}: Veri bulunamadı")
             progress = (len(progress_info['completed_chunks']) / progress_info['total_chunks'])
             progress_bar.progress(progress)
             st.session_state.extraction_progress[extraction_key] = progress_info
-            time.sleep(0.5)
         except Exception as e:
             st.error(f"❌ {chunk_start} - {chunk_end} hatası: {e}")
             time.sleep(2)
@@ -299,6 +308,28 @@ def safe_extraction_with_resume(extractor, start_date, end_date, power_plant_id=
         st.warning("İşlem yarıda kaldı. 'Devam Et' butonuna basarak kaldığı yerden devam edebilirsiniz.")
         return None
 
+def stream_extraction_to_excel(extractor, start_date, end_date, power_plant_id=None, chunk_days=7):
+    """Kayıtları bellekte toplamadan EPIAS'tan geldikçe Excel'e yaz
+    
+    Önizleme ve 'Devam Et' yoktur; yarıda kalırsa dönem yeniden başlatılır (yerel
+    cache'te olan günler tekrar çekilmez).
+    """
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def progress_callback(progress, current_start, current_end):
+        progress_bar.progress(min(progress / 100, 1.0))
+        status_text.text(f"📥 {current_start} - {current_end} yazıldı")
+    
+    stats = {}
+    records = extractor.iter_injection_quantity(start_date, end_date, power_plant_id=power_plant_id,
+                                                chunk_days=chunk_days, stats=stats,
+                                                progress_callback=progress_callback)
+    plant_key = power_plant_id or 'all'
+    result = extractor.save_to_excel(records, f"epias_data_{start_date}_{end_date}_{plant_key}.xlsx", streaming=True)
+    result['failed_periods'] = stats.get('failed_periods', [])
+    return result
+
 def display_data_info(data, power_plant_id, power_plant_name):
     """
     Display information about the received data
@@ -418,6 +449,7 @@ else:
         # Cache temizleme
         if st.button("🗑️ Cache Temizle"):
             st.cache_data.clear()
+            get_plant_list_cache().invalidate()
             st.success("✅ Cache temizlendi!")
     
     # Ana içerik
@@ -445,7 +477,7 @@ else:
                 with col4:
                     st.metric("Santral", progress.get('power_plant_name', 'Bilinmeyen')[:20] + "..." if len(progress.get('power_plant_name', '')) > 20 else progress.get('power_plant_name', 'Bilinmeyen'))
                 
-                if not progress['completed'] and len(progress['all_data']) > 0:
+                if not progress['completed']:
                     if st.button(f"▶️ Devam Et - {key}", key=f"resume_{key}"):
                         with st.spinner("Kaldığı yerden devam ediliyor..."):
                             final_data = safe_extraction_with_resume(
@@ -551,6 +583,7 @@ else:
             st.warning("Santral listesi yükleniyor... Bağlantı problemi varsa bir süre bekleyin.")
             if st.button("Santral Listesini Yenile", key="reload_plants"):
                 st.cache_data.clear()
+                get_plant_list_cache().invalidate()
                 st.rerun()
             power_plant_id = None
             power_plant_name = None
@@ -576,6 +609,11 @@ else:
                 max_value=date.today()
             )
         
+        direct_excel = st.checkbox(
+            "Doğrudan Excel'e yaz",
+            help="Kayıtlar bellekte toplanmadan geldikçe dosyaya yazılır. Uzun dönemler için; önizleme ve 'Devam Et' yoktur."
+        )
+        
         extract_button = st.form_submit_button("Veri Çekmeyi Başlat", use_container_width=True)
         
         if extract_button:
@@ -602,24 +640,54 @@ else:
                     else:
                         st.info("🏭 Tüm santraller için veri çekiliyor")
                     
-                    # Connection-safe extraction başlat
-                    with st.spinner("Veri çekiliyor... (Bu işlem uzun sürebilir)"):
-                        final_data = safe_extraction_with_resume(
-                            st.session_state.extractor,
-                            start_str,
-                            end_str,
-                            power_plant_id,
-                            power_plant_name,
-                            chunk_days
-                        )
-                        
-                        if final_data is not None:
-                            st.session_state.last_result = final_data
-                            st.success(f"🎉 İşlem tamamlandı! {len(final_data)} kayıt çekildi.")
+                    if direct_excel:
+                        with st.spinner("Veri çekilip Excel'e yazılıyor... (Bu işlem uzun sürebilir)"):
+                            result = stream_extraction_to_excel(
+                                st.session_state.extractor,
+                                start_str,
+                                end_str,
+                                power_plant_id,
+                                chunk_days
+                            )
+                        if result['success']:
+                            st.session_state.last_export = result
                             st.rerun()
+                        else:
+                            st.error(f"❌ Excel oluşturulamadı: {result['message']}")
+                    else:
+                        # Connection-safe extraction başlat
+                        with st.spinner("Veri çekiliyor... (Bu işlem uzun sürebilir)"):
+                            final_data = safe_extraction_with_resume(
+                                st.session_state.extractor,
+                                start_str,
+                                end_str,
+                                power_plant_id,
+                                power_plant_name,
+                                chunk_days
+                            )
+                            
+                            if final_data is not None:
+                                st.session_state.last_result = final_data
+                                st.success(f"🎉 İşlem tamamlandı! {len(final_data)} kayıt çekildi.")
+                                st.rerun()
             else:
                 st.error("❌ Başlangıç tarihi bitiş tarihinden sonra olamaz!")
 
+    # Doğrudan Excel'e yazılan sonuç (indirme butonu form dışında olmalı)
+    if st.session_state.last_export:
+        export = st.session_state.last_export
+        st.success(f"✅ {export['record_count']} kayıt Excel'e yazıldı ({export['file_size_mb']} MB)")
+        if export['failed_periods']:
+            st.warning(f"⚠️ Alınamayan dönemler: {', '.join(p['start'] + ' - ' + p['end'] for p in export['failed_periods'])}")
+        with open(export['filepath'], 'rb') as f:
+            st.download_button(
+                label="📥 Excel Dosyasını İndir",
+                data=f.read(),
+                file_name=export['filename'],
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                key="download_last_export"
+            )
+    
     # Sonuç görüntüleme ve indirme
     if st.session_state.last_result:
         st.header("📈 Sonuçlar")
@@ -629,8 +697,8 @@ else:
         
         # Veri önizleme
         if st.checkbox("📋 Veri Önizleme"):
-            df = pd.DataFrame(data)
-            st.dataframe(df.head(100), use_container_width=True)
+            df = pd.DataFrame(data[:100])
+            st.dataframe(df, use_container_width=True)
         
         # Excel indirme
         if st.button("💾 Excel Dosyası Oluştur", use_container_width=True):
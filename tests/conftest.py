@@ -0,0 +1,53 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Backend modülleri düz import edilir (app.py ve run.py'deki gibi)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+# Testler yerel veri cache'ine ve cassette'e dokunmaz
+os.environ['EPIAS_CACHE_ENABLED'] = 'false'
+os.environ.pop('EPIAS_CASSETTE', None)
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+# app importu logging'i kurar; log dosyası çalışma dizini yerine geçici dizine yazılır
+LOG_DIR = tempfile.mkdtemp(prefix='epias-test-logs-')
+os.environ['EPIAS_LOG_FILE'] = os.path.join(LOG_DIR, 'epias_api.log')
+
+def pytest_unconfigure(config):
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """time.sleep çağrılarını beklemeden kaydet"""
+    import time
+
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    return sleeps
+
+@pytest.fixture
+def make_extractor(monkeypatch):
+    """Oturumu açılmış sayılan (TGT hazır) test EpiasExtractor'ı üret
+
+    store verilirse yerel veri cache'i, capability_cache verilirse uç nokta yetenek
+    cache'i bu örneklerle değiştirilir; verilmezse modüllerin singleton'ları kullanılır.
+    base_url hem veri hem auth sunucusudur (ör. stub sunucusu).
+    """
+    import capability_cache as capability_cache_module
+    import data_store
+    from epias_extractor import EpiasExtractor
+
+    def make(store=None, capability_cache=None, base_url='http://epias.test', cassette=None):
+        if store is not None:
+            monkeypatch.setattr(data_store, '_store', store)
+        if capability_cache is not None:
+            monkeypatch.setattr(capability_cache_module, '_capability_cache', capability_cache)
+        extractor = EpiasExtractor('user', 'secret', base_url=base_url, auth_url=base_url, cassette=cassette)
+        extractor.tgt_token = 'TGT-test'
+        return extractor
+    return make
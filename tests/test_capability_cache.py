@@ -0,0 +1,83 @@
+import json
+
+import pytest
+import requests
+
+from capability_cache import EndpointCapabilityCache
+from epias_extractor import EpiasExtractor
+
+def test_lookup_miss_then_hit():
+    cache = EndpointCapabilityCache()
+    assert cache.lookup('7', 'export') is None
+    cache.record(7, 'export', False)
+    assert cache.lookup('7', 'export') is False
+    assert cache.lookup('7', 'data') is None
+    snapshot = cache.snapshot()
+    assert (snapshot['hits'], snapshot['misses'], snapshot['entries'], snapshot['working']) == (1, 2, 1, 0)
+
+def test_entries_expire_after_ttl():
+    cache = EndpointCapabilityCache(success_ttl=0, failure_ttl=60)
+    cache.record('7', 'export', True)
+    cache.record('8', 'export', False)
+    assert cache.lookup('7', 'export') is None
+    assert cache.lookup('8', 'export') is False
+
+def test_invalidate_single_plant():
+    cache = EndpointCapabilityCache()
+    cache.record('7', 'export', True)
+    cache.record('7', 'data', True)
+    cache.record('8', 'export', True)
+    cache.invalidate('7')
+    assert cache.lookup('7', 'export') is None and cache.lookup('7', 'data') is None
+    assert cache.lookup('8', 'export') is True
+
+@pytest.fixture
+def extractor(make_extractor):
+    cache = EndpointCapabilityCache()
+    extractor = make_extractor(capability_cache=cache)
+    EpiasExtractor._page_size_cache[f'{extractor.base_url}/data/injection-quantity'] = 24
+    calls = []
+
+    def request(method, url, **kwargs):
+        endpoint = url.rsplit('/', 2)[-2]
+        calls.append(endpoint)
+        response = requests.Response()
+        response.url = url
+        if endpoint == 'export':
+            response.status_code = extractor.export_status
+            body = {'content': [{'date': '2024-01-01T00:00:00+03:00', 'total': 1.0}]}
+        else:
+            response.status_code = 200
+            body = {'items': [{'date': '2024-01-01T00:00:00+03:00', 'total': 1.0}],
+                    'page': {'number': 1, 'size': 24, 'total': 1}}
+        response._content = json.dumps(body).encode()
+        return response
+
+    extractor._request = request
+    extractor._read_json = lambda response: response.json()
+    extractor.calls = calls
+    yield extractor, cache
+    EpiasExtractor._page_size_cache.clear()
+
+def test_failed_export_is_skipped_on_later_chunks(extractor):
+    extractor, cache = extractor
+    extractor.export_status = 404
+    for day in ('2024-01-01', '2024-01-02'):
+        assert len(extractor._fetch_injection_quantity(day, day, '7', None)[0]) == 1
+    assert extractor.calls == ['export', 'data', 'data']
+    assert cache.lookup('7', 'export') is False and cache.lookup('7', 'data') is True
+
+def test_known_working_data_endpoint_skips_export_probe(extractor):
+    extractor, cache = extractor
+    extractor.export_status = 200
+    cache.record('7', 'data', True)
+    extractor._fetch_injection_quantity('2024-01-01', '2024-01-01', '7', None)
+    assert extractor.calls == ['data']
+
+def test_known_working_export_is_preferred(extractor):
+    extractor, cache = extractor
+    extractor.export_status = 200
+    cache.record('7', 'data', True)
+    cache.record('7', 'export', True)
+    extractor._fetch_injection_quantity('2024-01-01', '2024-01-01', '7', None)
+    assert extractor.calls == ['export']
@@ -0,0 +1,130 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+import data_store
+from data_store import InjectionDataStore, merge_ranges, subtract_ranges
+
+D = date.fromisoformat
+
+def hourly_records(start: date, end: date):
+    records = []
+    day = start
+    while day <= end:
+        for hour in range(24):
+            records.append({'date': f'{day.isoformat()}T{hour:02d}:00:00+03:00', 'total': float(hour)})
+        day += timedelta(days=1)
+    return records
+
+@pytest.fixture
+def store(tmp_path):
+    return InjectionDataStore(str(tmp_path / 'injection.sqlite3'), settle_days=0)
+
+# Aralık hesapları
+
+def test_merge_ranges_joins_overlapping_and_adjacent_days():
+    assert merge_ranges([(D('2024-01-05'), D('2024-01-07')), (D('2024-01-01'), D('2024-01-02')),
+                         (D('2024-01-03'), D('2024-01-04')), (D('2024-01-10'), D('2024-01-10'))]) == [
+        (D('2024-01-01'), D('2024-01-07')), (D('2024-01-10'), D('2024-01-10'))]
+
+def test_subtract_ranges_leaves_gaps():
+    assert subtract_ranges([(D('2024-01-01'), D('2024-01-10'))],
+                           [(D('2024-01-03'), D('2024-01-04')), (D('2024-01-08'), D('2024-01-12'))]) == [
+        (D('2024-01-01'), D('2024-01-02')), (D('2024-01-05'), D('2024-01-07'))]
+    assert subtract_ranges([(D('2024-01-01'), D('2024-01-02'))], [(D('2023-12-01'), D('2024-02-01'))]) == []
+
+# Kapsama
+
+def test_coverage_is_merged_across_saves(store):
+    store.save('7', hourly_records(D('2024-01-01'), D('2024-01-03')), [(D('2024-01-01'), D('2024-01-03'))])
+    store.save('7', [], [(D('2024-01-04'), D('2024-01-05'))])
+    store.save('7', [], [(D('2024-01-08'), D('2024-01-09'))])
+    assert store.missing_ranges('7', D('2024-01-01'), D('2024-01-10')) == [
+        (D('2024-01-06'), D('2024-01-07')), (D('2024-01-10'), D('2024-01-10'))]
+    assert store.missing_ranges('8', D('2024-01-01'), D('2024-01-02')) == [(D('2024-01-01'), D('2024-01-02'))]
+    assert len(store.load('7', D('2024-01-02'), D('2024-01-02'))) == 24
+
+def test_records_with_unreadable_dates_are_counted_and_logged(store, caplog):
+    written = store.save('7', [{'date': 'yarın', 'total': 1.0}, {'total': 2.0},
+                               {'date': '2024-01-01T00:00:00+03:00', 'total': 3.0}], [])
+    assert written == 1
+    assert 'tarihi okunamayan 2 kayıt' in caplog.text
+
+class _FrozenDatetime(datetime):
+    frozen = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.frozen.astimezone(tz)
+
+@pytest.mark.parametrize('utc_now, expected', [
+    # UTC'de hâlâ 14 Ocak ama Türkiye'de 15 Ocak 01:00
+    (datetime(2024, 1, 14, 22, 0, tzinfo=timezone.utc), D('2024-01-12')),
+    (datetime(2024, 1, 14, 20, 59, tzinfo=timezone.utc), D('2024-01-11')),
+])
+def test_settle_boundary_uses_turkish_day(monkeypatch, tmp_path, utc_now, expected):
+    monkeypatch.setattr(_FrozenDatetime, 'frozen', utc_now)
+    monkeypatch.setattr(data_store, 'datetime', _FrozenDatetime)
+    store = InjectionDataStore(str(tmp_path / 'injection.sqlite3'), settle_days=2)
+    assert store.settled_until() == expected
+
+def test_unsettled_days_are_not_marked_covered(monkeypatch, store):
+    monkeypatch.setattr(store, 'settled_until', lambda: D('2024-01-03'))
+    store.save('7', hourly_records(D('2024-01-01'), D('2024-01-05')), [(D('2024-01-01'), D('2024-01-05'))])
+    assert store.missing_ranges('7', D('2024-01-01'), D('2024-01-05')) == [(D('2024-01-04'), D('2024-01-05'))]
+    # Kayıtlar yine de saklanır
+    assert len(store.load('7', D('2024-01-04'), D('2024-01-05'))) == 48
+    store.save('7', [], [(D('2024-01-04'), D('2024-01-05'))])
+    assert store.missing_ranges('7', D('2024-01-01'), D('2024-01-05')) == [(D('2024-01-04'), D('2024-01-05'))]
+
+# get_data_for_period + cache
+
+@pytest.fixture
+def cached_extractor(monkeypatch, make_extractor, store):
+    extractor = make_extractor(store=store)
+    fetched = []
+
+    def get_injection_quantity_data(start, end, power_plant_id=None, page_size=None, stats=None):
+        fetched.append((start[:10], end[:10]))
+        stats.update({'pages': 1, 'failed': False, 'timed_out': False})
+        return hourly_records(D(start[:10]), D(end[:10]))
+
+    extractor.get_injection_quantity_data = get_injection_quantity_data
+    reads = []
+    iter_records = store.iter_records
+    monkeypatch.setattr(store, 'iter_records', lambda key, start, end: reads.append((start, end)) or
+                        iter_records(key, start, end))
+    return extractor, fetched, reads
+
+def test_only_missing_days_are_fetched_and_only_cached_days_are_read(cached_extractor):
+    extractor, fetched, reads = cached_extractor
+    first = extractor.get_data_for_period('2024-01-03', '2024-01-04', chunk_days=30)
+    assert first['count'] == 48 and fetched == [('2024-01-03', '2024-01-04')] and reads == []
+
+    fetched.clear()
+    result = extractor.get_data_for_period('2024-01-01', '2024-01-06', chunk_days=30)
+    assert fetched == [('2024-01-01', '2024-01-02'), ('2024-01-05', '2024-01-06')]
+    assert reads == [(D('2024-01-03'), D('2024-01-04'))]
+    dates = [record['date'] for record in result['data']]
+    assert len(dates) == 144 and dates == sorted(dates) and len(set(dates)) == 144
+
+def test_fully_cached_period_makes_no_requests(cached_extractor):
+    extractor, fetched, reads = cached_extractor
+    extractor.get_data_for_period('2024-01-01', '2024-01-02', chunk_days=30)
+    fetched.clear()
+    result = extractor.get_data_for_period('2024-01-01', '2024-01-02', chunk_days=30)
+    assert fetched == [] and result['count'] == 48
+
+def test_batch_returns_fetched_records_and_reads_only_cached_days(cached_extractor):
+    extractor, fetched, reads = cached_extractor
+    extractor.get_data_for_period('2024-01-03', '2024-01-04', power_plant_id='7', chunk_days=30)
+    fetched.clear()
+
+    result = extractor.get_data_for_plants(['7', '8'], '2024-01-01', '2024-01-06', chunk_days=30)
+    assert sorted(fetched) == [('2024-01-01', '2024-01-02'), ('2024-01-01', '2024-01-06'),
+                               ('2024-01-05', '2024-01-06')]
+    # Santral 8'in tüm dönemi yeni çekildi: diskten okunmaz
+    assert reads == [(D('2024-01-03'), D('2024-01-04'))]
+    for plant_id in ('7', '8'):
+        dates = [record['date'] for record in result['plants'][plant_id]['data']]
+        assert len(dates) == 144 and dates == sorted(dates) and len(set(dates)) == 144
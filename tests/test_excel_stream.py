@@ -0,0 +1,104 @@
+import os
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from openpyxl.worksheet._writer import ALL_TEMP_FILES
+
+import excel_stream
+from excel_stream import write_excel_streaming
+from record_buffer import ColumnarRecordBuffer
+
+def hourly_records(count):
+    return [{'date': f'2024-01-{1 + hour // 24:02d}T{hour % 24:02d}:00:00+03:00', 'total': float(hour)}
+            for hour in range(count)]
+
+@pytest.fixture
+def small_batches(monkeypatch):
+    iter_row_batches = excel_stream.iter_row_batches
+    monkeypatch.setattr(excel_stream, 'iter_row_batches', lambda data: iter_row_batches(data, batch_size=4))
+
+def test_row_limit_is_checked_before_rows_are_written(monkeypatch, tmp_path, small_batches):
+    monkeypatch.setattr(excel_stream, 'EXCEL_MAX_ROWS', 10)
+    temp_files = list(ALL_TEMP_FILES)
+    filepath = tmp_path / 'out.xlsx'
+    with pytest.raises(ValueError, match='en fazla 9 kayıt'):
+        write_excel_streaming(str(filepath), hourly_records(12), 'user')
+    # Başlık ve önceki batch'lerin geçici dosyaları silinir, yarım dosya kalmaz
+    assert ALL_TEMP_FILES == temp_files and not filepath.exists()
+
+def test_rows_up_to_the_limit_are_written(monkeypatch, tmp_path, small_batches):
+    monkeypatch.setattr(excel_stream, 'EXCEL_MAX_ROWS', 10)
+    filepath = tmp_path / 'out.xlsx'
+    assert write_excel_streaming(str(filepath), hourly_records(9), 'user') == 9
+    assert len(list(load_workbook(filepath, read_only=True)['Injection_Data'].iter_rows())) == 10
+
+def test_failed_save_removes_partial_file(monkeypatch, tmp_path):
+    filepath = tmp_path / 'out.xlsx'
+    temp_files = list(ALL_TEMP_FILES)
+
+    def broken_save(workbook, path):
+        open(path, 'wb').close()
+        raise OSError('disk full')
+
+    monkeypatch.setattr(excel_stream.Workbook, 'save', broken_save)
+    with pytest.raises(OSError):
+        write_excel_streaming(str(filepath), hourly_records(5), 'user')
+    assert ALL_TEMP_FILES == temp_files and not filepath.exists()
+
+def test_no_records_creates_no_file(tmp_path):
+    filepath = tmp_path / 'out.xlsx'
+    temp_files = list(ALL_TEMP_FILES)
+    assert write_excel_streaming(str(filepath), iter(()), 'user') == 0
+    assert ALL_TEMP_FILES == temp_files and not os.path.exists(filepath)
+
+# DataFrame ve streaming modlarının çıktısı aynı olmalı
+
+PLANTS = [{'id': 1, 'name': 'A', 'eic': 'X1'}, {'id': 2, 'name': 'B'}]
+
+def source_records():
+    records = []
+    for hour in range(48):
+        records.append({'date': f'2024-03-{1 + hour // 24:02d}T{hour % 24:02d}:00:00+03:00',
+                        'total': 100.0 + hour, 'naturalGas': 40.0, 'wind': float(hour % 5),
+                        'sun': None if hour % 24 < 6 else 3.5, 'dam': 0.0})
+    return records
+
+@pytest.fixture
+def export(monkeypatch, tmp_path, make_extractor):
+    monkeypatch.chdir(tmp_path)
+    extractor = make_extractor()
+    monkeypatch.setattr(extractor, '_power_plants_for_excel', lambda: PLANTS)
+
+    def export(data, streaming):
+        result = extractor.save_to_excel(data, filename=f'{streaming}.xlsx', streaming=streaming)
+        assert result['success'], result['message']
+        return pd.read_excel(result['filepath'], sheet_name=None)
+    return export
+
+@pytest.mark.parametrize('as_buffer', [False, True])
+def test_streaming_output_matches_dataframe_output(export, as_buffer):
+    make = (lambda: ColumnarRecordBuffer(source_records())) if as_buffer else source_records
+    expected, actual = export(make(), False), export(make(), True)
+    assert list(expected) == list(actual) == ['Injection_Data', 'Power_Plants', 'Özet', 'Günlük_Özet']
+    for name, frame in expected.items():
+        other = actual[name]
+        if name == 'Özet':
+            frame = frame[frame['Metrik'] != 'Dosya Oluşturma'].reset_index(drop=True)
+            other = other[other['Metrik'] != 'Dosya Oluşturma'].reset_index(drop=True)
+        pd.testing.assert_frame_equal(frame, other, check_dtype=False, obj=name)
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_summary_sheet_is_filled(export, streaming):
+    summary = dict(export(source_records(), streaming)['Özet'].values.tolist())
+    assert summary['Toplam Kayıt'] == 48
+    assert summary['Toplam Üretim (MWh)'] == f"{sum(100.0 + hour for hour in range(48)):,.2f}"
+    assert summary['Naturalgas Toplam (MWh)'] == f"{40.0 * 48:,.2f}"
+    assert 'Dam Toplam (MWh)' not in summary
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_daily_summary_has_one_row_per_day(export, streaming):
+    daily = export(source_records(), streaming)['Günlük_Özet']
+    assert daily['Saat_Sayısı'].tolist() == [24, 24]
+    assert daily['Günlük_Toplam_MWh'].tolist() == [sum(100.0 + hour for hour in range(24)),
+                                                  sum(100.0 + hour for hour in range(24, 48))]
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from json_stream import iter_json_events, read_json
+
+PAYLOADS = [
+    {'items': [{'date': '2024-01-01T00:00:00+03:00', 'total': 12.5, 'naturalGas': -3e-2, 'name': 'Çatalağzı ğüşö'},
+               {'date': '2024-01-01T01:00:00+03:00', 'total': 1234567890123, 'flag': True, 'x': None}],
+     'page': {'number': 1, 'total': 2}},
+    {'items': [], 'content': [[1, 2], {'nested': {'deep': [1.5e10]}}], 'empty': {}},
+    [{'a': 1}, {'a': 2.25}],
+    {},
+    [],
+    3.75,
+]
+
+def chunked(payload, size):
+    raw = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+@pytest.mark.parametrize('size', [1, 2, 7, 1 << 16])
+def test_matches_json_loads_for_any_chunking(payload, size):
+    # 1 byte'lık parçalar çok byte'lı UTF-8 karakterlerini ve sayıları ortasından böler
+    assert read_json(chunked(payload, size)) == payload
+
+def test_items_are_yielded_one_by_one():
+    events = list(iter_json_events(chunked(PAYLOADS[0], 3)))
+    assert events[0] == ('start', None, 'object')
+    assert [key for kind, key, _ in events if kind == 'item'] == ['items', 'items']
+    assert events[-1] == ('member', 'page', {'number': 1, 'total': 2})
+
+def test_on_item_receives_items_instead_of_the_list():
+    seen = []
+    result = read_json(chunked(PAYLOADS[0], 5), on_item=lambda key, item: seen.append((key, item['total'])))
+    assert seen == [('items', 12.5), ('items', 1234567890123)]
+    assert result == {'items': [], 'page': {'number': 1, 'total': 2}}
+
+def test_record_keys_are_shared_between_items():
+    first, second = read_json(chunked({'items': [{'total': 1}, {'total': 2}]}, 1))['items']
+    assert next(iter(first)) is next(iter(second))
+
+@pytest.mark.parametrize('body', [b'{"items": [1, 2', b'{"a" 1}', b'[1, 2}', b'{"a": tru'])
+def test_malformed_or_truncated_body_raises(body):
+    with pytest.raises(ValueError):
+        read_json([body[i:i + 2] for i in range(0, len(body), 2)])
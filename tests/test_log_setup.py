@@ -0,0 +1,56 @@
+import logging
+import threading
+
+import pytest
+
+import log_setup
+
+@pytest.fixture
+def fresh_logging(monkeypatch, tmp_path):
+    """configure_logging'i izole çalıştır, sonra root logger'ı eski haline getir"""
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    log_file = tmp_path / 'epias_api.log'
+    monkeypatch.setattr(log_setup, '_listener', None)
+    monkeypatch.setenv('EPIAS_LOG_FILE', str(log_file))
+    monkeypatch.setattr(log_setup.atexit, 'register', lambda fn: None)
+    yield log_file
+    listener = log_setup._listener
+    if listener is not None:
+        if listener._thread is not None:
+            listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+class ThreadRecordingMessage:
+    def __init__(self):
+        self.formatted_on = None
+
+    def __str__(self):
+        self.formatted_on = threading.current_thread()
+        return 'lazy message'
+
+def test_records_are_formatted_on_the_listener_thread(monkeypatch, fresh_logging):
+    monkeypatch.setenv('LOG_LEVEL', 'INFO')
+    listener = log_setup.configure_logging()
+    message = ThreadRecordingMessage()
+    logging.getLogger('test').info(message)
+    listener.stop()  # kuyruktaki kayıtlar yazılır
+    assert message.formatted_on is not None and message.formatted_on is not threading.current_thread()
+    assert 'lazy message' in fresh_logging.read_text(encoding='utf-8')
+
+@pytest.mark.parametrize('value, expected', [('debug', logging.DEBUG), (' Warning ', logging.WARNING),
+                                             ('30', logging.WARNING)])
+def test_valid_log_levels(monkeypatch, fresh_logging, value, expected):
+    monkeypatch.setenv('LOG_LEVEL', value)
+    log_setup.configure_logging()
+    assert logging.getLogger().level == expected
+
+def test_invalid_log_level_falls_back_to_info_with_warning(monkeypatch, fresh_logging):
+    monkeypatch.setenv('LOG_LEVEL', 'VERBOSE')
+    listener = log_setup.configure_logging()
+    assert logging.getLogger().level == logging.INFO
+    listener.stop()
+    assert "Geçersiz LOG_LEVEL='VERBOSE'" in fresh_logging.read_text(encoding='utf-8')
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from plant_list_cache import PlantListCache
+
+PLANTS = [{'id': 1, 'name': 'A'}, {'id': 2, 'name': 'B'}]
+
+class Fetcher:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.validators = []
+
+    def __call__(self, validators):
+        self.validators.append(validators)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def test_hit_within_ttl():
+    cache = PlantListCache(ttl=60)
+    fetch = Fetcher((PLANTS, {'ETag': '"v1"'}))
+    assert cache.get(fetch) == (PLANTS, False)
+    assert cache.get(fetch) == (PLANTS, True)
+    assert len(fetch.validators) == 1
+    assert cache.snapshot()['hits'] == 1 and cache.snapshot()['fetches'] == 1
+
+def test_expired_list_is_revalidated_with_validators():
+    cache = PlantListCache(ttl=0)
+    fetch = Fetcher((PLANTS, {'ETag': '"v1"'}), None)
+    cache.get(fetch)
+    assert cache.get(fetch) == (PLANTS, True)
+    assert fetch.validators == [{}, {'ETag': '"v1"'}]
+    assert cache.snapshot()['revalidated'] == 1
+
+def test_failed_refresh_serves_stale_list():
+    cache = PlantListCache(ttl=0)
+    cache.get(Fetcher((PLANTS, {})))
+    assert cache.get(Fetcher(RuntimeError('down'))) == (PLANTS, True)
+    assert cache.snapshot()['stale_served'] == 1
+
+def test_first_fetch_error_propagates():
+    with pytest.raises(RuntimeError):
+        PlantListCache().get(Fetcher(RuntimeError('down')))
+
+def test_force_refresh_is_unconditional():
+    cache = PlantListCache(ttl=60)
+    fetch = Fetcher((PLANTS, {'ETag': '"v1"'}), (PLANTS[:1], {'ETag': '"v2"'}))
+    cache.get(fetch)
+    assert cache.get(fetch, force_refresh=True) == (PLANTS[:1], False)
+    assert fetch.validators == [{}, {}]
+
+def test_concurrent_hits_are_all_counted():
+    cache = PlantListCache(ttl=60)
+    cache.get(Fetcher((PLANTS, {})))
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: cache.get(Fetcher()), range(4000)))
+    assert cache.snapshot()['hits'] == 4000
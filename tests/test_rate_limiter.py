@@ -0,0 +1,58 @@
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket
+
+class FakeClock:
+    """rate_limiter.time yerine: sleep saati ilerletir ve kaydedilir"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+def test_burst_passes_without_waiting_then_requests_are_paced(clock):
+    bucket = TokenBucket(rate=5, burst=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.2)
+    assert bucket.acquire() == pytest.approx(0.2)
+    assert clock.sleeps == [pytest.approx(0.2)] * 2
+
+def test_tokens_refill_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, burst=4)
+    for _ in range(4):
+        bucket.acquire()
+    clock.now += 60
+    assert bucket.snapshot()['tokens'] == 4
+    assert [bucket.acquire() for _ in range(4)] == [0.0] * 4
+
+def test_waiters_reserve_in_arrival_order(monkeypatch, clock):
+    # Uyumadan önce gelen her çağrı bir sonraki yuvayı rezerve eder
+    monkeypatch.setattr(clock, 'sleep', clock.sleeps.append)
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.acquire()
+    assert [bucket.acquire() for _ in range(3)] == [pytest.approx(0.1), pytest.approx(0.2), pytest.approx(0.3)]
+    assert bucket.snapshot()['tokens'] == -3 and bucket.snapshot()['fill_ratio'] == 0
+
+@pytest.mark.parametrize('rate, burst', [(0, 1), (-1, 5), (1, 0)])
+def test_invalid_limits_are_rejected(rate, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, burst)
+
+def test_configure_resets_to_a_full_bucket(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.acquire()
+    bucket.configure(rate=50, burst=20)
+    assert bucket.snapshot() == {'tokens': 20, 'capacity': 20.0, 'rate_per_second': 50.0, 'fill_ratio': 1.0}
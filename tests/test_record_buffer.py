@@ -0,0 +1,86 @@
+import gc
+from datetime import timedelta
+
+import numpy as np
+import pytest
+
+from record_buffer import ColumnarRecordBuffer
+
+RECORDS = [
+    {'date': '2024-01-01T00:00:00+03:00', 'total': 1.5, 'note': 'a'},
+    {'date': '2024-01-01T01:00:00+03:00', 'total': None, 'note': None},
+    {'date': '2024-01-01T02:00:00+03:00', 'note': 'c', 'extra': 4.0},
+]
+
+def test_records_round_trip():
+    buffer = ColumnarRecordBuffer(RECORDS)
+    assert list(buffer) == [
+        {'date': '2024-01-01T00:00:00+03:00', 'total': 1.5, 'note': 'a', 'extra': None},
+        {'date': '2024-01-01T01:00:00+03:00', 'total': None, 'note': None, 'extra': None},
+        {'date': '2024-01-01T02:00:00+03:00', 'total': None, 'note': 'c', 'extra': 4.0},
+    ]
+    assert buffer[-1] == buffer[2] and buffer[:2] == list(buffer)[:2]
+    assert buffer.fields == ['date', 'total', 'note', 'extra']
+
+def test_dates_are_returned_in_turkish_time():
+    buffer = ColumnarRecordBuffer([{'date': '2024-01-01T00:00:00Z', 'total': 1.0}])
+    assert buffer[0]['date'] == '2024-01-01T03:00:00+03:00'
+
+def test_integers_keep_their_type():
+    buffer = ColumnarRecordBuffer([{'date': '2024-01-01T00:00:00+03:00', 'id': 7, 'total': 5.0}])
+    buffer.extend(ColumnarRecordBuffer([{'date': '2024-01-01T01:00:00+03:00', 'id': 8, 'total': 6.0}]))
+    assert [record['id'] for record in buffer] == [7, 8] and all(type(record['id']) is int for record in buffer)
+    assert [row[1] for batch in buffer.iter_rows() for row in batch] == [7, 8]
+    assert buffer.to_dataframe()['id'].dtype == np.int64
+
+@pytest.mark.parametrize('later, expected', [(2.5, [1.0, 2.5]), (None, [1, None])])
+def test_integer_column_is_promoted_like_pandas(later, expected):
+    buffer = ColumnarRecordBuffer([{'date': '2024-01-01T00:00:00+03:00', 'value': 1},
+                                   {'date': '2024-01-01T01:00:00+03:00', 'value': later}])
+    values = [record['value'] for record in buffer]
+    assert values == expected and type(values[0]) is type(expected[0])
+
+def test_numeric_column_falls_back_to_objects():
+    buffer = ColumnarRecordBuffer([{'date': '2024-01-01T00:00:00+03:00', 'value': 1.0},
+                                   {'date': '2024-01-01T01:00:00+03:00', 'value': None},
+                                   {'date': '2024-01-01T02:00:00+03:00', 'value': 'n/a'}])
+    assert [record['value'] for record in buffer] == [1.0, None, 'n/a']
+
+def test_records_without_date_are_counted_not_stored():
+    buffer = ColumnarRecordBuffer([{'total': 1.0}, {'date': 'yarın', 'total': 2.0}, RECORDS[0]])
+    assert len(buffer) == 1 and buffer.skipped == 2
+    merged = ColumnarRecordBuffer(RECORDS)
+    merged.extend(buffer)
+    assert len(merged) == 4 and merged.skipped == 2
+
+@pytest.mark.parametrize('as_buffer', [False, True])
+def test_extend_with_constant_fields(as_buffer):
+    buffer = ColumnarRecordBuffer()
+    for plant_id in ('10', '20'):
+        records = [record for record in RECORDS if 'total' in record]
+        buffer.extend(ColumnarRecordBuffer(records) if as_buffer else records, constants={'powerPlantId': plant_id})
+    assert buffer.fields[:2] == ['date', 'powerPlantId']
+    assert [record['powerPlantId'] for record in buffer] == ['10', '10', '20', '20']
+    assert [record['total'] for record in buffer] == [1.5, None, 1.5, None]
+
+def test_dataframe_shares_numeric_columns():
+    buffer = ColumnarRecordBuffer(RECORDS)
+    df = buffer.to_dataframe()
+    assert list(df.columns) == buffer.fields
+    assert df['date'][0].utcoffset() == timedelta(hours=3)
+    assert np.shares_memory(df['total'].to_numpy(), np.asarray(buffer._columns['total']))
+    assert df['note'][2] == 'c'
+
+def test_append_while_dataframe_is_alive_raises():
+    buffer = ColumnarRecordBuffer(RECORDS)
+    df = buffer.to_dataframe()
+    with pytest.raises(BufferError):
+        buffer.append(RECORDS[0])
+    with pytest.raises(BufferError):
+        buffer.extend(ColumnarRecordBuffer(RECORDS))
+    # Yarım kalan ekleme geri alınır, tampon tutarlı kalır
+    assert len(buffer) == 3 and list(buffer) == list(ColumnarRecordBuffer(RECORDS))
+    del df
+    gc.collect()
+    buffer.append(RECORDS[0])
+    assert len(buffer) == 4
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import resilience
+from epias_extractor import EpiasExtractor
+from resilience import RETRY_AFTER_CAP, CircuitBreaker, CircuitOpenError, RetryPolicy
+
+BASE_URL = 'http://epias.test'
+DATA_URL = f'{BASE_URL}/electricity-service/v1/generation/data/injection-quantity'
+ENDPOINT = 'data/injection-quantity'
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    return response
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+# CircuitBreaker
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('x', failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.snapshot()['state'] == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker('x', failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.snapshot() == {'state': CircuitBreaker.CLOSED, 'consecutive_failures': 1}
+
+def test_half_open_allows_a_single_trial():
+    breaker = CircuitBreaker('x', failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    assert breaker.snapshot()['state'] == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_half_open_trial_success_closes():
+    breaker = CircuitBreaker('x', failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.snapshot() == {'state': CircuitBreaker.CLOSED, 'consecutive_failures': 0}
+    breaker.before_call()
+    breaker.before_call()
+
+def test_half_open_trial_failure_reopens():
+    breaker = CircuitBreaker('x', failure_threshold=5, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    breaker.reset_timeout = 60
+    breaker.record_failure()
+    assert breaker.snapshot()['state'] == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_release_trial_keeps_half_open_and_allows_next_trial():
+    breaker = CircuitBreaker('x', failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    breaker.before_call()
+    breaker.release_trial()
+    assert breaker.snapshot()['state'] == CircuitBreaker.HALF_OPEN
+    breaker.before_call()
+
+# RetryPolicy
+
+def test_backoff_is_exponential_with_full_jitter(monkeypatch):
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: high)
+    policy = RetryPolicy(max_attempts=6, base_delay=0.5, max_delay=3.0)
+    assert [policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: low)
+    assert policy.backoff(3) == 0
+
+def test_backoff_honours_retry_after_seconds():
+    policy = RetryPolicy()
+    assert policy.backoff(1, make_response(429, {'Retry-After': '7'})) == 7.0
+    assert policy.backoff(1, make_response(429, {'Retry-After': '100000'})) == RETRY_AFTER_CAP
+    assert policy.backoff(1, make_response(429, {'Retry-After': '-5'})) == 0.0
+
+def test_backoff_honours_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = RetryPolicy().backoff(1, make_response(503, {'Retry-After': format_datetime(retry_at, usegmt=True)}))
+    assert 25 <= delay <= 30
+
+def test_invalid_retry_after_falls_back_to_backoff(monkeypatch):
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: high)
+    policy = RetryPolicy(base_delay=1.0)
+    assert policy.backoff(2, make_response(503, {'Retry-After': 'soon'})) == 2.0
+
+# EpiasExtractor._send
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(resilience, '_breakers', {})
+    monkeypatch.setattr(resilience, '_retry_policy', RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=30))
+    monkeypatch.setattr(resilience.random, 'uniform', lambda low, high: high)
+    extractor = EpiasExtractor('user', 'secret', base_url=BASE_URL, auth_url=BASE_URL)
+    extractor._throttle = lambda: None
+    return extractor
+
+def scripted_transport(extractor, outcomes):
+    calls = []
+
+    def transport(method, endpoint, url, **kwargs):
+        calls.append(endpoint)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    extractor._transport = transport
+    return calls
+
+def test_send_retries_transient_statuses_with_retry_after(extractor, no_sleep):
+    calls = scripted_transport(extractor, [make_response(503), make_response(429, {'Retry-After': '4'}),
+                                           make_response(200)])
+    assert extractor._send('POST', DATA_URL).status_code == 200
+    assert calls == [ENDPOINT] * 3
+    assert no_sleep == [0.5, 4.0]
+
+def test_send_returns_last_response_when_attempts_run_out(extractor, no_sleep):
+    scripted_transport(extractor, [make_response(503), make_response(503), make_response(502)])
+    assert extractor._send('POST', DATA_URL).status_code == 502
+    assert no_sleep == [0.5, 1.0]
+
+def test_send_does_not_retry_client_errors(extractor, no_sleep):
+    calls = scripted_transport(extractor, [make_response(400)])
+    assert extractor._send('POST', DATA_URL).status_code == 400
+    assert len(calls) == 1 and no_sleep == []
+
+def test_send_reraises_connection_error_after_attempts(extractor, no_sleep):
+    scripted_transport(extractor, [requests.ConnectionError('down')] * 3)
+    with pytest.raises(requests.ConnectionError):
+        extractor._send('POST', DATA_URL)
+    assert no_sleep == [0.5, 1.0]
+
+def test_send_429_does_not_open_breaker(extractor, no_sleep):
+    resilience._breakers[ENDPOINT] = CircuitBreaker(ENDPOINT, failure_threshold=1, reset_timeout=60)
+    scripted_transport(extractor, [make_response(429), make_response(200)])
+    assert extractor._send('POST', DATA_URL).status_code == 200
+    assert resilience._breakers[ENDPOINT].snapshot()['state'] == CircuitBreaker.CLOSED
+
+def test_send_fails_fast_while_breaker_open(extractor, no_sleep):
+    resilience._breakers[ENDPOINT] = CircuitBreaker(ENDPOINT, failure_threshold=2, reset_timeout=60)
+    calls = scripted_transport(extractor, [make_response(503)] * 3)
+    # İkinci 503 devreyi açar; üçüncü deneme gönderilmez
+    with pytest.raises(CircuitOpenError):
+        extractor._send('POST', DATA_URL)
+    with pytest.raises(CircuitOpenError):
+        extractor._send('POST', DATA_URL)
+    assert len(calls) == 2
+
+@pytest.mark.parametrize('error', [requests.exceptions.InvalidURL('bad'), requests.TooManyRedirects('loop'),
+                                   requests.exceptions.ChunkedEncodingError('cut'), KeyError('bug')])
+def test_half_open_trial_released_on_non_connection_error(extractor, no_sleep, error):
+    breaker = resilience._breakers[ENDPOINT] = CircuitBreaker(ENDPOINT, failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    scripted_transport(extractor, [error, make_response(200)])
+    with pytest.raises(type(error)):
+        extractor._send('POST', DATA_URL)
+    assert no_sleep == []
+    # Deneme hakkı bırakıldı: sonraki çağrı gönderilir ve devreyi kapatır
+    assert extractor._send('POST', DATA_URL).status_code == 200
+    assert breaker.snapshot()['state'] == CircuitBreaker.CLOSED
@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import single_flight
+from single_flight import SingleFlight
+
+FOLLOWERS = 4
+
+def wait_for_followers(flight: SingleFlight, count: int):
+    """Leader fn'i içindeyken diğer çağrıların beklemeye girmesini bekle"""
+    for _ in range(1000):
+        if flight.snapshot()['coalesced'] >= count:
+            return
+        threading.Event().wait(0.005)
+    raise AssertionError('followers did not join')
+
+def test_concurrent_identical_keys_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        wait_for_followers(flight, FOLLOWERS)
+        return ['record']
+
+    with ThreadPoolExecutor(FOLLOWERS + 1) as pool:
+        results = list(pool.map(lambda _: flight.do('key', fetch), range(FOLLOWERS + 1)))
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [['record']] * (FOLLOWERS + 1)
+    assert sorted(shared for _, shared in results) == [False] + [True] * FOLLOWERS
+    assert flight.snapshot() == {'in_flight': 0, 'executed': 1, 'coalesced': FOLLOWERS}
+
+def test_leader_error_reaches_all_followers():
+    flight = SingleFlight()
+
+    def fetch():
+        wait_for_followers(flight, FOLLOWERS)
+        raise ValueError('upstream broke')
+
+    def call(_):
+        try:
+            flight.do('key', fetch)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(FOLLOWERS + 1) as pool:
+        assert list(pool.map(call, range(FOLLOWERS + 1))) == ['upstream broke'] * (FOLLOWERS + 1)
+    assert flight.snapshot()['in_flight'] == 0
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == (1, False)
+    assert flight.do('key', lambda: 2) == (2, False)
+    with pytest.raises(RuntimeError):
+        flight.do('key', lambda: (_ for _ in ()).throw(RuntimeError('x')))
+    assert flight.do('key', lambda: 3) == (3, False)
+    assert flight.snapshot() == {'in_flight': 0, 'executed': 4, 'coalesced': 0}
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    inside = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        inside.set()
+        release.wait(5)
+        return 'slow'
+
+    with ThreadPoolExecutor(1) as pool:
+        future = pool.submit(flight.do, 'a', slow)
+        inside.wait(5)
+        assert flight.do('b', lambda: 'fast') == ('fast', False)
+        release.set()
+        assert future.result() == ('slow', False)
+
+def test_page_size_is_part_of_the_chunk_key(monkeypatch, make_extractor):
+    flight = SingleFlight()
+    monkeypatch.setattr(single_flight, '_single_flight', flight)
+    extractor = make_extractor()
+    seen_page_sizes = []
+    gate = threading.Barrier(2, timeout=5)
+
+    def fetch(start_date, end_date, power_plant_id, page_size):
+        seen_page_sizes.append(page_size)
+        gate.wait()  # iki çağrı aynı anda uçuşta: paylaşılsalardı biri burada takılırdı
+        return [{'date': start_date, 'size': page_size}], {'pages': 1, 'failed': False, 'timed_out': False}
+
+    extractor._fetch_injection_quantity = fetch
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(extractor.get_injection_quantity_data, '2024-01-01', '2024-01-02', '7', size)
+                   for size in (24, 100)]
+        results = [future.result() for future in futures]
+
+    assert sorted(seen_page_sizes) == [24, 100]
+    assert [result[0]['size'] for result in results] == [24, 100]
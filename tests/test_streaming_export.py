@@ -0,0 +1,71 @@
+import time
+from datetime import date, timedelta
+
+import pytest
+
+
+def day_records(day: date):
+    return [{'date': f'{day.isoformat()}T{hour:02d}:00:00+03:00', 'total': float(hour)} for hour in range(24)]
+
+@pytest.fixture
+def extractor(make_extractor):
+    extractor = make_extractor()
+
+    def pages(start_date, end_date, power_plant_id, page_size, stats):
+        day, end = date.fromisoformat(start_date[:10]), date.fromisoformat(end_date[:10])
+        while day <= end:
+            stats['pages'] += 1
+            yield day_records(day)
+            day += timedelta(days=1)
+
+    extractor._iter_injection_pages = pages
+    return extractor
+
+def test_generator_reports_progress_per_chunk(extractor):
+    progress = []
+    stats = {}
+    records = extractor.iter_injection_quantity('2024-01-01', '2024-01-10', chunk_days=5, use_cache=False,
+                                                stats=stats, progress_callback=lambda *args: progress.append(args))
+    assert sum(1 for _ in records) == 240
+    chunks = extractor.plan_chunks('2024-01-01', '2024-01-10', 5)
+    assert [(start, end) for _, start, end in progress] == [(start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+                                                            for start, end in chunks]
+    assert progress[0][0] < progress[-1][0] == 100.0
+    assert stats['records'] == 240 and stats['failed_periods'] == []
+
+def run_stream_extract(monkeypatch, tmp_path, extractor):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(extractor, 'get_data_for_period', lambda *args, **kwargs: pytest.fail('buffered path used'))
+    monkeypatch.setattr(extractor, '_power_plants_for_excel', lambda: None)
+    monkeypatch.setitem(app_module.active_sessions, 'sid', {'extractor': extractor, 'username': 'user'})
+    client = app_module.app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['session_id'] = 'sid'
+
+    task_id = client.post('/api/extract', json={'start_date': '2024-01-01', 'end_date': '2024-01-03',
+                                                'stream': True, 'use_cache': False}).get_json()['task_id']
+    for _ in range(500):
+        status = client.get(f'/api/extract/status/{task_id}').get_json().get('task_info', {'status': 'running'})
+        if status['status'] != 'running':
+            break
+        time.sleep(0.01)
+    return status
+
+def test_extract_route_streams_into_excel(monkeypatch, tmp_path, extractor):
+    status = run_stream_extract(monkeypatch, tmp_path, extractor)
+    assert status['status'] == 'completed', status
+    assert status['data']['record_count'] == 72 and status['progress'] == 100
+    assert (tmp_path / 'backend' / 'downloads' / status['data']['file_info']['filename']).exists()
+
+def test_extract_route_fails_when_every_period_fails(monkeypatch, tmp_path, extractor):
+    def failing_pages(start_date, end_date, power_plant_id, page_size, stats):
+        stats['failed'] = True
+        return iter(())
+
+    extractor._iter_injection_pages = failing_pages
+    status = run_stream_extract(monkeypatch, tmp_path, extractor)
+    assert status['status'] == 'error', status
+    assert 'Veri çekme hatası' in status['message'] and 'dönem alınamadı' in status['message']
@@ -0,0 +1,104 @@
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+import rate_limiter
+import resilience
+from cassette import RECORD, REPLAY, Cassette
+from epias_extractor import EpiasExtractor
+from rate_limiter import TokenBucket
+from resilience import RetryPolicy
+
+# Benchmark'ların kullandığı yerel EPIAS stub sunucusu
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'benchmarks'))
+from epias_stub import GENERATION_PATH, start_stub_server  # noqa: E402
+
+DATA_PATH = f'{GENERATION_PATH}/data/injection-quantity'
+# Enjekte edilen %30 hatada bir isteğin tüm denemeleri tükenme olasılığı ~0.3**12
+MAX_ATTEMPTS = 12
+
+def hourly_dates(start_date: str, end_date: str):
+    hour = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date) + timedelta(days=1)
+    dates = []
+    while hour < end:
+        dates.append(hour.strftime('%Y-%m-%dT%H:%M:%S+03:00'))
+        hour += timedelta(hours=1)
+    return dates
+
+@pytest.fixture
+def stub(monkeypatch, no_sleep):
+    """Arka planda çalışan stub sunucusu; retry beklemeleri atlanır, breaker açılmaz"""
+    monkeypatch.setattr(resilience, '_breakers', {})
+    monkeypatch.setattr(resilience, '_retry_policy', RetryPolicy(max_attempts=MAX_ATTEMPTS, base_delay=0.01))
+    monkeypatch.setenv('EPIAS_CIRCUIT_FAILURE_THRESHOLD', '1000')
+    monkeypatch.setattr(rate_limiter, '_limiter', TokenBucket(1000, 1000))
+    server, url = start_stub_server(seed=7)
+    server.url, server.state = url, server.RequestHandlerClass.state
+    yield server
+    server.shutdown()
+    server.server_close()
+    EpiasExtractor._page_size_cache.clear()
+
+def test_concurrent_chunks_are_complete_and_ordered_under_injected_errors(make_extractor, stub):
+    stub.state.update({'error_rate': 0.3})
+    extractor = make_extractor(base_url=stub.url)
+    result = extractor.get_data_for_period('2024-01-01', '2024-01-20', chunk_days=2, max_workers=4,
+                                           page_size=24, use_cache=False)
+    assert result['success'] and result['failed_periods'] == []
+    assert [record['date'] for record in result['data']] == hourly_dates('2024-01-01', '2024-01-20')
+    assert stub.state.stats['injected_errors'] > 0
+
+def test_prefetched_pages_are_retried_and_yielded_in_order(make_extractor, stub):
+    stub.state.update({'error_rate': 0.3})
+    extractor = make_extractor(base_url=stub.url)
+    payload = {'startDate': '2024-01-01T00:00:00+03:00', 'endDate': '2024-01-03T00:00:00+03:00',
+               'page': {'number': 1, 'size': 24}}
+    pages = list(extractor._iter_pages_prefetched(f'{stub.url}{DATA_PATH}', payload, {}, [2, 3]))
+    assert [page_num for page_num, _ in pages] == [2, 3]
+    assert [[record['date'] for record in items] for _, items in pages] == [
+        hourly_dates('2024-01-02', '2024-01-02'), hourly_dates('2024-01-03', '2024-01-03')]
+    assert stub.state.stats['injected_errors'] > 0
+
+def test_prefetched_page_is_none_after_retries_run_out(make_extractor, stub):
+    stub.state.update({'error_rate': 1.0})
+    extractor = make_extractor(base_url=stub.url)
+    payload = {'startDate': '2024-01-01T00:00:00+03:00', 'endDate': '2024-01-05T00:00:00+03:00',
+               'page': {'number': 1, 'size': 24}}
+    pages = list(extractor._iter_pages_prefetched(f'{stub.url}{DATA_PATH}', payload, {}, [2, 3, 4]))
+    assert pages == [(2, None), (3, None), (4, None)]
+    # Her sayfa kendi başına tüm denemeleri kullanır
+    assert stub.state.stats['requests'][DATA_PATH] == 3 * MAX_ATTEMPTS
+
+def test_adaptive_chunks_grow_on_fast_single_page_responses(make_extractor, stub):
+    extractor = make_extractor(base_url=stub.url)
+    result = extractor.get_data_for_period('2024-01-01', '2024-02-29', chunk_days=1, page_size=5000,
+                                           adaptive=True, use_cache=False)
+    assert result['chunk_sizes'][:4] == [1, 2, 4, 8]
+    assert [record['date'] for record in result['data']] == hourly_dates('2024-01-01', '2024-02-29')
+
+def test_adaptive_chunks_shrink_on_many_page_responses(make_extractor, stub):
+    extractor = make_extractor(base_url=stub.url)
+    result = extractor.get_data_for_period('2024-01-01', '2024-02-29', chunk_days=30, page_size=24,
+                                           adaptive=True, use_cache=False)
+    sizes = result['chunk_sizes']
+    assert sizes[:3] == [30, 15, 7] and min(sizes) < 7
+    assert [record['date'] for record in result['data']] == hourly_dates('2024-01-01', '2024-02-29')
+
+def test_cassette_replay_returns_the_recorded_records(make_extractor, stub, tmp_path):
+    path = str(tmp_path / 'epias.jsonl.gz')
+    recorder = Cassette(path, RECORD)
+    recorded = make_extractor(base_url=stub.url, cassette=recorder).get_data_for_period(
+        '2024-01-01', '2024-01-06', chunk_days=2, page_size=48, use_cache=False)
+    recorder.close()
+    stub.shutdown()
+
+    # Sunucu kapalı: cevaplar yalnızca cassette'ten gelebilir
+    player = Cassette(path, REPLAY)
+    replayed = make_extractor(base_url=stub.url, cassette=player).get_data_for_period(
+        '2024-01-01', '2024-01-06', chunk_days=2, page_size=48, use_cache=False)
+    assert replayed['success'] and replayed['failed_periods'] == []
+    assert list(replayed['data']) == list(recorded['data']) and len(recorded['data']) == 6 * 24
+    assert player.snapshot()['misses'] == 0 and player.snapshot()['replayed'] == recorder.snapshot()['recorded']
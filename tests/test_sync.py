@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+import data_store
+from data_store import TR_TIMEZONE, InjectionDataStore
+
+@pytest.fixture
+def extractor(make_extractor, tmp_path):
+    extractor = make_extractor(store=InjectionDataStore(str(tmp_path / 'injection.sqlite3')))
+    extractor.output = str(tmp_path / 'sync.csv')
+    return extractor
+
+def fake_period(monkeypatch, extractor, records, failed_periods):
+    def get_data_for_period(start_date, end_date, **kwargs):
+        return {'success': True, 'data': records, 'count': len(records), 'failed_periods': failed_periods,
+                'message': ''}
+    monkeypatch.setattr(extractor, 'get_data_for_period', get_data_for_period)
+
+def test_failure_at_fetch_start_is_reported_as_failure(monkeypatch, extractor):
+    today = datetime.now(TR_TIMEZONE).date()
+    since = today.replace(day=1).isoformat()
+    fake_period(monkeypatch, extractor, [{'date': f'{since}T05:00:00+03:00', 'total': 1.0}],
+                [{'start': since, 'end': today.isoformat()}])
+    result = extractor.sync_to_now(output_path=extractor.output, since=since)
+    assert result['success'] is False
+    assert result['appended'] == 0 and result['failed_periods']
+    assert data_store.get_data_store().get_sync_state('all') is None
+
+def test_no_new_data_without_failures_is_success(monkeypatch, extractor):
+    fake_period(monkeypatch, extractor, [], [])
+    result = extractor.sync_to_now(output_path=extractor.output)
+    assert result['success'] is True and result['message'] == 'Yeni veri yok'
+
+def test_records_before_first_failed_period_are_appended(monkeypatch, extractor):
+    since = '2024-01-01'
+    records = [{'date': f'2024-01-0{day}T00:00:00+03:00', 'total': float(day)} for day in (1, 2, 3)]
+    fake_period(monkeypatch, extractor, records, [{'start': '2024-01-03', 'end': '2024-01-03'}])
+    result = extractor.sync_to_now(output_path=extractor.output, since=since)
+    assert result['success'] is True and result['appended'] == 2
+    assert result['last_synced_hour'].startswith('2024-01-02')
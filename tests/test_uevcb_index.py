@@ -0,0 +1,95 @@
+import sqlite3
+import time
+
+import pytest
+
+import uevcb_index
+from uevcb_index import UevcbIndex
+
+PLANTS = [{'id': 1, 'name': 'A', 'organizationId': 10}, {'id': 2, 'name': 'B', 'organizationId': 20},
+          {'id': 3, 'name': 'C', 'organizationId': 10}, {'id': 4, 'name': 'D'}]
+
+@pytest.fixture
+def index(monkeypatch, tmp_path):
+    index = UevcbIndex(str(tmp_path / 'uevcb.sqlite3'), ttl=60)
+    monkeypatch.setattr(uevcb_index, '_uevcb_index', index)
+    return index
+
+@pytest.fixture
+def extractor(make_extractor, index):
+    extractor = make_extractor()
+    extractor.fetched = []
+
+    def fetch(organization_id):
+        extractor.fetched.append(organization_id)
+        return None if organization_id == '99' else [{'id': int(organization_id) * 10, 'name': f'U{organization_id}'}]
+
+    extractor._fetch_uevcb_list = fetch
+    return extractor
+
+def test_lookups_are_served_from_index_after_warm_up(extractor):
+    first = extractor.get_uevcb_lists(['10', '20', '10', '99'])
+    assert sorted(extractor.fetched) == ['10', '20', '99']
+    assert first['10'] == [{'id': 100, 'name': 'U10'}] and first['99'] == []
+
+    extractor.fetched.clear()
+    assert extractor.get_uevcb_lists(['10', '20', '99']) == first
+    # Alınamayan organizasyon indekse yazılmaz, yeniden denenir
+    assert extractor.fetched == ['99']
+
+def test_index_survives_restart(extractor, index):
+    extractor.get_uevcb_lists(['10'])
+    assert UevcbIndex(index.path, ttl=60).get('10') == [{'id': 100, 'name': 'U10'}]
+    index.invalidate('10')
+    assert UevcbIndex(index.path, ttl=60).get('10') is None
+
+def test_invalidate_survives_disk_errors(monkeypatch, extractor, index, caplog):
+    extractor.get_uevcb_lists(['10'])
+
+    def broken_connect():
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(index, '_connect', broken_connect)
+    index.invalidate()
+    assert index.get('10') is None
+    assert 'UEVCB indeksi diskte temizlenemedi' in caplog.text
+
+@pytest.fixture
+def client(monkeypatch, extractor):
+    pytest.importorskip('flask')
+    import app as app_module
+
+    monkeypatch.setattr(extractor, 'get_power_plant_list',
+                        lambda force_refresh=False: {'success': True, 'data': PLANTS, 'count': len(PLANTS)})
+    monkeypatch.setitem(app_module.active_sessions, 'sid', {'extractor': extractor, 'username': 'user'})
+    client = app_module.app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['session_id'] = 'sid'
+    return client
+
+def test_plants_route_attaches_uevcbs_and_refresh_invalidates(client, extractor, index):
+    plants = client.get('/api/plants?uevcb=1').get_json()['data']
+    assert [len(plant['uevcbs']) for plant in plants] == [1, 1, 1, 0]
+    assert sorted(extractor.fetched) == ['10', '20']
+    assert 'uevcbs' not in PLANTS[0]
+
+    client.get('/api/plants?refresh=1')
+    assert index.get('10') is None
+
+def test_plants_route_fetches_a_bounded_number_of_organizations(monkeypatch, client, extractor, index):
+    import app as app_module
+
+    monkeypatch.setattr(app_module, 'UEVCB_PREFETCH_LIMIT', 1)
+    result = client.get('/api/plants?uevcb=1').get_json()
+    assert [plant['uevcbs'] for plant in result['data']] == [[{'id': 100, 'name': 'U10'}], None,
+                                                             [{'id': 100, 'name': 'U10'}], []]
+    assert result['uevcb_pending'] == 1
+
+    # Kalan organizasyon arka planda indekse yazılır
+    for _ in range(500):
+        if index.get('20') is not None and not app_module._uevcb_warmup_lock.locked():
+            break
+        time.sleep(0.01)
+    result = client.get('/api/plants?uevcb=1').get_json()
+    assert result['uevcb_pending'] == 0 and result['data'][1]['uevcbs'] == [{'id': 200, 'name': 'U20'}]
+    assert sorted(extractor.fetched) == ['10', '20']